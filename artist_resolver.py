@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Artist name resolution shared by collect_art.py and merge_artist_tags.py
+
+The rules live in two ordered tables of precompiled patterns:
+
+- URL_RULES turn a source URL (Commons category or page) into the raw artist
+  name stored by collect_art.py.
+- NAME_RULES clean up stored names ("Category:...", "Artworks by ...",
+  "... in <museum>", URL-encoding) when merge_artist_tags.py enriches paintings.
+
+Rules are tried in order and the first match wins, like the original chains.
+Results are memoized, so each distinct category or raw name is resolved once
+no matter how many paintings share it.
+"""
+
+import re
+from functools import lru_cache
+from urllib.parse import unquote
+
+def _before_in(name):
+    """'Nikolai Astrup in Sogn og Fjordane Kunstmuseum' -> 'Nikolai Astrup'"""
+    return name.split(' in ')[0] if ' in ' in name else name
+
+def _artist_from_category(name):
+    """'Drawings by Hans Gude' -> 'Hans Gude', 'Hans Gude from ...' -> 'Hans Gude'"""
+    if ' by ' in name:
+        return name.split(' by ')[-1]
+    if ' from ' in name:
+        return name.split(' from ')[0]
+    return name
+
+# (pattern searched in the URL, artist name from the match)
+URL_RULES = [
+    (re.compile(r'Category:Paintings_by_([^/]+)'), lambda m: _before_in(m.group(1).replace('_', ' '))),
+    (re.compile(r'Category:([^/]+)'), lambda m: _artist_from_category(m.group(1).replace('_', ' '))),
+    (re.compile(r'wiki/([^/]+)$'), lambda m: _before_in(m.group(1).replace('_', ' '))),
+]
+
+# (pattern searched in the stored name, cleaned name from the match and the name)
+NAME_RULES = [
+    # "Nikolai Astrup in Sogn og Fjordane Kunstmuseum" -> "Nikolai Astrup"
+    (re.compile(r' in '), lambda m, name: name.split(' in ')[0]),
+    # "Category:Drawings by Hans Gude" -> "Hans Gude"
+    (re.compile(r'^Category:'), lambda m, name: _artist_from_category(name.replace('Category:', '').strip())),
+    # "Artworks by Edvard Munch" -> "Edvard Munch"
+    (re.compile(r'^Artworks by '), lambda m, name: name.replace('Artworks by ', '')),
+    # "Johan Christian Dahl, 1788-1857: life and works" -> "Johan Christian Dahl"
+    (re.compile(r'^(?=.*, )(?=.*: life and works)', re.S), lambda m, name: name.split(', ')[0]),
+    # "Dahl and Friedrich. Romantic Landscapes" -> "Johan Christian Dahl"
+    (re.compile(r'Dahl and Friedrich'), lambda m, name: 'Johan Christian Dahl'),
+    # "Christian Krohg. Pictures that captivate" -> "Christian Krohg"
+    (re.compile(r'Christian Krohg\. Pictures that captivate'), lambda m, name: 'Christian Krohg'),
+    # URL-encoded characters
+    (re.compile(r'%'), lambda m, name: unquote(name)),
+]
+
+# Applied after NAME_RULES, whichever of them matched
+NAME_POST_RULES = [
+    # "Hans Gude from Af Hans Gudes liv og værker" -> "Hans Gude" (also before URL decoding)
+    (re.compile(r'Hans Gude from Af Hans Gudes liv og (?:værker|v%C3%A6rker)'), lambda m, name: 'Hans Gude'),
+]
+
+@lru_cache(maxsize=4096)
+def resolve_artist_from_url(url):
+    """Artist name for paintings collected from a Commons/Wikipedia URL"""
+    for pattern, resolve in URL_RULES:
+        m = pattern.search(url)
+        if m:
+            return resolve(m)
+    return 'Unknown'
+
+@lru_cache(maxsize=4096)
+def normalize_artist_name(name):
+    """Clean up a stored artist name so it matches the bios and tags"""
+    if not name:
+        return name
+    for pattern, resolve in NAME_RULES:
+        m = pattern.search(name)
+        if m:
+            name = resolve(m, name)
+            break
+    for pattern, resolve in NAME_POST_RULES:
+        m = pattern.search(name)
+        if m:
+            name = resolve(m, name)
+    return name
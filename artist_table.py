@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Normalized paintings format: one artists table instead of per-painting copies
+
+merge_artist_tags.py copies the artist's bio, dates, movement, genre, awards,
+aliases, summary and notable works into every painting. In the normalized
+format those fields are stored once per artist and paintings reference the
+artist by id:
+
+    {
+      "format": "kunstquiz-normalized",
+      "version": 2,
+      "dataset": "<sha256 of the flat paintings, see dataset_id()>",
+      "artists": {"edvard-munch": {"name": "Edvard Munch", "artist_bio": "...", ...}},
+      "key_orders": [["url", "title", "year", "artist", "artist_bio", ...], ...],
+      "paintings": [{"title": "...", "url": "...", "artist_id": "edvard-munch", "key_order": 0, ...}]
+    }
+
+A field moves to the artists table only if all paintings of the artist have
+the same value for it; paintings with a different value keep their own copy,
+which wins when expanding. key_order points at the painting's flat key order
+in key_orders. expand_paintings() therefore returns exactly the flat
+paintings that went in, key order included, so their dataset_id() is that of
+paintings_merged.json.
+
+USAGE:
+    # Expand a normalized file back to the flat paintings_merged.json shape
+    python artist_table.py data/paintings_normalized.json --output /tmp/paintings_flat.json
+
+    # In Python: works with both the flat and the normalized file
+    from artist_table import load_paintings
+    paintings = load_paintings('data/paintings_normalized.json')
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import unicodedata
+
+FORMAT = 'kunstquiz-normalized'
+VERSION = 2
+NORMALIZED_PATH = 'data/paintings_normalized.json'
+
+# Artist-level fields written into each painting by merge_artist_tags.py
+ARTIST_FIELDS = [
+    'artist_bio', 'artist_birth', 'artist_death', 'artist_birthplace', 'artist_deathplace',
+    'artist_movement', 'artist_genre', 'artist_awards', 'artist_self_portrait_url', 'artist_aliases',
+    'movement', 'genre', 'country_of_origin', 'artist_gender', 'artist_summary', 'birthplace',
+    'notable_works',
+]
+
+def artist_id(name):
+    """'Nikolai Astrup' -> 'nikolai-astrup', 'Asta Nørregaard' -> 'asta-norregaard'"""
+    # ø/æ have no ASCII decomposition, å and accented letters do
+    slug = unicodedata.normalize('NFKD', name.replace('ø', 'o').replace('Ø', 'O').replace('æ', 'ae').replace('Æ', 'Ae'))
+    slug = re.sub(r'[^a-z0-9]+', '-', slug.encode('ascii', 'ignore').decode().lower()).strip('-')
+    return slug or 'artist'
+
+def dataset_id(paintings):
+    """
+    sha256 of the flat paintings as the scripts write them (indent=2), i.e.
+    of the bytes of data/paintings_merged.json. Derived files (category
+    index, normalized file, shard manifest) carry it to show which paintings
+    they belong to.
+    """
+    return hashlib.sha256(json.dumps(paintings, indent=2, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def normalize_paintings(paintings):
+    """Flat paintings -> normalized document with an artists table"""
+    by_artist = {}
+    for painting in paintings:
+        if painting.get('artist'):
+            by_artist.setdefault(painting['artist'], []).append(painting)
+
+    ids = {}
+    artists = {}
+    for name in sorted(by_artist):
+        aid = base = artist_id(name)
+        n = 2
+        while aid in artists:
+            aid = f'{base}-{n}'
+            n += 1
+        ids[name] = aid
+        record = {'name': name}
+        group = by_artist[name]
+        for field in ARTIST_FIELDS:
+            if field in group[0] and all(field in p and p[field] == group[0][field] for p in group):
+                record[field] = group[0][field]
+        artists[aid] = record
+
+    key_orders = {}
+    normalized = []
+    for painting in paintings:
+        name = painting.get('artist')
+        if not name:
+            normalized.append(dict(painting))
+            continue
+        record = artists[ids[name]]
+        slim = {}
+        for key, value in painting.items():
+            if key == 'artist':
+                slim['artist_id'] = ids[name]
+            elif key not in record or record[key] != value:
+                slim[key] = value
+        slim['key_order'] = key_orders.setdefault(tuple(painting), len(key_orders))
+        normalized.append(slim)
+    return {'format': FORMAT, 'version': VERSION, 'dataset': dataset_id(paintings),
+            'artists': artists, 'key_orders': [list(order) for order in key_orders], 'paintings': normalized}
+
+def expand_painting(painting, artists, key_orders):
+    """One normalized painting -> the flat painting (artist fields copied in, own values win, original key order)"""
+    if 'artist_id' not in painting:
+        return dict(painting)
+    record = artists[painting['artist_id']]
+    fields = {'artist': record['name']}
+    for key, value in painting.items():
+        if key not in ('artist_id', 'key_order'):
+            fields[key] = value
+    for field, value in record.items():
+        if field != 'name' and field not in fields:
+            fields[field] = value
+    return {key: fields[key] for key in key_orders[painting['key_order']]}
+
+def expand_paintings(document):
+    """Normalized document -> list of flat paintings; flat lists are returned unchanged"""
+    if isinstance(document, list):
+        return document
+    if document.get('format') != FORMAT:
+        raise ValueError(f'Not a {FORMAT} document')
+    if document.get('version') != VERSION:
+        raise ValueError(f'{FORMAT} version {document.get("version")} is not supported, merge again')
+    artists = document['artists']
+    key_orders = document['key_orders']
+    return [expand_painting(p, artists, key_orders) for p in document['paintings']]
+
+def load_paintings(path):
+    """Flat paintings from a flat or normalized paintings file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return expand_paintings(json.load(f))
+
+def main():
+    parser = argparse.ArgumentParser(description='Expand a normalized paintings file to the flat shape')
+    parser.add_argument('input', nargs='?', default=NORMALIZED_PATH, help=f'Normalized paintings file (default: {NORMALIZED_PATH})')
+    parser.add_argument('--output', required=True, help='Flat paintings file to write')
+    args = parser.parse_args()
+
+    paintings = load_paintings(args.input)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(paintings, f, indent=2, ensure_ascii=False)
+    print(f'✅ Expanded {len(paintings)} paintings to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,22 @@ let paintings = [];
 let lastPaintingIndex = -1;
 let selectedCategory = 'all';
 let artistBios = [];
-
-// List of categories with consistent labels - Updated based on actual data
-const CATEGORY_DEFS = [
+let categoryIndex = null;
+// Dataset id of the loaded paintings (see dataset_id() in artist_table.py), to match the category index against
+let datasetId = null;
+// Rules hash of the loaded category definitions (see rules_hash() in category_registry.py)
+let categoryRules = null;
+// sha256 of the loaded data/artist_bios.json, which the bio-based categories depend on
+let biosId = null;
+const categoryCache = {};
+// Sharded export (data/paintings/manifest.json, see dataset_shards.py): paintings by global id, shards loaded on demand
+let shardManifest = null;
+let paintingsById = [];
+const shardLoads = {};
+const loadedShards = new Set();
+
+// Category rules (data/category_defs.json, written from category_registry.py); labels only until they load
+let CATEGORY_DEFS = [
   { value: 'all', label: 'Full Collection' },
   { value: 'popular', label: 'Popular Painters' },
   { value: 'landscape', label: 'Landscape Painting' },
@@ -19,6 +32,7 @@ const CATEGORY_DEFS = [
   { value: 'expressionism', label: 'Expressionism' },
   { value: 'norwegian_romantic', label: 'Norwegian Romantic' }
 ];
+let categoryFilters = {};
 
 function getYearOnly(dateStr) {
   if (!dateStr) return '';
@@ -27,6 +41,10 @@ function getYearOnly(dateStr) {
 }
 
 function getCategoryCounts(categoryValue) {
+  const indexed = categoryIndex?.categories[categoryValue || 'all'];
+  if (indexed) return { count: indexed.paintings.length, painterCount: indexed.artists.length };
+  const listed = shardManifest?.categories[categoryValue || 'all'];
+  if (listed) return { count: listed.paintings, painterCount: listed.artists };
   let filtered = paintings.filter(p => p.artist && p.url);
   if (categoryValue && categoryValue !== 'all') {
     const prev = selectedCategory;
@@ -190,63 +208,83 @@ function getArtistBioMap() {
   }, {});
 }
 
-const categoryFilters = {
-  popular: validPaintings => {
-    const artistCounts = validPaintings.reduce((counts, p) => {
-      if (p.artist) counts[p.artist] = (counts[p.artist] || 0) + 1;
-      return counts;
-    }, {});
-    const topArtists = Object.entries(artistCounts)
-      .sort((a, b) => b[1] - a[1])
-      .slice(0, 10)
-      .map(([name]) => name);
-    return validPaintings.filter(p => topArtists.includes(p.artist));
-  },
-  landscape: p => [...(p.artist_genre || []), ...(p.genre || [])].some(g => g?.toLowerCase().includes('landscape')),
-  portraits: p => [...(p.artist_genre || []), ...(p.genre || [])].some(g => g?.toLowerCase().includes('portrait')),
-  women_painters: p => p.artist_gender === 'female',
-  '19thcentury': (p, artistMap) => {
-    const bio = artistMap[p.artist];
-    const y = bio?.birth_year ? parseInt(bio.birth_year) : null;
-    return y && y >= 1800 && y < 1900;
-  },
-  '20thcentury': (p, artistMap) => {
-    const bio = artistMap[p.artist];
-    let y = bio?.birth_year ? parseInt(bio.birth_year) : (bio?.death_year ? parseInt(bio.death_year) : null);
-    const isModern = bio && (
-      (bio.movement || []).some(m => m?.toLowerCase().includes('modern')) ||
-      (bio.genre || []).some(g => g?.toLowerCase().includes('modern'))
-    );
-    return (y && y >= 1900 && y < 2000) || isModern;
-  },
-  impressionism: p => [...(p.artist_movement || []), ...(p.movement || [])].some(m => m?.toLowerCase().includes('impressionism')),
-  expressionism: p => [...(p.artist_movement || []), ...(p.movement || [])].some(m => m?.toLowerCase().includes('expressionism')),
-  norwegian_romantic: p => [...(p.artist_movement || []), ...(p.movement || [])].some(m => 
-    m?.toLowerCase().includes('nasjonalromantikk') || 
-    m?.toLowerCase().includes('norwegian romantic nationalism') || 
-    m?.toLowerCase().includes('romantic nationalism')
-  )
-};
+function toArray(val) {
+  if (Array.isArray(val)) return val;
+  return typeof val === 'string' && val ? [val] : [];
+}
+
+function containsAny(values, needles) {
+  return values.some(v => needles.some(n => (v || '').toLowerCase().includes(n)));
+}
+
+// Same rule kinds and semantics as compile_row_rule() in category_registry.py
+function compileRowRule(rule) {
+  switch (rule.kind) {
+    case 'all':
+      return () => true;
+    case 'contains':
+      return p => rule.fields.some(f => containsAny(toArray(p[f]), rule.any_of));
+    case 'equals':
+      return p => p[rule.field] === rule.value;
+    case 'bio_year':
+      return (p, bio) => {
+        const field = bio && rule.fields.find(f => bio[f]);
+        const y = field ? parseInt(bio[field]) : null;
+        return Boolean(y) && y >= rule.min && y < rule.max;
+      };
+    case 'bio_contains':
+      return (p, bio) => Boolean(bio) && rule.fields.some(f => containsAny(toArray(bio[f]), rule.any_of));
+    case 'any': {
+      const parts = rule.rules.map(compileRowRule);
+      return (p, bio) => parts.some(part => part(p, bio));
+    }
+    default:
+      throw new Error(`Unknown category rule ${rule.kind}`);
+  }
+}
+
+// filter(validPaintings, artistMap) -> paintings of the category
+function compileCategoryFilter(rule) {
+  if (rule.kind === 'top_artists') {
+    return validPaintings => {
+      const artistCounts = validPaintings.reduce((counts, p) => counts.set(p.artist, (counts.get(p.artist) || 0) + 1), new Map());
+      const topArtists = new Set([...artistCounts.entries()]
+        .sort((a, b) => b[1] - a[1])
+        .slice(0, rule.count)
+        .map(([name]) => name));
+      return validPaintings.filter(p => topArtists.has(p.artist));
+    };
+  }
+  const predicate = compileRowRule(rule);
+  return (validPaintings, artistMap) => validPaintings.filter(p => predicate(p, artistMap[p.artist]));
+}
 
 function getValidPaintings() {
+  // Precomputed at merge time (data/category_index.json): painting ids per category
+  const indexed = categoryIndex?.categories[selectedCategory || 'all'];
+  if (indexed) {
+    if (!categoryCache[selectedCategory]) categoryCache[selectedCategory] = indexed.paintings.map(i => paintingsById[i]).filter(Boolean);
+    return categoryCache[selectedCategory];
+  }
   let filtered = paintings.filter(p => p.artist && p.url);
   if (!selectedCategory || selectedCategory === 'all') return filtered;
-  const artistMap = getArtistBioMap();
   const filterFn = categoryFilters[selectedCategory];
-  if (filterFn) {
-    if (selectedCategory.endsWith('century')) {
-      filtered = filtered.filter(p => filterFn(p, artistMap));
-    } else if (selectedCategory === 'popular') {
-      filtered = filterFn(filtered);
-    } else {
-      filtered = filtered.filter(filterFn);
-    }
-  }
-  return filtered;
+  return filterFn ? filterFn(filtered, getArtistBioMap()) : filtered;
 }
 
 function loadQuiz() {
   const validPaintings = getValidPaintings();
+  if (shardManifest) {
+    // Shards of the selected category first; wait only if none of its paintings is loaded yet
+    const pending = categoryShards(selectedCategory).filter(n => !loadedShards.has(n));
+    if (pending.length) {
+      const loading = Promise.all(pending.map(loadShard));
+      if (!validPaintings.length) {
+        loading.then(loadQuiz).catch(err => console.error(err));
+        return;
+      }
+    }
+  }
   if (!validPaintings.length) {
     document.getElementById('options').innerHTML = '<p>Ingen gyldige malerier funnet.</p>';
     return;
@@ -377,11 +415,115 @@ function cleanWorkTitle(title) {
   return title.replace(/label QS:[^\s,]+,[^\n"]+"/g, '').replace(/<[^>]+>/g, '').replace(/\s+/g, ' ').trim();
 }
 
+// Normalized file (artists table + paintings with artist_id, see artist_table.py) -> flat paintings
+function expandPaintings(data) {
+  if (Array.isArray(data)) return data;
+  const artists = data.artists || {};
+  return data.paintings.map(p => {
+    const artist = artists[p.artist_id];
+    if (!artist) return p;
+    const { artist_id, key_order, ...own } = p;
+    const { name, ...fields } = artist;
+    return { ...fields, ...own, artist: name };
+  });
+}
+
+function loadShard(n) {
+  if (!shardLoads[n]) {
+    const shard = shardManifest.shards[n];
+    // The hash in the query string makes cached shards safe to reuse until they change
+    shardLoads[n] = fetch(`./data/paintings/${shard.file}?v=${shard.sha256.slice(0, 12)}`)
+      .then(res => {
+        if (!res.ok) throw new Error(`Failed to load ${shard.file}`);
+        return res.json();
+      })
+      .then(data => {
+        expandPaintings(data).forEach((p, k) => {
+          paintingsById[data.ids[k]] = p;
+          paintings.push(p);
+        });
+        loadedShards.add(n);
+        Object.keys(categoryCache).forEach(key => delete categoryCache[key]);
+      });
+  }
+  return shardLoads[n];
+}
+
+function categoryShards(category) {
+  const entry = shardManifest.categories[category || 'all'];
+  return entry ? entry.shards : shardManifest.shards.map((_, n) => n);
+}
+
+// sha256 of the flat paintings as the Python scripts write them (indent=2), null without WebCrypto
+async function sha256Hex(bytes) {
+  if (!window.crypto?.subtle) return null;
+  const digest = await crypto.subtle.digest('SHA-256', bytes);
+  return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+}
+
+async function flatDatasetId(flatPaintings) {
+  return sha256Hex(new TextEncoder().encode(JSON.stringify(flatPaintings, null, 2)));
+}
+
+async function loadPaintings() {
+  // Sharded export: only the first shard before the first question, the rest in the background
+  const manifestRes = await fetch('./data/paintings/manifest.json');
+  if (manifestRes.ok) {
+    shardManifest = await manifestRes.json();
+    datasetId = shardManifest.dataset || null;
+    paintingsById = new Array(shardManifest.paintings);
+    if (shardManifest.shards.length) await loadShard(0);
+    return;
+  }
+  // Prefer the normalized file (much smaller), fall back to the flat one
+  let res = await fetch('./data/paintings_normalized.json');
+  if (!res.ok) res = await fetch('./data/paintings_merged.json');
+  if (!res.ok) throw new Error('Failed to load paintings');
+  const data = await res.json();
+  paintings = expandPaintings(data);
+  paintingsById = paintings;
+  datasetId = Array.isArray(data) ? await flatDatasetId(data).catch(() => null) : data.dataset || null;
+}
+
+function loadRemainingShards() {
+  if (!shardManifest) return;
+  shardManifest.shards.forEach((_, n) => loadShard(n).catch(err => console.error(err)));
+}
+
+async function loadCategoryIndex() {
+  // Optional: without it (or if it belongs to other paintings, even with the same count) categories are filtered here
+  try {
+    const res = await fetch('./data/category_index.json');
+    if (!res.ok) return;
+    const index = await res.json();
+    if (datasetId && index.dataset === datasetId && index.paintings === paintingsById.length) categoryIndex = index;
+  } catch (err) {
+    console.error(err);
+  }
+}
+
+async function loadCategoryDefs() {
+  try {
+    const res = await fetch('./data/category_defs.json');
+    if (!res.ok) throw new Error('Failed to load category definitions');
+    const doc = await res.json();
+    const defs = Array.isArray(doc) ? doc : doc.categories;
+    categoryRules = doc.rules || null;
+    CATEGORY_DEFS = defs.map(({ value, label }) => ({ value, label }));
+    categoryFilters = Object.fromEntries(defs.map(cat => [cat.value, compileCategoryFilter(cat.rule)]));
+  } catch (err) {
+    console.error(err);
+  }
+}
+
 async function loadArtistBios() {
   try {
     const res = await fetch('./data/artist_bios.json');
     if (!res.ok) throw new Error('Failed to load artist bios');
-    artistBios = await res.json();
+    const bytes = await res.arrayBuffer();
+    artistBios = JSON.parse(new TextDecoder().decode(bytes));
+    // Hash of the file as served (see bios_id() in category_index.py)
+    biosId = await sha256Hex(bytes);
   } catch (err) {
     console.error(err);
     artistBios = [];
@@ -564,10 +706,10 @@ function setupArtistModal() {
 
 document.addEventListener('DOMContentLoaded', async () => {
   try {
-    const res = await fetch('./data/paintings_merged.json');
-    if (!res.ok) throw new Error('Failed to load paintings');
-    paintings = await res.json();
-    await loadArtistBios();
+    await loadPaintings();
+    await Promise.all([loadArtistBios(), loadCategoryIndex(), loadCategoryDefs()]);
+    // An index built with other category rules or bios is stale; fall back to the compiled filters
+    if (categoryIndex && (categoryIndex.rules !== categoryRules || categoryIndex.bios !== biosId)) categoryIndex = null;
     updateCategoryDropdown();
     updateCollectionInfo();
     renderCategorySelector();
@@ -576,6 +718,7 @@ document.addEventListener('DOMContentLoaded', async () => {
     setupGalleryModal();
     setupLogoReset();
     setupCategoryChangeInfoBar();
+    loadRemainingShards();
     const resetBtn = document.getElementById('reset-btn');
     if (resetBtn) resetBtn.addEventListener('click', () => {
       streak = 0;
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML parser backends on saved Commons pages
+
+Parses every saved page with each installed backend, with and without the
+content-only strainer, runs the same extraction as collect_art.py and
+checks the results against the original setup (html.parser, full page).
+
+USAGE:
+    # Save some category pages first (goes through the HTTP cache)
+    python benchmark_parsers.py --save "https://commons.wikimedia.org/wiki/Category:Paintings_by_Edvard_Munch"
+    python benchmark_parsers.py --save-file urls.txt
+
+    # Run the benchmark
+    python benchmark_parsers.py --repeat 5
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import sys
+import time
+
+from collect_art import extract_subcategory_links, extract_gallery_images, find_next_page_url, get_session
+from html_parser import available_backends, parse_page
+
+PAGES_DIR = 'benchmarks/pages'
+
+def save_pages(urls, pages_dir):
+    os.makedirs(pages_dir, exist_ok=True)
+    session = get_session()
+    for url in urls:
+        r = session.get(url, timeout=30)
+        r.raise_for_status()
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12] + '.html'
+        with open(os.path.join(pages_dir, name), 'w', encoding='utf-8') as f:
+            f.write(r.text)
+        print(f'Saved {url} -> {name} ({len(r.content) / 1024:.0f} KB)')
+
+def extract_all(soup):
+    """Same extraction order as fetch_commons_unified"""
+    subcategories = extract_subcategory_links(soup)
+    images = extract_gallery_images(soup)
+    next_url = find_next_page_url(soup)
+    return subcategories, images, next_url
+
+def run(html, backend, strainer):
+    start = time.perf_counter()
+    soup = parse_page(html, backend, strainer)
+    parsed = time.perf_counter()
+    result = extract_all(soup)
+    done = time.perf_counter()
+    return result, parsed - start, done - parsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser backends on saved pages')
+    parser.add_argument('--pages', default=PAGES_DIR, help=f'Directory with saved .html pages (default: {PAGES_DIR})')
+    parser.add_argument('--save', action='append', help='Download a page into the pages directory (can be used multiple times)')
+    parser.add_argument('--save-file', help='Download every URL in a urls.txt-style file')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per page and configuration (default: 3)')
+    args = parser.parse_args()
+
+    urls = args.save or []
+    if args.save_file:
+        with open(args.save_file, 'r', encoding='utf-8') as f:
+            urls += [line.strip() for line in f if line.strip().startswith('http')]
+    if urls:
+        save_pages(urls, args.pages)
+        return
+
+    pages = sorted(glob.glob(os.path.join(args.pages, '*.html')))
+    if not pages:
+        print(f'No saved pages in {args.pages}. Save some with --save URL first.')
+        sys.exit(1)
+
+    configs = [(backend, strainer) for backend in available_backends() for strainer in (False, True)]
+    totals = {config: [0.0, 0.0] for config in configs}
+    mismatches = []
+    total_bytes = 0
+
+    for path in pages:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        total_bytes += len(html.encode('utf-8'))
+        baseline, _, _ = run(html, 'html.parser', False)
+        for config in configs:
+            for _ in range(args.repeat):
+                result, parse_time, extract_time = run(html, *config)
+                totals[config][0] += parse_time / args.repeat
+                totals[config][1] += extract_time / args.repeat
+            if result != baseline:
+                mismatches.append((os.path.basename(path), config))
+
+    print(f'\n⏱️  Parser benchmark: {len(pages)} pages, {total_bytes / 1024 / 1024:.1f} MB, {args.repeat} runs each')
+    base_total = sum(totals[('html.parser', False)])
+    print(f'{"backend":<13}{"strainer":<10}{"parse ms":>10}{"extract ms":>12}{"total ms":>10}{"speedup":>9}')
+    for (backend, strainer), (parse_time, extract_time) in totals.items():
+        total = parse_time + extract_time
+        print(f'{backend:<13}{"yes" if strainer else "no":<10}{parse_time * 1000:>10.1f}{extract_time * 1000:>12.1f}'
+              f'{total * 1000:>10.1f}{base_total / total if total else 0:>8.1f}x')
+
+    if mismatches:
+        print(f'\n🔴 {len(mismatches)} result mismatches against html.parser (full page):')
+        for page, (backend, strainer) in mismatches:
+            print(f'  - {page}: {backend}{" + strainer" if strainer else ""}')
+        sys.exit(1)
+    print('\n🟢 All configurations extract identical results')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Build the static site with minified and precompressed data
+
+The JSON files in data/ are written with indent=2 by every script and stay
+the human-readable source of truth. This build copies the site into dist/
+with:
+
+- data/*.json (and the shards in data/paintings/) minified
+- index.html, CNAME, assets/js/script.js and assets/css/style.css as they are
+- a .gz sibling (and .br with the optional 'brotli' package, pip install
+  brotli; without it the build warns and writes .gz only) for the JSON,
+  script.js and style.css, for servers that serve precompressed files
+  (nginx gzip_static/brotli_static, Caddy precompressed, most CDNs)
+
+and reports raw, minified and compressed sizes. Compression is
+deterministic (no timestamps), so unchanged files give identical artifacts.
+
+USAGE:
+    python build_site.py
+    python build_site.py --out-dir /tmp/site --no-compress
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DIST_DIR = 'dist'
+DATA_PATTERNS = ['data/*.json', 'data/paintings/*.json']
+ASSETS = ['assets/js/script.js', 'assets/css/style.css']
+COPY_ONLY = ['index.html', 'CNAME']
+
+def minify_json(data):
+    """Compact JSON; the original bytes if they are already as small (e.g. the shards, whose hashes must hold)"""
+    minified = json.dumps(json.loads(data), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return minified if len(minified) < len(data) else data
+
+def compress(data):
+    """Precompressed variants: {'.gz': bytes, '.br': bytes}"""
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return variants
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def build_file(source, out_dir, minify, precompress):
+    """Copy one file into out_dir (minified, with compressed siblings); returns its size row"""
+    with open(source, 'rb') as f:
+        raw = f.read()
+    data = minify_json(raw) if minify else raw
+    target = os.path.join(out_dir, source)
+    write(target, data)
+    row = {'file': source, 'raw': len(raw), 'minified': len(data)}
+    if precompress:
+        for suffix, compressed in compress(data).items():
+            write(target + suffix, compressed)
+            row[suffix] = len(compressed)
+    return row
+
+def build_site(out_dir=DIST_DIR, precompress=True):
+    """Build the site into out_dir; returns the size rows"""
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    rows = []
+    for pattern in DATA_PATTERNS:
+        for source in sorted(glob.glob(pattern)):
+            rows.append(build_file(source, out_dir, True, precompress))
+    for source in ASSETS:
+        if os.path.exists(source):
+            rows.append(build_file(source, out_dir, False, precompress))
+    for source in COPY_ONLY:
+        if os.path.exists(source):
+            target = os.path.join(out_dir, source)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, target)
+    return rows
+
+def print_report(rows, precompress=True):
+    suffixes = (['.gz'] + (['.br'] if brotli is not None else [])) if precompress else []
+    print(f'\n📦 {"File":<45} {"Raw":>10} {"Minified":>10}' + ''.join(f'{s:>10}' for s in suffixes))
+    for row in rows:
+        print(f'   {row["file"]:<45} {kb(row["raw"]):>10} {kb(row["minified"]):>10}'
+              + ''.join(f'{kb(row[s]):>10}' for s in suffixes))
+    totals = {key: sum(row[key] for row in rows) for key in ['raw', 'minified'] + suffixes}
+    print(f'   {"Total":<45} {kb(totals["raw"]):>10} {kb(totals["minified"]):>10}'
+          + ''.join(f'{kb(totals[s]):>10}' for s in suffixes))
+    if totals['raw']:
+        smallest = min(totals[key] for key in ['minified'] + suffixes)
+        print(f'   Transfer size: {smallest / totals["raw"] * 100:.1f}% of the pretty-printed files')
+
+def kb(size):
+    return f'{size / 1024:.1f} KB'
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the static site with minified JSON and precompressed siblings')
+    parser.add_argument('--out-dir', default=DIST_DIR, help=f'Output directory (default: {DIST_DIR})')
+    parser.add_argument('--no-compress', action='store_true', help='Only minify, no .gz/.br files')
+    args = parser.parse_args()
+
+    if not args.no_compress and brotli is None:
+        print('⚠️  WARNING: the brotli package is not installed, no .br files will be written '
+              '(only .gz). pip install brotli for brotli output.')
+    rows = build_site(args.out_dir, not args.no_compress)
+    print_report(rows, not args.no_compress)
+    print(f'\n✅ Built site in {args.out_dir}/')
+    if not args.no_compress and brotli is None:
+        print('⚠️  WARNING: no .br files written (brotli package not installed)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Quiz category index, computed once at merge time
+
+Evaluates every quiz category (the rules in category_registry.py, which the
+quiz compiles too) over the merged paintings and stores which paintings and
+painters belong to each one:
+
+    {
+      "version": 3,
+      "paintings": 3171,
+      "dataset": "<sha256 of the flat paintings, see artist_table.dataset_id()>",
+      "rules": "<sha256 of the category rules, see category_registry.rules_hash()>",
+      "bios": "<sha256 of data/artist_bios.json, which the bio-based categories read>",
+      "categories": {
+        "landscape": {"label": "Landscape Painting", "paintings": [0, 4, 17, ...], "artists": ["Hans Gude", ...]},
+        ...
+      }
+    }
+
+Painting ids are positions in paintings_merged.json (and in the paintings of
+paintings_normalized.json, which has the same order), sorted ascending.
+merge_artist_tags.py writes the index next to the paintings; diagnostics.py
+and the quiz read it instead of filtering the whole collection again, but
+only if its dataset, rules and bios hashes match what they loaded (same count
+alone would accept a reordered or edited collection).
+
+USAGE:
+    # Rebuild the index for an existing merged file
+    python category_index.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from collections import Counter
+
+from artist_table import dataset_id, load_paintings
+from category_registry import CATEGORIES, CATEGORY_DEFS, compile_row_rule, is_row_rule, rules_hash, top_artists
+
+INDEX_PATH = 'data/category_index.json'
+BIOS_PATH = 'data/artist_bios.json'
+VERSION = 3
+
+def bios_id(path=BIOS_PATH):
+    """sha256 of the bios file as stored (the quiz hashes the bytes it fetches), None if it is missing"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class CategoryIndexBuilder:
+    """
+    Streaming category evaluation: add() paintings in order, then result().
+    Categories over the whole collection (top_artists) are resolved at the end
+    from the painting counts.
+    """
+
+    def __init__(self, bios_by_name):
+        self.bios_by_name = bios_by_name
+        self.rows = 0
+        self.predicates = {c['value']: compile_row_rule(c['rule']) for c in CATEGORIES if is_row_rule(c['rule'])}
+        self.members = {value: [] for value in self.predicates}
+        self.artist = {}
+        self.by_artist = {}
+
+    def add(self, p):
+        """Only paintings with an artist and a URL are quiz candidates"""
+        i = self.rows
+        self.rows += 1
+        if not (p.get('artist') and p.get('url')):
+            return
+        artist = p['artist']
+        self.artist[i] = artist
+        self.by_artist.setdefault(artist, []).append(i)
+        bio = self.bios_by_name.get(artist)
+        for value, predicate in self.predicates.items():
+            if predicate(p, bio):
+                self.members[value].append(i)
+
+    def result(self):
+        counts = Counter({artist: len(ids) for artist, ids in self.by_artist.items()})
+        members = dict(self.members)
+        for category in CATEGORIES:
+            if category['value'] not in members:
+                top = top_artists(counts, category['rule']['count'])
+                members[category['value']] = sorted(i for a in top for i in self.by_artist[a])
+        categories = {}
+        for cat in CATEGORY_DEFS:
+            ids = members[cat['value']]
+            categories[cat['value']] = {
+                'label': cat['label'],
+                'paintings': ids,
+                'artists': sorted({self.artist[i] for i in ids}),
+            }
+        return {'version': VERSION, 'paintings': self.rows, 'categories': categories}
+
+def build_category_index(paintings, bios_by_name, bios=None):
+    """Category index for paintings; bios is the bios_id() of the file bios_by_name came from"""
+    builder = CategoryIndexBuilder(bios_by_name)
+    for p in paintings:
+        builder.add(p)
+    index = builder.result()
+    index['dataset'] = dataset_id(paintings)
+    index['rules'] = rules_hash()
+    index['bios'] = bios
+    return index
+
+def write_category_index(index, path=INDEX_PATH):
+    # Compact: the id arrays would take one line per id with indent
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+def read_category_index(dataset, bios, path=INDEX_PATH):
+    """
+    Index from path if it was written for the paintings with this
+    dataset_id() and the bios with this bios_id(), with the current
+    category rules and version, else None
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    if index.get('version') == VERSION and index.get('dataset') == dataset \
+            and index.get('rules') == rules_hash() and index.get('bios') == bios:
+        return index
+    return None
+
+def load_category_index(paintings, bios_by_name, bios, path=INDEX_PATH):
+    """Index from path if it matches the paintings and bios (see read_category_index), else built in memory"""
+    return read_category_index(dataset_id(paintings), bios, path) or build_category_index(paintings, bios_by_name, bios)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the quiz category index for the merged paintings')
+    parser.add_argument('--paintings', default='data/paintings_merged.json', help='Merged paintings (flat or normalized)')
+    parser.add_argument('--bios', default=BIOS_PATH, help='Artist bios')
+    parser.add_argument('--output', default=INDEX_PATH, help=f'Index file (default: {INDEX_PATH})')
+    args = parser.parse_args()
+
+    paintings = load_paintings(args.paintings)
+    with open(args.bios, 'r', encoding='utf-8') as f:
+        bios_by_name = {b['name']: b for b in json.load(f)}
+    index = build_category_index(paintings, bios_by_name, bios_id(args.bios))
+    write_category_index(index, args.output)
+    print(f'✅ Wrote category index for {len(paintings)} paintings to {args.output}')
+    for cat in CATEGORY_DEFS:
+        entry = index['categories'][cat['value']]
+        print(f'  {cat["label"]}: {len(entry["paintings"])} paintings, {len(entry["artists"])} painters')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Quiz category registry: one declarative definition per category
+
+Every quiz category is a plain-data rule. The same definitions are compiled
+three ways:
+
+- compile_row_rule(): a predicate over one painting dict and its artist's
+  bio, used by category_index.py at merge time and by diagnostics.py
+- compile_vectorized(): a NumPy predicate over a columnar export (see
+  columnar_export.py); evaluate_bitmask() runs all categories in one pass
+  and returns one bit per category for every painting
+- assets/js/script.js compiles data/category_defs.json (written by
+  export_definitions()) into its category filters
+
+Rule kinds (all categories also require a painting with an artist and a URL):
+
+    {'kind': 'all'}
+    {'kind': 'top_artists', 'count': 10}              most painted artists
+    {'kind': 'contains', 'fields': [...], 'any_of': [...]}
+        case-insensitive substring in any value of the painting's fields
+        (lists, or strings as one-element lists)
+    {'kind': 'equals', 'field': ..., 'value': ...}     painting field
+    {'kind': 'bio_year', 'fields': [...], 'min': a, 'max': b}
+        leading integer of the first non-empty bio field, a <= year < b
+    {'kind': 'bio_contains', 'fields': [...], 'any_of': [...]}
+    {'kind': 'any', 'rules': [...]}
+
+USAGE:
+    # Export the definitions for the quiz (also done by merge_artist_tags.py)
+    python category_registry.py --export
+
+    # Check the vectorized bitmask against the row-wise category index
+    python category_registry.py --check data/paintings_merged.kqc
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import time
+
+# Only needed for the vectorized evaluation; the row predicates work without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFS_PATH = 'data/category_defs.json'
+
+CATEGORIES = [
+    {'value': 'all', 'label': 'Full Collection', 'rule': {'kind': 'all'}},
+    {'value': 'popular', 'label': 'Popular Painters', 'rule': {'kind': 'top_artists', 'count': 10}},
+    {'value': 'landscape', 'label': 'Landscape Painting',
+     'rule': {'kind': 'contains', 'fields': ['artist_genre', 'genre'], 'any_of': ['landscape']}},
+    {'value': 'portraits', 'label': 'Portraits',
+     'rule': {'kind': 'contains', 'fields': ['artist_genre', 'genre'], 'any_of': ['portrait']}},
+    {'value': 'women_painters', 'label': 'Women Painters',
+     'rule': {'kind': 'equals', 'field': 'artist_gender', 'value': 'female'}},
+    {'value': '19thcentury', 'label': '19th Century',
+     'rule': {'kind': 'bio_year', 'fields': ['birth_year'], 'min': 1800, 'max': 1900}},
+    {'value': '20thcentury', 'label': '20th Century',
+     'rule': {'kind': 'any', 'rules': [
+         {'kind': 'bio_year', 'fields': ['birth_year', 'death_year'], 'min': 1900, 'max': 2000},
+         {'kind': 'bio_contains', 'fields': ['movement', 'genre'], 'any_of': ['modern']},
+     ]}},
+    {'value': 'impressionism', 'label': 'Impressionism',
+     'rule': {'kind': 'contains', 'fields': ['artist_movement', 'movement'], 'any_of': ['impressionism']}},
+    {'value': 'expressionism', 'label': 'Expressionism',
+     'rule': {'kind': 'contains', 'fields': ['artist_movement', 'movement'], 'any_of': ['expressionism']}},
+    {'value': 'norwegian_romantic', 'label': 'Norwegian Romantic',
+     'rule': {'kind': 'contains', 'fields': ['artist_movement', 'movement'],
+              'any_of': ['nasjonalromantikk', 'norwegian romantic nationalism', 'romantic nationalism']}},
+]
+
+CATEGORY_DEFS = [{'value': c['value'], 'label': c['label']} for c in CATEGORIES]
+# Bit of each category in evaluate_bitmask()
+CATEGORY_BITS = {c['value']: 1 << n for n, c in enumerate(CATEGORIES)}
+
+def rules_hash(categories=CATEGORIES):
+    """sha256 of the category definitions; results computed with other rules are stale"""
+    rules = json.dumps(categories, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(rules.encode('utf-8')).hexdigest()
+
+def arr(val):
+    if isinstance(val, list):
+        return val
+    elif isinstance(val, str) and val:
+        return [val]
+    return []
+
+def parse_year(value):
+    """Leading integer of a year string like parseInt() in the quiz, None if there is none"""
+    m = re.match(r'\s*([+-]?\d+)', str(value)) if value else None
+    return int(m.group(1)) if m else None
+
+def contains_any(values, needles):
+    return any(any(n in (v or '').lower() for n in needles) for v in values)
+
+def bio_year(bio, fields):
+    """Year from the first non-empty bio field (like `bio.birth_year ? parseInt(...) : ...`)"""
+    for field in fields:
+        if bio.get(field):
+            return parse_year(bio[field])
+    return None
+
+def is_row_rule(rule):
+    """False for rules that depend on the whole collection (top_artists)"""
+    if rule['kind'] == 'any':
+        return all(is_row_rule(r) for r in rule['rules'])
+    return rule['kind'] != 'top_artists'
+
+def compile_row_rule(rule):
+    """predicate(painting, bio) for a rule; bio is None for artists without one"""
+    kind = rule['kind']
+    if kind == 'all':
+        return lambda p, bio: True
+    if kind == 'contains':
+        fields, needles = rule['fields'], rule['any_of']
+        return lambda p, bio: any(contains_any(arr(p.get(f)), needles) for f in fields)
+    if kind == 'equals':
+        field, value = rule['field'], rule['value']
+        return lambda p, bio: p.get(field) == value
+    if kind == 'bio_year':
+        fields, low, high = rule['fields'], rule['min'], rule['max']
+        return lambda p, bio: bool(bio) and low <= (bio_year(bio, fields) or 0) < high
+    if kind == 'bio_contains':
+        fields, needles = rule['fields'], rule['any_of']
+        return lambda p, bio: bool(bio) and any(contains_any(arr(bio.get(f)), needles) for f in fields)
+    if kind == 'any':
+        parts = [compile_row_rule(r) for r in rule['rules']]
+        return lambda p, bio: any(part(p, bio) for part in parts)
+    raise ValueError(f'Rule kind {kind!r} has no row predicate')
+
+def top_artists(counts, count):
+    """Most painted artists from a Counter in first-appearance order (ties keep that order)"""
+    return [a for a, _ in counts.most_common(count)]
+
+def compile_vectorized(rule, bios_by_name):
+    """predicate(cols) -> boolean row mask over a ColumnarPaintings view"""
+    kind = rule['kind']
+    if kind == 'all':
+        return lambda cols: np.ones(cols.rows, dtype=bool)
+    if kind == 'contains':
+        fields, needles = rule['fields'], rule['any_of']
+
+        def contains(cols):
+            mask = np.zeros(cols.rows, dtype=bool)
+            for field in fields:
+                # Tested once per dictionary entry, then gathered by code
+                mask |= cols.mask(field, lambda v: contains_any([v], needles))
+            return mask
+        return contains
+    if kind == 'equals':
+        field, value = rule['field'], rule['value']
+        return lambda cols: cols.mask(field, lambda v: v == value)
+    if kind in ('bio_year', 'bio_contains'):
+        # Bio rules only depend on the artist: evaluate per artist, gather by artist code
+        row = compile_row_rule(rule)
+        return lambda cols: cols.mask('artist', lambda artist: row(None, bios_by_name.get(artist)))
+    if kind == 'top_artists':
+        count = rule['count']
+
+        def top(cols):
+            valid = valid_rows(cols)
+            codes = cols.column('artist')[valid]
+            counts = np.bincount(codes, minlength=len(cols.values('artist')))
+            # Ties in first-appearance order among valid rows, like Counter.most_common
+            first = np.full(counts.size, cols.rows, dtype=np.int64)
+            np.minimum.at(first, codes, np.arange(codes.size))
+            order = np.lexsort((first, -counts))
+            chosen = order[counts[order] > 0][:count]
+            hit = np.zeros(counts.size + 1, dtype=bool)
+            hit[chosen] = True
+            return hit[cols.column('artist')]
+        return top
+    if kind == 'any':
+        parts = [compile_vectorized(r, bios_by_name) for r in rule['rules']]
+
+        def any_of(cols):
+            mask = np.zeros(cols.rows, dtype=bool)
+            for part in parts:
+                mask |= part(cols)
+            return mask
+        return any_of
+    raise ValueError(f'Unknown rule kind {kind!r}')
+
+def valid_rows(cols):
+    """Quiz candidates: paintings with an artist and a URL"""
+    return (cols.column('artist') >= 0) & (cols.column('url') >= 0)
+
+def evaluate_bitmask(cols, bios_by_name):
+    """uint32 per painting with CATEGORY_BITS set for every category it belongs to"""
+    valid = valid_rows(cols)
+    masks = np.zeros(cols.rows, dtype=np.uint32)
+    for category in CATEGORIES:
+        hit = compile_vectorized(category['rule'], bios_by_name)(cols) & valid
+        masks[hit] |= np.uint32(CATEGORY_BITS[category['value']])
+    return masks
+
+def index_from_bitmask(masks, cols):
+    """Category index (see category_index.py) from evaluate_bitmask()"""
+    artists = cols.values('artist')
+    codes = cols.column('artist')
+    categories = {}
+    for category in CATEGORIES:
+        ids = np.flatnonzero(masks & np.uint32(CATEGORY_BITS[category['value']]))
+        categories[category['value']] = {
+            'label': category['label'],
+            'paintings': ids.tolist(),
+            'artists': sorted({artists[c] for c in np.unique(codes[ids])}),
+        }
+    return categories
+
+def export_definitions(path=DEFS_PATH):
+    """Write the registry for the quiz, with the rules hash the category index is checked against"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'rules': rules_hash(), 'categories': CATEGORIES}, f, indent=2, ensure_ascii=False)
+
+def main():
+    parser = argparse.ArgumentParser(description='Export or check the quiz category registry')
+    parser.add_argument('--export', action='store_true', help=f'Write the definitions to {DEFS_PATH}')
+    parser.add_argument('--check', metavar='KQC', help='Compare the vectorized bitmask on a columnar export with the row-wise index')
+    parser.add_argument('--paintings', default='data/paintings_merged.json', help='Paintings the columnar export was made from (for --check)')
+    parser.add_argument('--bios', default='data/artist_bios.json', help='Artist bios')
+    args = parser.parse_args()
+
+    if args.export:
+        export_definitions()
+        print(f'✅ Wrote {len(CATEGORIES)} category definitions to {DEFS_PATH}')
+    if args.check:
+        # Imported here: these modules depend on the registry
+        from artist_table import load_paintings
+        from category_index import build_category_index
+        from columnar_export import load_columnar
+        with open(args.bios, 'r', encoding='utf-8') as f:
+            bios_by_name = {b['name']: b for b in json.load(f)}
+        start = time.perf_counter()
+        cols = load_columnar(args.check)
+        masks = evaluate_bitmask(cols, bios_by_name)
+        elapsed = (time.perf_counter() - start) * 1000
+        vectorized = index_from_bitmask(masks, cols)
+        expected = build_category_index(load_paintings(args.paintings), bios_by_name)['categories']
+        for category in CATEGORIES:
+            same = vectorized[category['value']] == expected[category['value']]
+            print(f'  {"✅" if same else "❌"} {category["label"]}: {len(vectorized[category["value"]]["paintings"])} paintings')
+        print(f'📊 All categories in {elapsed:.1f} ms (bitmask pass over {cols.rows} paintings)')
+
+if __name__ == '__main__':
+    main()
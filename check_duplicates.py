@@ -1,39 +1,19 @@
-import json
+from key_index import KeyIndex
 
-# Load the paintings data
-with open('data/paintings_appended.json', 'r', encoding='utf-8') as f:
-    paintings = json.load(f)
+# Duplicate counts come from the persistent key index, which is only
+# rebuilt (one full load) when the paintings file changed since last run
+index = KeyIndex('data/paintings_appended.json').ensure_synced()
 
-print(f'Total paintings: {len(paintings)}')
+total = index.count()
+print(f'Total paintings: {total}')
 
 # Check for duplicates based on (artist, title, url)
-unique_combinations = set()
-duplicates = 0
-duplicate_details = []
-
-for i, painting in enumerate(paintings):
-    key = (painting.get('artist', ''), painting.get('title', ''), painting.get('url', ''))
-    if key in unique_combinations:
-        duplicates += 1
-        duplicate_details.append({
-            'index': i,
-            'artist': painting.get('artist', ''),
-            'title': painting.get('title', ''),
-            'url': painting.get('url', '')
-        })
-    unique_combinations.add(key)
-
-print(f'Unique paintings: {len(unique_combinations)}')
-print(f'Duplicates found: {duplicates}')
+unique_count = index.unique_count()
+print(f'Unique paintings: {unique_count}')
+print(f'Duplicates found: {total - unique_count}')
 
 # Check for duplicates based on just URL (most reliable)
-url_counts = {}
-for painting in paintings:
-    url = painting.get('url', '')
-    if url:
-        url_counts[url] = url_counts.get(url, 0) + 1
-
-url_duplicates = {url: count for url, count in url_counts.items() if count > 1}
+url_duplicates = index.url_duplicates()
 print(f'URL duplicates: {len(url_duplicates)}')
 
 if url_duplicates:
@@ -42,13 +22,7 @@ if url_duplicates:
         print(f'  {url}: {count} times')
 
 # Check for duplicates based on just title (might be same painting, different URLs)
-title_counts = {}
-for painting in paintings:
-    title = painting.get('title', '')
-    if title:
-        title_counts[title] = title_counts.get(title, 0) + 1
-
-title_duplicates = {title: count for title, count in title_counts.items() if count > 1}
+title_duplicates = index.title_duplicates()
 print(f'\nTitle duplicates: {len(title_duplicates)}')
 
 if title_duplicates:
@@ -57,7 +31,8 @@ if title_duplicates:
         print(f'  "{title}": {count} times')
 
 # Show some sample duplicates
+duplicate_details = index.exact_duplicates()
 if duplicate_details:
     print('\nSample duplicate entries:')
-    for dup in duplicate_details[:3]:
-        print(f'  Index {dup["index"]}: {dup["artist"]} - "{dup["title"]}"') 
\ No newline at end of file
+    for artist, title, url, offset in duplicate_details[:3]:
+        print(f'  Index {offset}: {artist} - "{title}"')
@@ -29,6 +29,22 @@ python collect_art.py --file urls.txt --randomize --total-max 100 --quiet
 # Full workflow with diagnostics
 python collect_art.py --file urls.txt --max 50 --total-max 200 --quiet --merge --diagnose
 
+# Use the MediaWiki API instead of scraping HTML (real dimensions, size and sha1)
+python collect_art.py --file urls.txt --max 30 --backend api --quiet
+
+# Long runs: keep a persistent job queue, then resume after an interruption
+python collect_art.py --file urls.txt --max 30 --queue --quiet
+python collect_art.py --resume --quiet
+
+# Fetch subcategories and seed URLs in parallel (same results as sequential)
+python collect_art.py --file urls.txt --max 30 --concurrency 16 --per-host 8 --quiet
+
+# Spread parsing over several processes (same results as sequential)
+python collect_art.py --file urls.txt --max 30 --workers 16 --quiet
+
+# Find out where a slow run spends its time (network, parsing or throttling)
+python collect_art.py --file urls.txt --max 30 --trace crawl_trace.json --metrics crawl.prom
+
 URL STRATEGY:
 ============
 - Use main categories for maximum coverage: "Category:Paintings_by_[Artist]"
@@ -47,6 +63,21 @@ ARGUMENTS:
 --randomize: Randomize URL order for organic collection
 --merge: Run merge script after collection
 --diagnose: Run diagnostics after merge
+--backend: html (scrape category pages, default) or api (MediaWiki API, ignores --concurrency)
+--store: json (rewrite data/paintings_appended.json, default) or jsonl (append-only log, compacted on --merge)
+--skip-known: Skip images whose URL is already collected (uses the persistent key index)
+--queue: Track page fetches in a persistent job queue (data/crawl_queue.sqlite) and append per URL
+--resume: Continue an interrupted --queue run with the remaining frontier
+--no-cache: Always refetch pages instead of using the on-disk HTTP cache
+--cache-dir / --cache-ttl / --cache-max-mb: HTTP cache location, revalidation age in hours and size limit
+--parser: HTML parser backend: auto (lxml when installed), lxml or html.parser
+--full-parse: Build the whole page tree instead of only the gallery/category containers
+--concurrency: Number of pages fetched in parallel (default: 1, sequential)
+--per-host: Maximum parallel requests per host with --concurrency (default: 4)
+--rate: Requests per second per host (default: 5); 429/5xx responses back off, honoring Retry-After
+--workers: Collect seed URLs in N processes; partial results go to data/shards/ and are merged in seed order
+--trace: Write a JSON trace of every fetched page (fetch/parse/extract time, bytes, cache hits, retries)
+--metrics: Write the same measurements as a Prometheus text-format file
 
 LIMIT EXAMPLES:
 ==============
@@ -56,119 +87,137 @@ LIMIT EXAMPLES:
 """
 
 import argparse
+import asyncio
+import contextlib
 import json
 import os
 import sys
 import re
 import requests
 import random
-from bs4 import BeautifulSoup
-from collections import Counter
+from collections import Counter, deque
+from urllib.parse import urlparse
+import multiprocessing
+import shutil
 import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from commons_api import fetch_commons_api
+from commons_files import SKIP_SUBCATEGORIES, dedupe_by_url, file_key
+from crawl_queue import CrawlQueue, QUEUE_FILE
+from painting_store import PaintingStore, JSONL_FILE
+from key_index import KeyIndex, painting_key
+from html_parser import parse_page, configure_parser
+from artist_resolver import resolve_artist_from_url
+from http_cache import CachedSession, CACHE_DIR, DEFAULT_TTL, DEFAULT_MAX_MB
+from http_client import PoliteSession, DEFAULT_RATE, DEFAULT_POOL_SIZE
+from crawl_metrics import CrawlMetrics, current_seed
 
 APPENDED_FILE = 'data/paintings_appended.json'
 MANUAL_FILE = 'data/manual_paintings.json'
 MERGE_SCRIPT = 'merge_artist_tags.py'
 DIAGNOSE_SCRIPT = 'diagnostics.py'
+SHARD_DIR = 'data/shards'
+
+_session = None
+_known_index = None
+# Per-page fetch/parse/extract measurements for this run (see crawl_metrics.py)
+metrics = CrawlMetrics()
+
+def configure_known_index(index):
+    """Skip images whose URL is already in this KeyIndex while extracting pages"""
+    global _known_index
+    _known_index = index
+
+def is_known_url(url):
+    """Whether the image at url is stored already, under this or the other backend's URL form"""
+    return _known_index is not None and _known_index.has_file(url)
+
+def get_session():
+    """Shared cached HTTP session for all fetches in this run"""
+    global _session
+    if _session is None:
+        _session = CachedSession()
+    return _session
+
+def configure_session(enabled=True, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL, max_mb=DEFAULT_MAX_MB, rate=DEFAULT_RATE,
+                      pool_size=DEFAULT_POOL_SIZE):
+    """Replace the shared session; pool_size should cover the number of requests made in parallel"""
+    global _session
+    _session = CachedSession(PoliteSession(rate=rate, pool_size=pool_size), cache_dir=cache_dir, ttl=ttl, max_mb=max_mb, enabled=enabled)
+    return _session
+
+def fetch_page(url, session=None, category=None):
+    """Fetch and parse a page, recording fetch and parse time in the crawl metrics"""
+    session = session or get_session()
+    with metrics.timed(url, 'fetch', category):
+        r = session.get(url)
+    metrics.response(url, r)
+    with metrics.timed(url, 'parse'):
+        return parse_page(r.text)
+
+def extract_page_images(url, soup, max_images=None):
+    """extract_gallery_images, recording extract time and image count in the crawl metrics"""
+    with metrics.timed(url, 'extract'):
+        images = extract_gallery_images(soup, max_images)
+    metrics.extracted(url, len(images))
+    return images
 
 # --- Manual collection logic (from collect_manual_art.py) ---
 
 
 def fetch_wikipedia_gallery(url):
     images = []
-    r = requests.get(url)
-    soup = BeautifulSoup(r.text, 'html.parser')
-    for gallery in soup.select('.gallery'):
-        for imgdiv in gallery.select('.gallerybox'):
-            img = imgdiv.find('img')
-            if not img:
-                continue
-            img_url = 'https:' + img['src'] if img['src'].startswith('//') else img['src']
-            caption = imgdiv.find(class_='gallerytext')
-            title = caption.text.strip() if caption else ''
-            year = None
-            m = re.search(r'(\d{4})', title)
-            if m:
-                year = m.group(1)
-            images.append({
-                'url': img_url,
-                'title': title,
-                'year': year
-            })
+    soup = fetch_page(url)
+    with metrics.timed(url, 'extract'):
+        for gallery in soup.select('.gallery'):
+            for imgdiv in gallery.select('.gallerybox'):
+                img = imgdiv.find('img')
+                if not img:
+                    continue
+                img_url = 'https:' + img['src'] if img['src'].startswith('//') else img['src']
+                caption = imgdiv.find(class_='gallerytext')
+                title = caption.text.strip() if caption else ''
+                year = None
+                m = re.search(r'(\d{4})', title)
+                if m:
+                    year = m.group(1)
+                images.append({
+                    'url': img_url,
+                    'title': title,
+                    'year': year
+                })
+    metrics.extracted(url, len(images))
     return images
 
-def fetch_commons_unified(url, max_images=None, total_max=None, follow_subcategories=True, quiet=False):
-    """Unified function to fetch images from any Commons page (category, artist page, etc.)"""
-    images = []
-    session = requests.Session()
-    print(f'Fetching: {url}')
-    r = session.get(url)
-    soup = BeautifulSoup(r.text, 'html.parser')
+COMMONS_BASE_URL = 'https://commons.wikimedia.org'
 
-    # Check if this is a category page with subcategories
-    if follow_subcategories and 'Category:' in url:
-        subcategory_links = []
-        
-        # Look for subcategory links in the category page
-        subcategory_selectors = [
-            '.mw-category-group a[href*="/wiki/Category:"]',
-            '.CategoryTreeItem a[href*="/wiki/Category:"]',
-            '.mw-category a[href*="/wiki/Category:"]'
-        ]
-        
-        for selector in subcategory_selectors:
-            links = soup.select(selector)
-            for link in links:
-                href = link.get('href')
-                if href and '/wiki/Category:' in href:
-                    subcategory_url = 'https://commons.wikimedia.org' + href
-                    subcategory_title = link.get_text(strip=True)
-                    # Skip meta-categories and administrative categories
-                    if not any(skip in subcategory_title.lower() for skip in ['good pictures', 'featured pictures', 'quality images', 'valued images']):
-                        subcategory_links.append((subcategory_url, subcategory_title))
-        
-        # If we found subcategories, fetch from them instead
-        if subcategory_links:
-            print(f'Found {len(subcategory_links)} subcategories, fetching from them...')
-            total_found = 0
-            
-            for subcategory_url, subcategory_title in subcategory_links:
-                # Check total_max limit
-                if total_max and total_found >= total_max:
-                    if not quiet:
-                        print(f'  Reached total limit of {total_max}, stopping subcategory collection')
-                    break
-                    
-                print(f'  Fetching subcategory: {subcategory_title}')
-                
-                # Calculate remaining limit for this subcategory
-                if total_max:
-                    remaining = min(max_images or float('inf'), total_max - total_found)
-                else:
-                    remaining = max_images
-                
-                subcategory_images = fetch_commons_unified(subcategory_url, remaining, remaining, follow_subcategories=False, quiet=quiet)
-                
-                # Add subcategory images to our collection
-                for img in subcategory_images:
-                    if total_max and total_found >= total_max:
-                        break
-                    images.append(img)
-                    total_found += 1
-                
-                if not quiet:
-                    print(f'    Found {len(subcategory_images)} images from {subcategory_title} (Total: {total_found})')
-            
-            # Remove duplicates and return
-            seen_urls = set()
-            unique_images = []
-            for img in images:
-                if img['url'] not in seen_urls:
-                    seen_urls.add(img['url'])
-                    unique_images.append(img)
-            
-            return unique_images
+def extract_subcategory_links(soup):
+    """Return (url, title) pairs for the subcategories listed on a category page"""
+    subcategory_links = []
+
+    # Look for subcategory links in the category page
+    subcategory_selectors = [
+        '.mw-category-group a[href*="/wiki/Category:"]',
+        '.CategoryTreeItem a[href*="/wiki/Category:"]',
+        '.mw-category a[href*="/wiki/Category:"]'
+    ]
 
+    for selector in subcategory_selectors:
+        links = soup.select(selector)
+        for link in links:
+            href = link.get('href')
+            if href and '/wiki/Category:' in href:
+                subcategory_url = COMMONS_BASE_URL + href
+                subcategory_title = link.get_text(strip=True)
+                # Skip meta-categories and administrative categories
+                if not any(skip in subcategory_title.lower() for skip in SKIP_SUBCATEGORIES):
+                    subcategory_links.append((subcategory_url, subcategory_title))
+    return subcategory_links
+
+def extract_gallery_images(soup, max_images=None):
+    """Extract painting records from a single Commons page, capped at max_images"""
     # Strategy 1: Try category-style gallery first (most reliable for paintings)
     gallery_selectors = [
         '.gallery, .mw-category, .CategoryGallery',
@@ -186,6 +235,8 @@ def fetch_commons_unified(url, max_images=None, total_max=None, follow_subcatego
                 if not img:
                     continue
                 img_url = 'https:' + img['src'] if img['src'].startswith('//') else img['src']
+                if is_known_url(img_url):
+                    continue
                 title = container.get('title') or container.get('data-title') or container.text.strip()
                 year = None
                 m = re.search(r'(\d{4})', title)
@@ -229,6 +280,8 @@ def fetch_commons_unified(url, max_images=None, total_max=None, follow_subcatego
                     continue
                     
                 img_url = 'https:' + img_src if img_src.startswith('//') else img_src
+                if is_known_url(img_url):
+                    continue
                 
                 # Get title/caption
                 title = ''
@@ -256,45 +309,649 @@ def fetch_commons_unified(url, max_images=None, total_max=None, follow_subcatego
                         'title': title,
                         'year': year
                     })
-    
-    # Strategy 3: Handle pagination for category pages
-    if 'Category:' in url and gallery_images and not (max_images and len(gallery_images) >= max_images):
-        # Look for next page links
-        nextlink = soup.find('a', string=re.compile(r'next page', re.I))
-        if nextlink and nextlink.get('href'):
-            next_url = 'https://commons.wikimedia.org' + nextlink['href']
-            print(f'Found next page, fetching: {next_url}')
-            remaining = max_images - len(gallery_images) if max_images else None
-            next_images = fetch_commons_unified(next_url, remaining, remaining, follow_subcategories=False, quiet=quiet)
-            gallery_images.extend(next_images)
-    
-    # Remove duplicates based on URL
+    return gallery_images
+
+def find_next_page_url(soup):
+    """Return the absolute URL of the category "next page" link, if any"""
+    nextlink = soup.find('a', string=re.compile(r'next page', re.I))
+    if nextlink and nextlink.get('href'):
+        return COMMONS_BASE_URL + nextlink['href']
+    return None
+
+def iter_raw_images(url, max_images=None, session=None, soup=None):
+    """
+    Yield images from a category page and its "next page" continuations,
+    page by page and at most max_images. The next page is only fetched once
+    the consumer has taken everything from the current one, so stopping
+    early never downloads pages whose results would be thrown away.
+    """
+    session = session or get_session()
+    count = 0
+    page_url = url
+    while True:
+        if soup is None:
+            print(f'Fetching: {page_url}')
+            soup = fetch_page(page_url, session, category=url)
+        remaining = max_images - count if max_images else None
+        page_images = extract_page_images(page_url, soup, remaining)
+        for img in page_images:
+            yield img
+            count += 1
+        if 'Category:' not in page_url or not page_images or (max_images and count >= max_images):
+            return
+        next_url = find_next_page_url(soup)
+        if not next_url:
+            return
+        print(f'Found next page, fetching: {next_url}')
+        page_url, soup = next_url, None
+
+def iter_commons_images(url, max_images=None, total_max=None, follow_subcategories=True, quiet=False, session=None):
+    """
+    Streaming version of fetch_commons_unified: yields unique images from any
+    Commons page (category, artist page, etc.) as pages are fetched.
+    """
+    session = session or get_session()
+    print(f'Fetching: {url}')
+    soup = fetch_page(url, session)
+
+    # Check if this is a category page with subcategories
+    if follow_subcategories and 'Category:' in url:
+        subcategory_links = extract_subcategory_links(soup)
+        
+        # If we found subcategories, fetch from them instead
+        if subcategory_links:
+            print(f'Found {len(subcategory_links)} subcategories, fetching from them...')
+            seen_urls = set()
+            total_found = 0
+            
+            for subcategory_url, subcategory_title in subcategory_links:
+                # Check total_max limit
+                if total_max and total_found >= total_max:
+                    if not quiet:
+                        print(f'  Reached total limit of {total_max}, stopping subcategory collection')
+                    break
+                    
+                print(f'  Fetching subcategory: {subcategory_title}')
+                
+                # Calculate remaining limit for this subcategory
+                if total_max:
+                    remaining = min(max_images or float('inf'), total_max - total_found)
+                else:
+                    remaining = max_images
+                
+                # Images are deduplicated within the subcategory, but every one of
+                # them counts towards total_max, even if an earlier subcategory had it
+                subcategory_urls = set()
+                for img in iter_raw_images(subcategory_url, remaining, session):
+                    key = file_key(img['url'])
+                    if key in subcategory_urls:
+                        continue
+                    subcategory_urls.add(key)
+                    if total_max and total_found >= total_max:
+                        break
+                    total_found += 1
+                    if key not in seen_urls:
+                        seen_urls.add(key)
+                        yield img
+                
+                if not quiet:
+                    print(f'    Found {len(subcategory_urls)} images from {subcategory_title} (Total: {total_found})')
+            return
+
+    # Strategy 1-3: gallery containers, general page layout, then pagination
     seen_urls = set()
-    unique_images = []
-    for img in gallery_images:
-        if img['url'] not in seen_urls:
-            seen_urls.add(img['url'])
-            unique_images.append(img)
-    
-    return unique_images
+    for img in iter_raw_images(url, max_images, session, soup):
+        key = file_key(img['url'])
+        if key not in seen_urls:
+            seen_urls.add(key)
+            yield img
+
+def fetch_commons_unified(url, max_images=None, total_max=None, follow_subcategories=True, quiet=False, session=None):
+    """Unified function to fetch images from any Commons page (category, artist page, etc.)"""
+    return list(iter_commons_images(url, max_images, total_max, follow_subcategories, quiet, session))
+
+# --- Concurrent crawl engine ---
+class HostLimiter:
+    """Global and per-host concurrency limits for the async crawler"""
+
+    def __init__(self, concurrency=8, per_host=4):
+        self.global_slots = asyncio.Semaphore(concurrency)
+        self.per_host = per_host
+        self.host_slots = {}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, url):
+        host = urlparse(url).netloc
+        if host not in self.host_slots:
+            self.host_slots[host] = asyncio.Semaphore(self.per_host)
+        async with self.global_slots, self.host_slots[host]:
+            yield
+
+class TaskWindow:
+    """
+    Starts jobs (zero-argument coroutine functions) in order, at most size of
+    them ahead of the one being awaited, so a run that stops early at
+    --total-max has not started every job up front
+    """
+
+    def __init__(self, jobs, size):
+        self.jobs = iter(jobs)
+        self.size = max(1, size)
+        self.started = deque()
+
+    async def next(self):
+        """Result of the next job in order; jobs ahead of it keep running"""
+        while len(self.started) < self.size:
+            job = next(self.jobs, None)
+            if job is None:
+                break
+            self.started.append(asyncio.ensure_future(job()))
+        return await self.started.popleft()
+
+    def cancel(self):
+        for task in self.started:
+            task.cancel()
+
+class AsyncCrawler:
+    """
+    Fetches Commons categories concurrently.
+
+    Subcategories (and seed URLs) are crawled in parallel, but results are
+    assembled in their original order so --max/--total-max and URL dedup
+    give exactly the same output as the sequential fetch_commons_unified.
+    At most `concurrency` seeds (and subcategories per seed) are started
+    ahead of the one being assembled, each capped at the --total-max budget
+    left when it starts, and none once the budget is used up. Pages of a
+    single category are still walked in order, since each page only reveals
+    its "next page" link once it has been fetched.
+    """
+
+    def __init__(self, concurrency=8, per_host=4, quiet=False):
+        self.limiter = HostLimiter(concurrency, per_host)
+        self.lookahead = concurrency
+        self.quiet = quiet
+        # Connection pool sized in main() via configure_session(pool_size=...)
+        self.session = get_session()
+
+    async def fetch_html(self, url, category=None):
+        async with self.limiter.slot(url):
+            with metrics.timed(url, 'fetch', category):
+                r = await asyncio.to_thread(self.session.get, url)
+        metrics.response(url, r)
+        return r.text
+
+    async def fetch_soup(self, url, category=None):
+        html = await self.fetch_html(url, category)
+        with metrics.timed(url, 'parse'):
+            return parse_page(html)
+
+    async def crawl_pages(self, url, cap, soup=None):
+        """Raw (not yet deduplicated) images from a category and its next pages, capped at cap"""
+        images = []
+        page_url = url
+        while page_url:
+            if soup is None:
+                print(f'Fetching: {page_url}')
+                soup = await self.fetch_soup(page_url, category=url)
+            remaining = cap - len(images) if cap else None
+            page_images = extract_page_images(page_url, soup, remaining)
+            images.extend(page_images)
+            if 'Category:' not in page_url or not page_images or (cap and len(images) >= cap):
+                break
+            page_url = find_next_page_url(soup)
+            soup = None
+            if page_url:
+                print(f'Found next page, fetching: {page_url}')
+        return images
+
+    async def crawl_seed(self, url, max_images, follow_subcategories):
+        """
+        Crawl one seed URL. Returns a plan that assemble_seed turns into the
+        final image list once the remaining --total-max budget is known.
+        """
+        print(f'Fetching: {url}')
+        soup = await self.fetch_soup(url)
+        if follow_subcategories and 'Category:' in url:
+            subcategory_links = extract_subcategory_links(soup)
+            if subcategory_links:
+                print(f'Found {len(subcategory_links)} subcategories, fetching from them...')
+                return ('subcategories', subcategory_links)
+        return ('pages', await self.crawl_pages(url, max_images, soup))
+
+    async def assemble_seed(self, seed, plan, max_images, total_max):
+        if plan[0] == 'pages':
+            return dedupe_by_url(plan[1])
+        _, subcategory_links = plan
+        images = []
+        total_found = 0
+
+        def subcategory_job(sub_url):
+            # The budget left now bounds what assembly below can still take from it
+            cap = min(max_images or float('inf'), total_max - total_found) if total_max else max_images
+
+            async def job():
+                # Started from crawl_urls, whose context has no seed: tag this task's fetches
+                current_seed.set(seed)
+                return await self.crawl_pages(sub_url, cap)
+            return job
+
+        def jobs():
+            for sub_url, _ in subcategory_links:
+                if total_max and total_found >= total_max:
+                    return
+                yield subcategory_job(sub_url)
+
+        window = TaskWindow(jobs(), self.lookahead)
+        try:
+            for subcategory_url, subcategory_title in subcategory_links:
+                if total_max and total_found >= total_max:
+                    if not self.quiet:
+                        print(f'  Reached total limit of {total_max}, stopping subcategory collection')
+                    break
+                if total_max:
+                    remaining = min(max_images or float('inf'), total_max - total_found)
+                else:
+                    remaining = max_images
+                raw = await window.next()
+                # Truncating the raw page list and then deduplicating matches the
+                # sequential crawl, which would have stopped fetching at `remaining`
+                subcategory_images = dedupe_by_url(raw[:remaining] if remaining else raw)
+                for img in subcategory_images:
+                    if total_max and total_found >= total_max:
+                        break
+                    images.append(img)
+                    total_found += 1
+                if not self.quiet:
+                    print(f'    Found {len(subcategory_images)} images from {subcategory_title} (Total: {total_found})')
+        finally:
+            window.cancel()
+        return dedupe_by_url(images)
+
+    async def crawl_urls(self, urls, max_images=None, total_max=None, follow_subcategories=True):
+        """Crawl all seed URLs concurrently, returning (url, images) pairs in seed order"""
+        async def run_seed(url):
+            # Each seed runs in its own task, so this only tags that seed's fetches
+            current_seed.set(url)
+            if 'commons.wikimedia.org' in url:
+                return await self.crawl_seed(url, max_images, follow_subcategories)
+            async with self.limiter.slot(url):
+                return ('pages', await asyncio.to_thread(fetch_wikipedia_gallery, url))
+
+        known_urls = [url for url in urls if 'commons.wikimedia.org' in url or 'wikipedia.org' in url]
+        for url in urls:
+            if url not in known_urls:
+                print(f'Unknown URL type: {url}')
+        results = []
+        total_collected = 0
+
+        def jobs():
+            for url in known_urls:
+                # Checked again when the seed would start, not only when it is assembled
+                if total_max and total_collected >= total_max:
+                    return
+                yield lambda url=url: run_seed(url)
+
+        window = TaskWindow(jobs(), self.lookahead)
+        try:
+            for url in known_urls:
+                if total_max and total_collected >= total_max:
+                    if not self.quiet:
+                        print(f'Reached total limit of {total_max}, stopping collection')
+                    break
+                remaining_for_url = total_max - total_collected if total_max else None
+                imgs = await self.assemble_seed(url, await window.next(), max_images, remaining_for_url)
+                results.append((url, imgs))
+                total_collected += len(imgs)
+        finally:
+            window.cancel()
+        return results
+
+def crawl_urls_concurrently(urls, max_images=None, total_max=None, follow_subcategories=True, quiet=False,
+                            concurrency=8, per_host=4):
+    """Synchronous entry point for the concurrent crawl engine"""
+    crawler = AsyncCrawler(concurrency, per_host, quiet)
+    return asyncio.run(crawler.crawl_urls(urls, max_images, total_max, follow_subcategories))
+
+def crawl_urls(urls, max_images=None, total_max=None, follow_subcategories=True, quiet=False, backend='html'):
+    """Sequential crawl of seed URLs, yielding (url, images) pairs"""
+    total_collected = 0
+    for url in urls:
+        # Check if we've reached the total limit
+        if total_max and total_collected >= total_max:
+            if not quiet:
+                print(f'Reached total limit of {total_max}, stopping collection')
+            break
+
+        current_seed.set(url)
+        if 'commons.wikimedia.org' in url:
+            # Calculate remaining limit for this URL
+            remaining_for_url = None
+            if total_max:
+                remaining_for_url = total_max - total_collected
+            if backend == 'api':
+                imgs = fetch_commons_api(url, max_images, remaining_for_url, follow_subcategories, quiet,
+                                         session=get_session(), skip_url=is_known_url)
+            else:
+                imgs = fetch_commons_unified(url, max_images, remaining_for_url, follow_subcategories, quiet)
+        elif 'wikipedia.org' in url:
+            imgs = fetch_wikipedia_gallery(url)
+        else:
+            print(f'Unknown URL type: {url}')
+            continue
+        total_collected += len(imgs)
+        yield url, imgs
+
+# --- Resumable crawl (persistent job queue) ---
+def queue_seed_kind(url, backend='html'):
+    """Job kind for a seed URL, or None if the URL type is not supported"""
+    if 'commons.wikimedia.org' in url:
+        return 'api' if backend == 'api' else 'root'
+    if 'wikipedia.org' in url:
+        return 'wikipedia'
+    return None
+
+def assemble_queue_seed(queue, seed_idx, seed_total=None, upto=None):
+    """
+    Rebuild a seed's images from the stored job results with the same
+    subcategory, limit and dedup rules as fetch_commons_unified.
+    Returns (images, total_found) where total_found counts subcategory images.
+    """
+    seed = queue.seed(seed_idx)
+    if not seed['has_subcategories']:
+        return dedupe_by_url(queue.stream_results(seed_idx, -1)), 0
+    images = []
+    total_found = 0
+    for sub_idx in range(len(seed['subcategories']) if upto is None else upto):
+        if seed_total and total_found >= seed_total:
+            break
+        first_page = queue.stream_cap(seed_idx, sub_idx)
+        if not first_page or first_page['state'] == 'skipped':
+            break
+        raw = queue.stream_results(seed_idx, sub_idx)
+        cap = first_page['cap']
+        for img in dedupe_by_url(raw[:cap] if cap else raw):
+            if seed_total and total_found >= seed_total:
+                break
+            images.append(img)
+            total_found += 1
+    return dedupe_by_url(images), total_found
+
+def process_queue_job(queue, job, params, session, quiet=False):
+    """Fetch a single queued page and record its images and follow-up jobs"""
+    seed_idx, sub_idx, url = job['seed_idx'], job['sub_idx'], job['url']
+    seed = queue.seed(seed_idx)
+    current_seed.set(seed['url'])
+    category = seed['subcategories'][sub_idx][0] if sub_idx >= 0 else seed['url']
+    max_images = params.get('max')
+    follow_subcategories = params.get('follow_subcategories', True)
+
+    seed_total = None
+    if params.get('total_max'):
+        seed_total = params['total_max'] - queue.collected_before(seed_idx)
+        if seed_total <= 0:
+            if not quiet:
+                print(f'Reached total limit of {params["total_max"]}, skipping {url}')
+            queue.skip_seed(seed_idx)
+            return
+
+    if job['kind'] == 'wikipedia':
+        queue.complete(job, fetch_wikipedia_gallery(url))
+        return
+    if job['kind'] == 'api':
+        queue.complete(job, fetch_commons_api(url, max_images, seed_total, follow_subcategories, quiet,
+                                              session=session, skip_url=is_known_url))
+        return
+
+    if job['kind'] == 'page' and sub_idx >= 0 and job['page_idx'] == 0:
+        # First page of a subcategory: its limit depends on what the earlier subcategories found
+        _, total_found = assemble_queue_seed(queue, seed_idx, seed_total, upto=sub_idx)
+        if seed_total and total_found >= seed_total:
+            if not quiet:
+                print(f'  Reached total limit of {seed_total}, stopping subcategory collection')
+            queue.skip_seed(seed_idx)
+            return
+        cap = min(max_images or float('inf'), seed_total - total_found) if seed_total else max_images
+        print(f'  Fetching subcategory: {queue.seed(seed_idx)["subcategories"][sub_idx][1]}')
+    elif job['kind'] == 'page':
+        cap = job['cap']
+    else:
+        cap = max_images
+
+    print(f'Fetching: {url}')
+    soup = fetch_page(url, session, category)
+
+    if job['kind'] == 'root' and follow_subcategories and 'Category:' in url:
+        subcategory_links = extract_subcategory_links(soup)
+        if subcategory_links:
+            print(f'Found {len(subcategory_links)} subcategories, fetching from them...')
+            queue.set_subcategories(seed_idx, subcategory_links)
+            queue.complete(job, [], new_jobs=[
+                dict(seed_idx=seed_idx, sub_idx=i, page_idx=0, url=subcategory_url, kind='page')
+                for i, (subcategory_url, _) in enumerate(subcategory_links)
+            ])
+            return
+
+    fetched = len(queue.stream_results(seed_idx, sub_idx))
+    remaining = cap - fetched if cap else None
+    images = extract_page_images(url, soup, remaining)
+    new_jobs = []
+    if 'Category:' in url and images and not (cap and fetched + len(images) >= cap):
+        next_url = find_next_page_url(soup)
+        if next_url:
+            print(f'Found next page, fetching: {next_url}')
+            new_jobs.append(dict(seed_idx=seed_idx, sub_idx=sub_idx, page_idx=job['page_idx'] + 1,
+                                 url=next_url, kind='page', cap=cap))
+    queue.complete(job, images, new_jobs, cap=cap)
+
+def run_crawl_queue(queue, quiet=False):
+    """
+    Work through the queue in crawl order, yielding (url, images) for every
+    seed as soon as all of its jobs are finished. A seed is only marked as
+    appended once the consumer asks for the next one, so an interruption
+    between the two at worst re-appends it (append_paintings dedups).
+    """
+    params = queue.params
+    session = get_session()
+
+    def finished():
+        for seed_idx in queue.finished_seeds():
+            if queue.stream_cap(seed_idx, -1)['state'] == 'skipped':
+                # Never fetched because --total-max was already reached
+                queue.mark_appended(seed_idx, 0)
+                continue
+            seed_total = params['total_max'] - queue.collected_before(seed_idx) if params.get('total_max') else None
+            images, _ = assemble_queue_seed(queue, seed_idx, seed_total)
+            yield queue.seed(seed_idx)['url'], images
+            queue.mark_appended(seed_idx, len(images))
+
+    # Seeds that completed right before an interruption
+    yield from finished()
+
+    while True:
+        job = queue.next_job()
+        if job is None:
+            break
+        try:
+            process_queue_job(queue, job, params, session, quiet)
+        except Exception as e:
+            state = queue.fail(job, str(e))
+            print(f'  ⚠️  Failed to fetch {job["url"]}: {e} ({"retrying" if state == "pending" else "giving up"})')
+            if state == 'pending':
+                time.sleep(2 ** job['retries'])
+        if queue.seed_finished(job['seed_idx']):
+            yield from finished()
+
+    counts = queue.counts()
+    print(f'\n📋 Crawl queue: {counts.get("done", 0)} done, {counts.get("skipped", 0)} skipped, '
+          f'{counts.get("failed", 0)} failed, {counts.get("pending", 0)} pending ({queue.path})')
+
+# --- Multi-process collection (--workers) ---
+def collect_seed_plan(url, max_images=None, total_max=None, follow_subcategories=True, session=None):
+    """
+    Fetch one Commons seed without knowing how much of --total-max earlier
+    seeds will use. Subcategories are fetched up to min(max_images, total_max)
+    raw images each, enough for any remaining budget; assemble_plan then cuts
+    the plan down exactly as the sequential crawl would have.
+    """
+    session = session or get_session()
+    print(f'Fetching: {url}')
+    soup = fetch_page(url, session)
+    if follow_subcategories and 'Category:' in url:
+        subcategory_links = extract_subcategory_links(soup)
+        if subcategory_links:
+            print(f'Found {len(subcategory_links)} subcategories, fetching from them...')
+            cap = min(max_images or float('inf'), total_max) if total_max else max_images
+            subcategories = []
+            for subcategory_url, subcategory_title in subcategory_links:
+                print(f'  Fetching subcategory: {subcategory_title}')
+                subcategories.append([subcategory_title, list(iter_raw_images(subcategory_url, cap, session))])
+            return {'kind': 'subcategories', 'subcategories': subcategories}
+    return {'kind': 'pages', 'images': list(iter_raw_images(url, max_images, session, soup))}
+
+def assemble_plan(plan, max_images=None, total_max=None, quiet=False):
+    """Final image list of a seed plan, given the --total-max budget left for it"""
+    if plan['kind'] == 'pages':
+        return dedupe_by_url(plan['images'])
+    images = []
+    total_found = 0
+    for subcategory_title, raw in plan['subcategories']:
+        if total_max and total_found >= total_max:
+            if not quiet:
+                print(f'  Reached total limit of {total_max}, stopping subcategory collection')
+            break
+        if total_max:
+            remaining = min(max_images or float('inf'), total_max - total_found)
+        else:
+            remaining = max_images
+        subcategory_images = dedupe_by_url(raw[:remaining] if remaining else raw)
+        for img in subcategory_images:
+            if total_max and total_found >= total_max:
+                break
+            images.append(img)
+            total_found += 1
+        if not quiet:
+            print(f'    Found {len(subcategory_images)} images from {subcategory_title} (Total: {total_found})')
+    return dedupe_by_url(images)
+
+def init_worker(options):
+    """Per-process setup: every worker gets its own cache connection, parser and rate limiter"""
+    configure_session(options['cache'], options['cache_dir'], options['cache_ttl'], options['cache_max_mb'],
+                      options['rate'])
+    configure_parser(options['parser'], strainer=options['strainer'])
+    if options['known_index']:
+        configure_known_index(KeyIndex(options['known_index']))
+
+def collect_seed_shard(task):
+    """Worker: collect one seed and append its plan to this process's partial output file"""
+    seed_idx, url, max_images, total_max, follow_subcategories, shard_dir = task
+    current_seed.set(url)
+    if 'commons.wikimedia.org' in url:
+        plan = collect_seed_plan(url, max_images, total_max, follow_subcategories)
+    else:
+        plan = {'kind': 'pages', 'images': fetch_wikipedia_gallery(url)}
+    # Artist inference runs in the worker too, once per seed
+    artist = infer_artist(url)
+    raw_lists = [plan['images']] if plan['kind'] == 'pages' else [raw for _, raw in plan['subcategories']]
+    for raw in raw_lists:
+        for img in raw:
+            if not img.get('artist'):
+                img['artist'] = artist
+    # Page metrics travel with the plan back to the parent process
+    record = {'seed_idx': seed_idx, 'url': url, 'plan': plan, 'pages': metrics.take_pages()}
+    with open(os.path.join(shard_dir, f'shard-{os.getpid()}.jsonl'), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return seed_idx
+
+def read_shard_plans(shard_dir):
+    """{seed_idx: plan} from all partial output files"""
+    plans = {}
+    for name in sorted(os.listdir(shard_dir)):
+        if not name.endswith('.jsonl'):
+            continue
+        with open(os.path.join(shard_dir, name), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    plans[record['seed_idx']] = record['plan']
+                    metrics.add_pages(record.get('pages', []))
+    return plans
+
+def crawl_urls_multiprocess(urls, max_images=None, total_max=None, follow_subcategories=True, quiet=False,
+                            workers=4, options=None, shard_dir=SHARD_DIR):
+    """
+    Collect seed URLs in a pool of worker processes, yielding (url, images)
+    pairs in seed order. Seeds are handed out one at a time so a few huge
+    categories do not hold up a whole shard. The merge replays the seeds in
+    their original order with the sequential --total-max accounting, so the
+    result does not depend on which worker finished first.
+    """
+    known_urls = [url for url in urls if 'commons.wikimedia.org' in url or 'wikipedia.org' in url]
+    for url in urls:
+        if url not in known_urls:
+            print(f'Unknown URL type: {url}')
+    # Partial output of an earlier, interrupted run would mix into this one
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    os.makedirs(shard_dir)
+    tasks = [(i, url, max_images, total_max, follow_subcategories, shard_dir) for i, url in enumerate(known_urls)]
+    # 'spawn' so workers do not inherit the parent's open SQLite connections
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker, initargs=(options or {},)) as pool:
+        for done, _ in enumerate(pool.map(collect_seed_shard, tasks), 1):
+            if not quiet:
+                print(f'  🧩 {done}/{len(tasks)} seeds collected')
+    plans = read_shard_plans(shard_dir)
+
+    total_collected = 0
+    for i, url in enumerate(known_urls):
+        if total_max and total_collected >= total_max:
+            if not quiet:
+                print(f'Reached total limit of {total_max}, stopping collection')
+            break
+        remaining_for_url = total_max - total_collected if total_max else None
+        imgs = assemble_plan(plans[i], max_images, remaining_for_url, quiet)
+        total_collected += len(imgs)
+        yield url, imgs
+    shutil.rmtree(shard_dir, ignore_errors=True)
+
+def infer_artist(url):
+    """Infer the artist name from a Commons/Wikipedia source URL (memoized, see artist_resolver.py)"""
+    return resolve_artist_from_url(url)
 
 # --- Append logic (from append_manual_paintings.py) ---
-def append_paintings(new_paintings, appended_file=APPENDED_FILE):
+def append_paintings(new_paintings, appended_file=APPENDED_FILE, store='json'):
+    if store == 'jsonl':
+        # O(new) append to the JSONL log; compact before merging
+        added = PaintingStore(JSONL_FILE).append(new_paintings)
+        print(f'Appended {added} new paintings to {JSONL_FILE}.')
+        return
     if os.path.exists(appended_file):
         with open(appended_file, 'r', encoding='utf-8') as f:
             appended = json.load(f)
     else:
         appended = []
-    existing_keys = set((p.get('artist'), p.get('title'), p.get('url')) for p in appended)
-    added = 0
+    index = KeyIndex(appended_file)
+    if index.is_stale():
+        index.rebuild(appended)
+    batch_keys = set()
+    batch_files = set()
+    added_records = []
     for p in new_paintings:
-        key = (p.get('artist'), p.get('title'), p.get('url'))
-        if key not in existing_keys:
-            appended.append(p)
-            existing_keys.add(key)
-            added += 1
+        key = painting_key(p)
+        # The same image file from the other backend has another URL and title
+        image = file_key(p.get('url'))
+        if key in batch_keys or index.has_key(p) \
+                or (image and (image in batch_files or index.has_file(p['url']))):
+            continue
+        batch_keys.add(key)
+        if image:
+            batch_files.add(image)
+        added_records.append((len(appended), p))
+        appended.append(p)
+    added = len(added_records)
     with open(appended_file, 'w', encoding='utf-8') as f:
         json.dump(appended, f, indent=2, ensure_ascii=False)
+    with index.transaction():
+        index.add(added_records)
     print(f'Appended {added} new paintings to {appended_file}.')
 
 # --- Main unified logic ---
@@ -310,7 +967,38 @@ def main():
     parser.add_argument('--randomize', action='store_true', help='Randomize the order of URLs for more organic collection')
     parser.add_argument('--merge', action='store_true', help='Run merge script after appending')
     parser.add_argument('--diagnose', action='store_true', help='Run diagnostics after merge')
+    parser.add_argument('--backend', choices=['html', 'api'], default='html', help='Scrape category HTML or use the MediaWiki API for Commons URLs (default: html)')
+    parser.add_argument('--store', choices=['json', 'jsonl'], default='json', help=f'Append to {APPENDED_FILE} (json) or the append-only {JSONL_FILE} log (jsonl)')
+    parser.add_argument('--skip-known', action='store_true', help='Skip images already in the dataset while collecting, so --max counts only new paintings')
+    parser.add_argument('--queue', action='store_true', help='Track fetches in a persistent job queue and append results per URL, so the run can be resumed')
+    parser.add_argument('--resume', action='store_true', help='Resume an interrupted --queue run (URL and limit options come from the queue)')
+    parser.add_argument('--queue-file', default=QUEUE_FILE, help=f'Job queue database (default: {QUEUE_FILE})')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the on-disk HTTP response cache')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help=f'HTTP cache directory (default: {CACHE_DIR})')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL / 3600, help='Hours before cached pages are revalidated (default: 24)')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_MB, help=f'Maximum cache size before LRU eviction (default: {DEFAULT_MAX_MB})')
+    parser.add_argument('--parser', choices=['auto', 'lxml', 'html.parser'], default='auto', help='HTML parser backend (default: auto, lxml if installed)')
+    parser.add_argument('--full-parse', action='store_true', help='Parse whole pages instead of only the content and category containers')
+    parser.add_argument('--concurrency', type=int, default=1, help='Number of pages to fetch in parallel (default: 1, sequential)')
+    parser.add_argument('--per-host', type=int, default=4, help='Maximum parallel requests per host when --concurrency > 1 (default: 4)')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help=f'Requests per second per host, with backoff on 429/5xx (default: {DEFAULT_RATE:g})')
+    parser.add_argument('--workers', type=int, default=1, help='Collect seed URLs in this many processes (default: 1, single process)')
+    parser.add_argument('--trace', help='Write a JSON trace with per-page fetch/parse/extract timings to this file')
+    parser.add_argument('--metrics', help='Write crawl metrics in Prometheus text format to this file')
     args = parser.parse_args()
+    if args.workers > 1 and (args.queue or args.resume or args.backend == 'api'):
+        parser.error('--workers cannot be combined with --queue, --resume or --backend api')
+    session = configure_session(not args.no_cache, args.cache_dir, args.cache_ttl * 3600, args.cache_max_mb, args.rate,
+                                pool_size=max(DEFAULT_POOL_SIZE, args.concurrency))
+    configure_parser(args.parser, strainer=not args.full_parse)
+    if args.store == 'jsonl':
+        # Start the log from the existing collection before anything reads or appends to it
+        PaintingStore(JSONL_FILE).seed()
+    if args.skip_known:
+        known_index = KeyIndex(JSONL_FILE if args.store == 'jsonl' else APPENDED_FILE).ensure_synced()
+        configure_known_index(known_index)
+        if not args.quiet:
+            print(f'⏭️  Skipping {known_index.unique_count()} already collected paintings')
 
     # Collect all sources
     artists = args.artist or []
@@ -336,67 +1024,51 @@ def main():
             print(f'🔀 Randomized order of {len(urls)} URLs for organic collection')
 
     # --- Manual mode: URLs ---
-    for url in urls:
-        # Check if we've reached the total limit
-        if args.total_max and total_collected >= args.total_max:
-            if not args.quiet:
-                print(f'Reached total limit of {args.total_max}, stopping collection')
-            break
-            
-        if 'commons.wikimedia.org' in url:
-            follow_subcategories = not args.no_subcategories
-            # Calculate remaining limit for this URL
-            remaining_for_url = None
-            if args.total_max:
-                remaining_for_url = args.total_max - total_collected
-            imgs = fetch_commons_unified(url, args.max, remaining_for_url, follow_subcategories, args.quiet)
-        elif 'wikipedia.org' in url:
-            imgs = fetch_wikipedia_gallery(url)
-        else:
-            print(f'Unknown URL type: {url}')
-            continue
+    follow_subcategories = not args.no_subcategories
+    incremental = args.queue or args.resume
+    if args.resume:
+        queue = CrawlQueue.resume(args.queue_file)
+        if not args.quiet:
+            print(f'⏯️  Resuming crawl queue {args.queue_file}')
+        url_results = run_crawl_queue(queue, args.quiet)
+    elif args.queue:
+        seeds = []
+        for url in urls:
+            kind = queue_seed_kind(url, args.backend)
+            if kind:
+                seeds.append((url, kind))
+            else:
+                print(f'Unknown URL type: {url}')
+        params = {'max': args.max, 'total_max': args.total_max,
+                  'follow_subcategories': follow_subcategories, 'backend': args.backend}
+        queue = CrawlQueue.create(seeds, params, args.queue_file)
+        url_results = run_crawl_queue(queue, args.quiet)
+    elif args.backend == 'api':
+        # The API returns hundreds of members per request, so it runs sequentially
+        url_results = crawl_urls(urls, args.max, args.total_max, follow_subcategories, args.quiet, backend='api')
+    elif args.workers > 1:
+        # Workers share the --rate budget so the per-host rate stays the same overall
+        options = {'cache': not args.no_cache, 'cache_dir': args.cache_dir, 'cache_ttl': args.cache_ttl * 3600,
+                   'cache_max_mb': args.cache_max_mb, 'rate': args.rate / args.workers,
+                   'parser': args.parser, 'strainer': not args.full_parse,
+                   'known_index': (JSONL_FILE if args.store == 'jsonl' else APPENDED_FILE) if args.skip_known else None}
+        url_results = crawl_urls_multiprocess(urls, args.max, args.total_max, follow_subcategories, args.quiet,
+                                              args.workers, options)
+    elif args.concurrency > 1:
+        url_results = crawl_urls_concurrently(urls, args.max, args.total_max, follow_subcategories, args.quiet,
+                                              args.concurrency, args.per_host)
+    else:
+        url_results = crawl_urls(urls, args.max, args.total_max, follow_subcategories, args.quiet)
+    for url, imgs in url_results:
         # Optionally, you could prompt for artist name or infer from URL
+        url_artist = infer_artist(url)
         for img in imgs:
             if not img.get('artist'):
-                # Try to infer artist from URL
-                m = re.search(r'Category:Paintings_by_([^/]+)', url)
-                if m:
-                    artist_name = m.group(1).replace('_', ' ')
-                    # Handle museum-specific URLs by extracting just the artist name
-                    if ' in ' in artist_name:
-                        # Extract the artist name before " in "
-                        artist_name = artist_name.split(' in ')[0]
-                    img['artist'] = artist_name
-                else:
-                    # Try other category patterns
-                    m = re.search(r'Category:([^/]+)', url)
-                    if m:
-                        category_name = m.group(1).replace('_', ' ')
-                        # Extract artist name from various category patterns
-                        if ' by ' in category_name:
-                            artist_name = category_name.split(' by ')[-1]
-                        elif ' from ' in category_name:
-                            artist_name = category_name.split(' from ')[0]
-                        else:
-                            artist_name = category_name
-                        img['artist'] = artist_name
-                    else:
-                        # Extract artist name from main Commons page URL
-                        m = re.search(r'wiki/([^/]+)$', url)
-                        if m:
-                            artist_name = m.group(1).replace('_', ' ')
-                            # Handle museum-specific URLs
-                            if ' in ' in artist_name:
-                                artist_name = artist_name.split(' in ')[0]
-                            # Handle "Artworks by" patterns
-                            elif artist_name.startswith('Artworks_by_'):
-                                artist_name = artist_name.replace('Artworks_by_', '')
-                            # Handle life and works patterns
-                            elif ', ' in artist_name and '_life_and_works' in artist_name:
-                                artist_name = artist_name.split(', ')[0]
-                            img['artist'] = artist_name
-                        else:
-                            img['artist'] = 'Unknown'
+                img['artist'] = url_artist
+        metrics.seed_done(url, len(imgs))
+        if incremental and imgs:
+            # Commit each finished URL right away so an interruption loses nothing
+            append_paintings(imgs, store=args.store)
         all_new_paintings.extend(imgs)
         total_collected += len(imgs)
         
@@ -417,7 +1089,8 @@ def main():
 
     # --- Append all new paintings ---
     if all_new_paintings:
-        append_paintings(all_new_paintings)
+        if not incremental:
+            append_paintings(all_new_paintings, store=args.store)
         if not args.quiet:
             print(f'\n🎨 COLLECTION SUMMARY:')
             print(f'Total new paintings collected: {len(all_new_paintings)}')
@@ -434,16 +1107,32 @@ def main():
                     print(f'  • {artist}: {count} paintings')
     else:
         print('No new paintings to append.')
+    session.report()
+    metrics.report()
+    if args.trace:
+        metrics.write_trace(args.trace)
+        print(f'📝 Crawl trace written to {args.trace}')
+    if args.metrics:
+        metrics.write_prometheus(args.metrics)
+        print(f'📈 Prometheus metrics written to {args.metrics}')
 
     # --- Optionally run merge and diagnostics ---
     if args.merge:
+        if args.store == 'jsonl':
+            try:
+                count = PaintingStore(JSONL_FILE).compact(APPENDED_FILE)
+            except ValueError as e:
+                print(f'❌ Not merging: {e}')
+                return
+            if not args.quiet:
+                print(f'Compacted {JSONL_FILE} into {APPENDED_FILE} ({count} paintings)')
         if not args.quiet:
             print('Running merge script...')
         subprocess.run([sys.executable, MERGE_SCRIPT])
     if args.diagnose:
         if not args.quiet:
             print('Running diagnostics script...')
-        subprocess.run([sys.executable, DIAGNOSE_SCRIPT])
+        subprocess.run([sys.executable, DIAGNOSE_SCRIPT, '--incremental'])
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -1,7 +1,26 @@
-import requests
+#!/usr/bin/env python3
+"""
+Collect artist tags (birth/death, movement, genre, country, birthplace,
+gender, summary and notable works) from Wikipedia and Wikidata
+
+USAGE:
+    # One Wikipedia lookup and two SPARQL queries per artist and language
+    python collect_artist_tags.py
+
+    # All artists in grouped title lookups and a few VALUES queries
+    python collect_artist_tags.py --batched
+
+    # Only artists that are new (in paintings/bios but not in the tags) or
+    # whose cached Wikidata results are older than the TTL
+    python collect_artist_tags.py --incremental --ttl-days 30
+"""
+
+import argparse
 import json
-import time
 import os
+import time
+from artist_resolver import normalize_artist_name
+from http_cache import CachedSession
 
 # List of artists (should match your main script)
 artists = [
@@ -11,6 +30,29 @@ artists = [
 HEADERS = {
     "User-Agent": "kunstquiz/1.0 (your_email@example.com) Python requests"
 }
+WIKIDATA_SPARQL_URL = "https://query.wikidata.org/sparql"
+OUTPUT_PATH = "data/artist_tags.json"
+APPENDED_PATH = "data/artist_tags_appended.json"
+PAINTINGS_PATH = "data/paintings_appended.json"
+BIOS_PATH = "data/artist_bios.json"
+CACHE_PATH = "data/artist_entity_cache.json"
+DEFAULT_TTL_DAYS = 30
+# With all of these filled by the first language, the second one cannot add anything
+TAG_FIELDS = ["birth", "death", "movement", "genre", "country", "birthplace", "gender", "summary"]
+# TextExtracts returns at most 20 intro extracts per request
+TITLES_BATCH = 20
+SPARQL_BATCH = 50
+
+# Wikipedia and SPARQL responses are cached on disk between runs; network
+# requests are rate limited per host (see http_client.py) instead of sleeping
+_session = None
+
+def get_session():
+    """Shared cached HTTP session, created on first use so importing this module touches no files"""
+    global _session
+    if _session is None:
+        _session = CachedSession()
+    return _session
 
 # Simple translation mapping for common Norwegian terms
 TRANSLATE = {
@@ -30,6 +72,27 @@ def translate(val):
             return v
     return val
 
+def apply_entity_row(tags, res):
+    """Fill tags from one row of the birth/death/movement/... SPARQL query"""
+    tags["birth"] = res.get("birth", {}).get("value", None)
+    tags["death"] = res.get("death", {}).get("value", None)
+    tags["movement"] = translate(res.get("movementLabel", {}).get("value", None))
+    tags["genre"] = translate(res.get("genreLabel", {}).get("value", None))
+    tags["country"] = translate(res.get("countryLabel", {}).get("value", None))
+    tags["birthplace"] = res.get("placeLabel", {}).get("value", None)
+    gender = res.get("genderLabel", {}).get("value", None)
+    tags["gender"] = translate(gender)
+    tags["is_female"] = (gender and gender.lower() in ["female", "kvinne"])
+
+def works_from_rows(rows):
+    """Notable works (P800) from rows of the notable works SPARQL query"""
+    works = []
+    for res in rows:
+        work = res.get("workLabel", {}).get("value", None)
+        year = res.get("workYear", {}).get("value", None)
+        works.append({"title": work, "year": year})
+    return works
+
 def fetch_tags_from_wikipedia(artist, lang='en'):
     tags = {}
     wiki_api_url = f"https://{lang}.wikipedia.org/w/api.php"
@@ -43,7 +106,7 @@ def fetch_tags_from_wikipedia(artist, lang='en'):
         "redirects": 1
     }
     try:
-        response = requests.get(wiki_api_url, params=params, headers=HEADERS)
+        response = get_session().get(wiki_api_url, params=params, headers=HEADERS)
         response.raise_for_status()
         pages = response.json()["query"]["pages"]
         page_id = list(pages.keys())[0]
@@ -64,22 +127,12 @@ def fetch_tags_from_wikipedia(artist, lang='en'):
               SERVICE wikibase:label {{ bd:serviceParam wikibase:language '{lang},en'. }}
             }}
             """
-            wikidata_url = "https://query.wikidata.org/sparql"
             params2 = {"query": sparql_query, "format": "json"}
-            r2 = requests.get(wikidata_url, params=params2, headers=HEADERS)
+            r2 = get_session().get(WIKIDATA_SPARQL_URL, params=params2, headers=HEADERS)
             r2.raise_for_status()
             results = r2.json()["results"]["bindings"]
             if results:
-                res = results[0]
-                tags["birth"] = res.get("birth", {}).get("value", None)
-                tags["death"] = res.get("death", {}).get("value", None)
-                tags["movement"] = translate(res.get("movementLabel", {}).get("value", None))
-                tags["genre"] = translate(res.get("genreLabel", {}).get("value", None))
-                tags["country"] = translate(res.get("countryLabel", {}).get("value", None))
-                tags["birthplace"] = res.get("placeLabel", {}).get("value", None)
-                gender = res.get("genderLabel", {}).get("value", None)
-                tags["gender"] = translate(gender)
-                tags["is_female"] = (gender and gender.lower() in ["female", "kvinne"])
+                apply_entity_row(tags, results[0])
         tags["summary"] = page.get("extract", "")
         # Notable works (from Wikidata)
         if wikidata_id:
@@ -91,13 +144,9 @@ def fetch_tags_from_wikipedia(artist, lang='en'):
             }}
             """
             params3 = {"query": sparql_query2, "format": "json"}
-            r3 = requests.get(wikidata_url, params=params3, headers=HEADERS)
+            r3 = get_session().get(WIKIDATA_SPARQL_URL, params=params3, headers=HEADERS)
             r3.raise_for_status()
-            works = []
-            for res in r3.json()["results"]["bindings"]:
-                work = res.get("workLabel", {}).get("value", None)
-                year = res.get("workYear", {}).get("value", None)
-                works.append({"title": work, "year": year})
+            works = works_from_rows(r3.json()["results"]["bindings"])
             if works:
                 tags["notable_works"] = works
         return tags
@@ -105,46 +154,320 @@ def fetch_tags_from_wikipedia(artist, lang='en'):
         print(f"  Error fetching for {artist} ({lang}): {e}")
         return {"not_found": True}
 
-artist_tags = {}
-women_count = 0
-for artist in artists:
-    print(f"Fetching tags for {artist}...")
-    tags_en = fetch_tags_from_wikipedia(artist, lang='en')
-    tags_no = fetch_tags_from_wikipedia(artist, lang='no')
+# --- Batched mode: grouped title lookups and VALUES queries ---
+def chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def fetch_wikipedia_pages(titles, lang='en'):
+    """
+    Resolve up to TITLES_BATCH titles in one API call (following continuation).
+    Returns {title: page} with the QID in page['pageprops'] and the intro in
+    page['extract']; titles without an article are left out.
+    """
+    wiki_api_url = f"https://{lang}.wikipedia.org/w/api.php"
+    params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": 2,
+        "titles": "|".join(titles),
+        "prop": "pageprops|extracts",
+        "exintro": True,
+        "explaintext": True,
+        "exlimit": "max",
+        "redirects": 1
+    }
+    pages = {}
+    aliases = {}
+    cont = {}
+    while True:
+        response = get_session().get(wiki_api_url, params={**params, **cont}, headers=HEADERS)
+        response.raise_for_status()
+        data = response.json()
+        query = data.get("query", {})
+        for entry in query.get("normalized", []) + query.get("redirects", []):
+            aliases[entry["from"]] = entry["to"]
+        for page in query.get("pages", []):
+            if page.get("missing") or page.get("invalid"):
+                continue
+            # Continuation responses repeat pages with the properties still missing
+            pages.setdefault(page["title"], {}).update(page)
+        if "continue" not in data:
+            break
+        cont = data["continue"]
+
+    resolved = {}
+    for title in titles:
+        target = title
+        # Normalization first (e.g. underscores), then a redirect
+        for _ in range(2):
+            target = aliases.get(target, target)
+        if target in pages:
+            resolved[title] = pages[target]
+    return resolved
+
+def sparql_rows_by_item(query):
+    """Run a SPARQL query with an ?item column and group the rows by QID, in result order"""
+    response = get_session().get(WIKIDATA_SPARQL_URL, params={"query": query, "format": "json"}, headers=HEADERS)
+    response.raise_for_status()
+    rows = {}
+    for res in response.json()["results"]["bindings"]:
+        qid = res["item"]["value"].rsplit("/", 1)[-1]
+        rows.setdefault(qid, []).append(res)
+    return rows
+
+def fetch_entity_rows(qids, lang='en'):
+    values = " ".join(f"wd:{qid}" for qid in qids)
+    return sparql_rows_by_item(f"""
+    SELECT ?item ?birth ?death ?movementLabel ?genreLabel ?countryLabel ?placeLabel ?genderLabel WHERE {{
+      VALUES ?item {{ {values} }}
+      OPTIONAL {{ ?item wdt:P569 ?birth. }}
+      OPTIONAL {{ ?item wdt:P570 ?death. }}
+      OPTIONAL {{ ?item wdt:P135 ?movement. }}
+      OPTIONAL {{ ?item wdt:P136 ?genre. }}
+      OPTIONAL {{ ?item wdt:P27 ?country. }}
+      OPTIONAL {{ ?item wdt:P19 ?place. }}
+      OPTIONAL {{ ?item wdt:P21 ?gender. }}
+      SERVICE wikibase:label {{ bd:serviceParam wikibase:language '{lang},en'. }}
+    }}
+    """)
+
+def fetch_work_rows(qids, lang='en'):
+    values = " ".join(f"wd:{qid}" for qid in qids)
+    return sparql_rows_by_item(f"""
+    SELECT ?item ?workLabel ?workYear WHERE {{
+      VALUES ?item {{ {values} }}
+      ?item wdt:P800 ?work.
+      OPTIONAL {{ ?work wdt:P571 ?workYear. }}
+      SERVICE wikibase:label {{ bd:serviceParam wikibase:language '{lang},en'. }}
+    }}
+    """)
+
+class EntityCache:
+    """
+    Local cache for incremental refreshes: title -> QID/summary lookups per
+    language, and Wikidata results per QID and language, each entry with the
+    time it was fetched. Entries older than the TTL count as missing.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl_days=DEFAULT_TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 24 * 60 * 60
+        self.data = {"titles": {}, "entities": {}}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def fresh(self, entry):
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    def title(self, lang, title):
+        """Cached page for a title ({'page': {'qid', 'summary'} or None}), None if missing or stale"""
+        entry = self.data["titles"].get(lang, {}).get(title)
+        return entry if self.fresh(entry) else None
+
+    def set_title(self, lang, title, page):
+        self.data["titles"].setdefault(lang, {})[title] = {"page": page, "fetched_at": time.time()}
+
+    def entity(self, qid, lang):
+        """Cached SPARQL results for a QID ({'row', 'works'}), None if missing or stale"""
+        entry = self.data["entities"].get(qid, {}).get(lang)
+        return entry if self.fresh(entry) else None
+
+    def set_entity(self, qid, lang, row, works):
+        self.data["entities"].setdefault(qid, {})[lang] = {"row": row, "works": works, "fetched_at": time.time()}
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+def fetch_tags_batched(artist_names, lang='en', cache=None):
+    """
+    Same tags as fetch_tags_from_wikipedia for many artists at once: QIDs and
+    summaries come from grouped title lookups, Wikidata fields and notable
+    works from a few VALUES queries. With an EntityCache, fresh cached titles
+    and entities are used as is and everything fetched is stored in it.
+    Returns {artist: tags}.
+    """
+    pages = {}
+    lookup = []
+    for artist in artist_names:
+        entry = cache.title(lang, artist) if cache else None
+        if entry is None:
+            lookup.append(artist)
+        elif entry["page"]:
+            pages[artist] = entry["page"]
+    for batch in chunks(lookup, TITLES_BATCH):
+        try:
+            found = fetch_wikipedia_pages(batch, lang)
+        except Exception as e:
+            print(f"  Error looking up {len(batch)} artists ({lang}): {e}")
+            continue
+        for artist in batch:
+            page = found.get(artist)
+            if page:
+                page = {"qid": page.get("pageprops", {}).get("wikibase_item"), "summary": page.get("extract", "")}
+                pages[artist] = page
+            if cache:
+                cache.set_title(lang, artist, page)
+
+    entities = {}
+    fetch = []
+    for qid in sorted({page["qid"] for page in pages.values()} - {None}):
+        entry = cache.entity(qid, lang) if cache else None
+        if entry is None:
+            fetch.append(qid)
+        else:
+            entities[qid] = entry
+    failed = set()
+    for batch in chunks(fetch, SPARQL_BATCH):
+        try:
+            entity_rows = fetch_entity_rows(batch, lang)
+            work_rows = fetch_work_rows(batch, lang)
+        except Exception as e:
+            print(f"  Error fetching Wikidata for {len(batch)} artists ({lang}): {e}")
+            failed.update(batch)
+            continue
+        for qid in batch:
+            entry = {"row": entity_rows.get(qid, [None])[0], "works": works_from_rows(work_rows.get(qid, []))}
+            entities[qid] = entry
+            if cache:
+                cache.set_entity(qid, lang, entry["row"], entry["works"])
+
+    results = {}
+    for artist in artist_names:
+        page = pages.get(artist)
+        if not page or page["qid"] in failed:
+            results[artist] = {"not_found": True}
+            continue
+        tags = {}
+        entity = entities.get(page["qid"]) if page["qid"] else None
+        if entity and entity["row"]:
+            apply_entity_row(tags, entity["row"])
+        tags["summary"] = page["summary"]
+        if entity and entity["works"]:
+            tags["notable_works"] = entity["works"]
+        results[artist] = tags
+    return results
+
+def is_complete(tags):
+    """True if a second language could not add anything to these tags"""
+    return not tags.get("not_found") and all(tags.get(field) for field in TAG_FIELDS)
+
+def load_json_file(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load {path}: {e}")
+            return default
+
+def known_artist_names():
+    """Artists from the hard-coded list, the collected paintings and the bios, in that order"""
+    names = list(artists)
+    for painting in load_json_file(PAINTINGS_PATH, []):
+        names.append(normalize_artist_name(painting.get("artist")))
+    for bio in load_json_file(BIOS_PATH, []):
+        names.append(bio.get("name"))
+    return [name for name in dict.fromkeys(names) if name and name != "Unknown"]
+
+def merge_language_tags(tags_en, tags_no):
+    """Merge, prefer Norwegian for missing/empty fields"""
     tags = {}
-    # Merge, prefer Norwegian for missing/empty fields
     for k in set(tags_en.keys()).union(tags_no.keys()):
         v_en = tags_en.get(k)
         v_no = tags_no.get(k)
         tags[k] = v_en if v_en else v_no
-    # Count women
-    if tags.get("is_female"): women_count += 1
-    artist_tags[artist] = tags
-    time.sleep(1)
+    return tags
 
-output_path = "data/artist_tags.json"
-appended_path = "data/artist_tags_appended.json"
+def save_tags(artist_tags, output_path=OUTPUT_PATH, appended_path=APPENDED_PATH):
+    """Merge new tags into the existing ones (from output_path) and write the appended tags file"""
+    # Load existing tags if present
+    existing_tags = load_json_file(output_path, {})
 
-# Load existing tags if present
-if os.path.exists(output_path):
-    with open(output_path, "r", encoding="utf-8") as f:
-        try:
-            existing_tags = json.load(f)
-        except Exception as e:
-            print(f"Warning: Could not load existing tags: {e}")
-            existing_tags = {}
-else:
-    existing_tags = {}
-
-# Merge new tags with existing, prefer new data for updated fields
-for artist, tags in artist_tags.items():
-    if artist in existing_tags:
-        existing_tags[artist].update(tags)
+    # Merge new tags with existing, prefer new data for updated fields
+    for artist, tags in artist_tags.items():
+        if artist in existing_tags:
+            existing_tags[artist].update(tags)
+        else:
+            existing_tags[artist] = tags
+
+    with open(appended_path, "w", encoding="utf-8") as f:
+        json.dump(existing_tags, f, indent=2, ensure_ascii=False)
+
+    print(f"✅ Appended and saved artist tags to {appended_path}")
+
+def incremental_refresh(cache_file=CACHE_PATH, ttl_days=DEFAULT_TTL_DAYS):
+    """Fetch only new and stale artists, keeping everything else in the appended tags file"""
+    cache = EntityCache(cache_file, ttl_days)
+    # Earlier incremental runs only live in the appended file
+    base_path = APPENDED_PATH if os.path.exists(APPENDED_PATH) else OUTPUT_PATH
+    existing_tags = load_json_file(base_path, {})
+    candidates = known_artist_names()
+    new = [artist for artist in candidates if artist not in existing_tags]
+    stale = [artist for artist in candidates if artist in existing_tags and cache.title('en', artist) is None]
+    targets = new + stale
+    print(f"🔄 {len(new)} new and {len(stale)} stale artists to fetch, "
+          f"{len(candidates) - len(targets)} up to date (TTL {ttl_days:g} days)")
+    if not targets:
+        return
+
+    tags_en = fetch_tags_batched(targets, lang='en', cache=cache)
+    # The second language is only needed where the first one left fields empty
+    second = [artist for artist in targets if not is_complete(tags_en[artist])]
+    tags_no = fetch_tags_batched(second, lang='no', cache=cache)
+    print(f"   Skipped the Norwegian lookup for {len(targets) - len(second)} complete artists")
+    artist_tags = {artist: merge_language_tags(tags_en[artist], tags_no[artist]) if artist in tags_no else tags_en[artist]
+                   for artist in targets}
+    # A failed lookup of a stale artist keeps the tags it already has
+    failed = [artist for artist in stale if artist_tags[artist].get("not_found")]
+    for artist in failed:
+        del artist_tags[artist]
+    if failed:
+        print(f"   ⚠️  Lookup failed for {len(failed)} stale artists, keeping their existing tags")
+    cache.save()
+    save_tags(artist_tags, output_path=base_path)
+
+def main():
+    parser = argparse.ArgumentParser(description='Collect artist tags from Wikipedia and Wikidata')
+    parser.add_argument('--batched', action='store_true',
+                        help='Look up all artists in grouped API calls and VALUES SPARQL queries instead of one by one')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only fetch new artists and those whose cached results are older than --ttl-days (batched)')
+    parser.add_argument('--ttl-days', type=float, default=DEFAULT_TTL_DAYS,
+                        help=f'Days before cached Wikipedia/Wikidata results are refetched (default: {DEFAULT_TTL_DAYS})')
+    parser.add_argument('--cache-file', default=CACHE_PATH, help=f'QID-keyed entity cache (default: {CACHE_PATH})')
+    args = parser.parse_args()
+
+    if args.incremental:
+        incremental_refresh(args.cache_file, args.ttl_days)
+        get_session().report()
+        return
+
+    artist_names = list(dict.fromkeys(artists))
+    artist_tags = {}
+    if args.batched:
+        print(f"Fetching tags for {len(artist_names)} artists (batched)...")
+        tags_en = fetch_tags_batched(artist_names, lang='en')
+        tags_no = fetch_tags_batched(artist_names, lang='no')
+        for artist in artist_names:
+            artist_tags[artist] = merge_language_tags(tags_en[artist], tags_no[artist])
     else:
-        existing_tags[artist] = tags
+        for artist in artist_names:
+            print(f"Fetching tags for {artist}...")
+            tags_en = fetch_tags_from_wikipedia(artist, lang='en')
+            tags_no = fetch_tags_from_wikipedia(artist, lang='no')
+            artist_tags[artist] = merge_language_tags(tags_en, tags_no)
+    # Count women
+    women_count = sum(1 for tags in artist_tags.values() if tags.get("is_female"))
 
-with open(appended_path, "w", encoding="utf-8") as f:
-    json.dump(existing_tags, f, indent=2, ensure_ascii=False)
+    save_tags(artist_tags)
+    print(f"\nTotal women painters found: {women_count}")
+    get_session().report()
 
-print(f"✅ Appended and saved artist tags to {appended_path}")
-print(f"\nTotal women painters found: {women_count}") 
\ No newline at end of file
+if __name__ == '__main__':
+    main()
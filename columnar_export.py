@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Columnar binary export of the merged paintings for analytics
+
+json.load of the pretty-printed paintings_merged.json dominates every
+analytics run. This exporter writes the paintings as columns into one
+memory-mappable file; load_columnar() maps it and returns NumPy views into
+the mapping without copying or parsing anything.
+
+Every string is dictionary-encoded: a column stores int32 codes (-1 for a
+missing value; null list entries are dropped) into a dictionary of unique
+strings, kept as uint32 offsets into one UTF-8 byte buffer. Movement and
+genre share a dictionary with artist_movement and artist_genre, so codes
+compare across them. Columns:
+
+    artist, title, url, artist_gender     codes
+    movement, artist_movement, genre,     list: int64 row offsets (rows + 1)
+    artist_genre, categories              and int32 codes
+    artist_birth_year, width, height      int32, -1 if unknown
+
+File layout: 8 bytes magic, uint64 header length, JSON header (row count,
+buffer offsets/dtypes/lengths), then the buffers, each 64-byte aligned.
+
+USAGE:
+    # Export (reads flat or normalized paintings)
+    python columnar_export.py
+    python columnar_export.py --paintings data/paintings_normalized.json --output /tmp/paintings.kqc
+
+    # Vectorized summary of an existing export
+    python columnar_export.py --stats
+
+    # In Python
+    from columnar_export import load_columnar
+    cols = load_columnar('data/paintings_merged.kqc')
+    cols.value_counts('artist')[:10]
+    women = cols.mask('artist_gender', lambda g: g == 'female')
+"""
+
+import argparse
+import json
+import struct
+import time
+
+import numpy as np
+
+from artist_table import load_paintings
+from category_registry import arr, parse_year
+from diagnostics import get_painting_dimensions
+
+COLUMNAR_PATH = 'data/paintings_merged.kqc'
+MAGIC = b'KQCOL\x00\x00\x01'
+ALIGN = 64
+
+# Column -> dictionary it is encoded with
+CODE_COLUMNS = {'artist': 'artist', 'title': 'title', 'url': 'url', 'artist_gender': 'gender'}
+LIST_COLUMNS = {
+    'movement': 'movement', 'artist_movement': 'movement',
+    'genre': 'genre', 'artist_genre': 'genre',
+    'categories': 'category',
+}
+INT_COLUMNS = ['artist_birth_year', 'width', 'height']
+
+class Dictionary:
+    """String -> code, in order of first appearance"""
+
+    def __init__(self):
+        self.codes = {}
+
+    def code(self, value):
+        if value is None or value == '':
+            return -1
+        value = str(value)
+        if value not in self.codes:
+            self.codes[value] = len(self.codes)
+        return self.codes[value]
+
+    def buffers(self):
+        data = [value.encode('utf-8') for value in self.codes]
+        offsets = np.zeros(len(data) + 1, dtype=np.uint32)
+        offsets[1:] = np.cumsum([len(d) for d in data], dtype=np.uint64)
+        return offsets, np.frombuffer(b''.join(data), dtype=np.uint8)
+
+def int_or_missing(value):
+    try:
+        return int(value) if value is not None else -1
+    except (TypeError, ValueError):
+        return -1
+
+def build_columns(paintings):
+    """Column name -> dict of NumPy buffers, plus the dictionaries"""
+    dictionaries = {name: Dictionary() for name in set(CODE_COLUMNS.values()) | set(LIST_COLUMNS.values())}
+    columns = {}
+    for column, dict_name in CODE_COLUMNS.items():
+        d = dictionaries[dict_name]
+        columns[column] = {'codes': np.fromiter((d.code(p.get(column)) for p in paintings), dtype=np.int32, count=len(paintings))}
+    for column, dict_name in LIST_COLUMNS.items():
+        d = dictionaries[dict_name]
+        codes = []
+        offsets = np.zeros(len(paintings) + 1, dtype=np.int64)
+        for i, p in enumerate(paintings):
+            codes.extend(c for c in (d.code(v) for v in arr(p.get(column))) if c >= 0)
+            offsets[i + 1] = len(codes)
+        columns[column] = {'offsets': offsets, 'codes': np.array(codes, dtype=np.int32)}
+    dimensions = [get_painting_dimensions(p) for p in paintings]
+    ints = {
+        'artist_birth_year': [int_or_missing(parse_year(p.get('artist_birth'))) for p in paintings],
+        'width': [int_or_missing(w if h is not None else None) for w, h in dimensions],
+        'height': [int_or_missing(h if w is not None else None) for w, h in dimensions],
+    }
+    for column in INT_COLUMNS:
+        columns[column] = {'values': np.array(ints[column], dtype=np.int32)}
+    return columns, dictionaries
+
+def write_columnar(paintings, path=COLUMNAR_PATH):
+    """Write paintings as a columnar file; returns its size in bytes"""
+    columns, dictionaries = build_columns(paintings)
+    buffers = []
+    header = {'rows': len(paintings), 'columns': {}, 'dictionaries': {}}
+
+    def add(array):
+        buffers.append(np.ascontiguousarray(array))
+        return len(buffers) - 1
+
+    for column, parts in columns.items():
+        kind = 'codes' if column in CODE_COLUMNS else 'list' if column in LIST_COLUMNS else 'int'
+        header['columns'][column] = {
+            'kind': kind,
+            'dictionary': CODE_COLUMNS.get(column) or LIST_COLUMNS.get(column),
+            'buffers': {part: add(array) for part, array in parts.items()},
+        }
+    for name, d in dictionaries.items():
+        offsets, data = d.buffers()
+        header['dictionaries'][name] = {'size': len(d.codes), 'buffers': {'offsets': add(offsets), 'data': add(data)}}
+
+    # Buffer offsets depend on the header length, so repeat the layout until the length is stable
+    specs = [None] * len(buffers)
+    header_bytes = b''
+    while True:
+        position = align(len(MAGIC) + 8 + len(header_bytes))
+        for n, array in enumerate(buffers):
+            specs[n] = [position, array.dtype.str, int(array.size)]
+            position = align(position + array.nbytes)
+        header['buffers'] = specs
+        encoded = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        stable = len(encoded) == len(header_bytes)
+        header_bytes = encoded
+        if stable:
+            break
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<Q', len(header_bytes)) + header_bytes)
+        for (offset, _, _), array in zip(specs, buffers):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(array.tobytes())
+        return f.tell()
+
+def align(position):
+    return (position + ALIGN - 1) // ALIGN * ALIGN
+
+class ColumnarPaintings:
+    """Read-only view of a columnar file; arrays are views into the memory map"""
+
+    def __init__(self, path):
+        self.path = path
+        self.mm = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(self.mm[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f'{path}: not a columnar paintings file')
+        (header_len,) = struct.unpack('<Q', bytes(self.mm[len(MAGIC):len(MAGIC) + 8]))
+        start = len(MAGIC) + 8
+        self.header = json.loads(bytes(self.mm[start:start + header_len]))
+        self.rows = self.header['rows']
+        self._dictionaries = {}
+
+    def buffer(self, n):
+        offset, dtype, count = self.header['buffers'][n]
+        dtype = np.dtype(dtype)
+        return self.mm[offset:offset + count * dtype.itemsize].view(dtype)
+
+    def column(self, name):
+        """Codes (codes columns) or values (int columns)"""
+        spec = self.header['columns'][name]
+        return self.buffer(spec['buffers']['codes' if spec['kind'] != 'int' else 'values'])
+
+    def list_column(self, name):
+        """(row offsets, codes) of a list column; row i has codes[offsets[i]:offsets[i + 1]]"""
+        buffers = self.header['columns'][name]['buffers']
+        return self.buffer(buffers['offsets']), self.buffer(buffers['codes'])
+
+    def dictionary(self, name):
+        """Decoded strings of a dictionary (small, decoded once)"""
+        if name not in self._dictionaries:
+            buffers = self.header['dictionaries'][name]['buffers']
+            offsets, data = self.buffer(buffers['offsets']), self.buffer(buffers['data'])
+            raw = bytes(data)
+            self._dictionaries[name] = [raw[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+        return self._dictionaries[name]
+
+    def values(self, name):
+        """Dictionary of a codes or list column"""
+        return self.dictionary(self.header['columns'][name]['dictionary'])
+
+    def codes(self, *names):
+        """All codes of one or more columns sharing a dictionary, concatenated"""
+        parts = [self.list_column(n)[1] if self.header['columns'][n]['kind'] == 'list' else self.column(n) for n in names]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def value_counts(self, *names):
+        """[(value, count)] over one or more columns sharing a dictionary, most common first (like Counter.most_common)"""
+        values = self.values(names[0])
+        codes = self.codes(*names)
+        counts = np.bincount(codes[codes >= 0], minlength=len(values))
+        # Stable sort: ties keep dictionary (first appearance) order, like Counter
+        order = np.argsort(-counts, kind='stable')
+        return [(values[i], int(counts[i])) for i in order if counts[i]]
+
+    def mask(self, name, predicate):
+        """Boolean row mask: rows where predicate(value) holds (for list columns: for any value)"""
+        values = self.values(name)
+        hit = np.fromiter((bool(predicate(v)) for v in values), dtype=bool, count=len(values))
+        hit = np.append(hit, False)  # code -1 (missing) maps to the last entry
+        spec = self.header['columns'][name]
+        if spec['kind'] == 'codes':
+            return hit[self.column(name)]
+        offsets, codes = self.list_column(name)
+        rows = np.repeat(np.arange(self.rows), np.diff(offsets))
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[rows[hit[codes]]] = True
+        return mask
+
+def load_columnar(path=COLUMNAR_PATH):
+    return ColumnarPaintings(path)
+
+def summary(cols):
+    """Full-dataset aggregations as in diagnostics.py, vectorized"""
+    artist = cols.column('artist')
+    width, height = cols.column('width'), cols.column('height')
+    known = (width >= 0) & (height >= 0)
+    smaller = np.minimum(width, height)[known]
+    url_counts = np.bincount(cols.column('url')[cols.column('url') >= 0])
+    title_counts = np.bincount(cols.column('title')[cols.column('title') >= 0])
+    return {
+        'paintings': cols.rows,
+        'artists': int(np.unique(artist[artist >= 0]).size),
+        'painter_counts': cols.value_counts('artist'),
+        'genre_counts': cols.value_counts('artist_genre', 'genre'),
+        'women_paintings': int(cols.mask('artist_gender', lambda g: g == 'female').sum()),
+        'url_duplicates': int((url_counts > 1).sum()),
+        'title_duplicates': int((title_counts > 1).sum()),
+        'sizes': {
+            'tiny': int((smaller < 100).sum()),
+            'small': int(((smaller >= 100) & (smaller < 200)).sum()),
+            'medium': int(((smaller >= 200) & (smaller < 500)).sum()),
+            'large': int(((smaller >= 500) & (smaller < 1000)).sum()),
+            'huge': int((smaller >= 1000).sum()),
+            'unknown': int((~known).sum()),
+        },
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the merged paintings as a memory-mappable columnar file')
+    parser.add_argument('--paintings', default='data/paintings_merged.json', help='Merged paintings (flat or normalized)')
+    parser.add_argument('--output', default=COLUMNAR_PATH, help=f'Columnar file (default: {COLUMNAR_PATH})')
+    parser.add_argument('--stats', action='store_true', help='Only print a vectorized summary of an existing export')
+    args = parser.parse_args()
+
+    if not args.stats:
+        paintings = load_paintings(args.paintings)
+        size = write_columnar(paintings, args.output)
+        print(f'✅ Wrote {len(paintings)} paintings to {args.output} ({size / 1024:.0f} KB)')
+
+    start = time.perf_counter()
+    cols = load_columnar(args.output)
+    stats = summary(cols)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f'📊 {stats["paintings"]} paintings, {stats["artists"]} painters, {stats["women_paintings"]} by women, '
+          f'{stats["url_duplicates"]} URL / {stats["title_duplicates"]} title duplicates ({elapsed:.1f} ms)')
+    print('   Sizes: ' + ', '.join(f'{k} {v}' for k, v in stats['sizes'].items()))
+    print('   Top painters: ' + ', '.join(f'{a} ({c})' for a, c in stats['painter_counts'][:5]))
+    print('   Top genres: ' + ', '.join(f'{g} ({c})' for g, c in stats['genre_counts'][:5]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+MediaWiki API backend for collect_art.py
+
+Instead of downloading category HTML and scraping <img> tags, this backend
+lists category members through the Commons API (list=categorymembers with
+continuation) and fetches file URL, dimensions, byte size and sha1 in batches
+of up to 50 titles with prop=imageinfo.
+
+It keeps the original file URLs the API returns; they are matched against
+the HTML backend's thumbnail URLs by file (see commons_files.py).
+
+Used by: python collect_art.py --backend api ...
+"""
+
+import re
+from urllib.parse import urlparse, parse_qs, unquote
+from commons_files import SKIP_SUBCATEGORIES, dedupe_by_url
+from http_client import HEADERS, PoliteSession
+
+API_URL = 'https://commons.wikimedia.org/w/api.php'
+IMAGEINFO_BATCH = 50
+MEMBERS_LIMIT = 500
+
+def page_title_from_url(url):
+    """Turn a Commons page URL (/wiki/... or index.php?title=...) into a page title"""
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    if 'title' in query:
+        title = query['title'][0]
+    elif '/wiki/' in parsed.path:
+        title = parsed.path.split('/wiki/', 1)[1]
+    else:
+        return None
+    return unquote(title).replace('_', ' ')
+
+def api_query(session, params):
+    """Run a query action, following 'continue' until all results are returned"""
+    params = dict(params, action='query', format='json', formatversion=2)
+    cont = {}
+    while True:
+        r = session.get(API_URL, params={**params, **cont}, headers=HEADERS, timeout=30)
+        r.raise_for_status()
+        data = r.json()
+        if 'error' in data:
+            raise RuntimeError(f"API error: {data['error'].get('info', data['error'])}")
+        yield data.get('query', {})
+        if 'continue' not in data:
+            break
+        cont = data['continue']
+
+def iter_category_members(session, category, member_type):
+    """Yield member titles of a category ('file' or 'subcat'), in API order"""
+    params = {
+        'list': 'categorymembers',
+        'cmtitle': category,
+        'cmtype': member_type,
+        'cmlimit': MEMBERS_LIMIT,
+    }
+    for query in api_query(session, params):
+        for member in query.get('categorymembers', []):
+            yield member['title']
+
+def iter_page_images(session, page_title):
+    """Yield file titles used on a regular (non-category) Commons page"""
+    params = {'prop': 'images', 'titles': page_title, 'imlimit': MEMBERS_LIMIT}
+    for query in api_query(session, params):
+        for page in query.get('pages', []):
+            for image in page.get('images', []):
+                yield image['title']
+
+def fetch_imageinfo(session, file_titles):
+    """Fetch url/size/sha1/mime for up to IMAGEINFO_BATCH file titles. Returns {title: info}"""
+    params = {
+        'prop': 'imageinfo',
+        'titles': '|'.join(file_titles),
+        'iiprop': 'url|size|sha1|mime',
+    }
+    infos = {}
+    for query in api_query(session, params):
+        # Titles are normalized by the API (e.g. underscores to spaces)
+        normalized = {n['to']: n['from'] for n in query.get('normalized', [])}
+        for page in query.get('pages', []):
+            imageinfo = page.get('imageinfo')
+            if imageinfo:
+                infos[normalized.get(page['title'], page['title'])] = imageinfo[0]
+    return infos
+
+def painting_from_imageinfo(file_title, info):
+    """Build a painting record in the same shape as the HTML backend, plus real file metadata"""
+    title = re.sub(r'^File:', '', file_title)
+    title = re.sub(r'\.[A-Za-z0-9]+$', '', title)
+    year = None
+    m = re.search(r'(\d{4})', title)
+    if m:
+        year = m.group(1)
+    return {
+        'url': info.get('url'),
+        'title': title,
+        'year': year,
+        'width': info.get('width'),
+        'height': info.get('height'),
+        'size': info.get('size'),
+        'sha1': info.get('sha1')
+    }
+
+def resolve_files(session, file_titles, max_images=None, skip_url=None):
+    """
+    Resolve file titles to painting records in batches, stopping once
+    max_images are found. Files for which skip_url(url) is true are left out.
+    """
+    images = []
+    batch = []
+
+    def flush():
+        infos = fetch_imageinfo(session, batch)
+        for file_title in batch:
+            if max_images and len(images) >= max_images:
+                break
+            info = infos.get(file_title)
+            # Category members can also be PDFs, videos or audio
+            if not info or not info.get('url') or not info.get('mime', 'image/').startswith('image/'):
+                continue
+            if skip_url and skip_url(info['url']):
+                continue
+            images.append(painting_from_imageinfo(file_title, info))
+        batch.clear()
+
+    for file_title in file_titles:
+        batch.append(file_title)
+        if len(batch) >= IMAGEINFO_BATCH:
+            flush()
+            if max_images and len(images) >= max_images:
+                return images
+    if batch:
+        flush()
+    return images
+
+def fetch_commons_api(url, max_images=None, total_max=None, follow_subcategories=True, quiet=False, session=None,
+                      skip_url=None):
+    """
+    API counterpart of collect_art.fetch_commons_unified with the same limit
+    semantics: if a category has subcategories they are collected instead of
+    the category itself, each capped at max_images and all together at total_max.
+    """
+    session = session or PoliteSession()
+    title = page_title_from_url(url)
+    if not title:
+        print(f'Could not determine page title from URL: {url}')
+        return []
+    print(f'Fetching (API): {title}')
+
+    if not title.startswith('Category:'):
+        return dedupe_by_url(resolve_files(session, iter_page_images(session, title), max_images, skip_url))
+
+    if follow_subcategories:
+        subcategories = [t for t in iter_category_members(session, title, 'subcat')
+                         if not any(skip in t.lower() for skip in SKIP_SUBCATEGORIES)]
+        if subcategories:
+            print(f'Found {len(subcategories)} subcategories, fetching from them...')
+            images = []
+            total_found = 0
+            for subcategory in subcategories:
+                if total_max and total_found >= total_max:
+                    if not quiet:
+                        print(f'  Reached total limit of {total_max}, stopping subcategory collection')
+                    break
+                print(f'  Fetching subcategory: {subcategory}')
+                if total_max:
+                    remaining = min(max_images or float('inf'), total_max - total_found)
+                else:
+                    remaining = max_images
+                subcategory_images = dedupe_by_url(
+                    resolve_files(session, iter_category_members(session, subcategory, 'file'), remaining, skip_url))
+                for img in subcategory_images:
+                    if total_max and total_found >= total_max:
+                        break
+                    images.append(img)
+                    total_found += 1
+                if not quiet:
+                    print(f'    Found {len(subcategory_images)} images from {subcategory} (Total: {total_found})')
+            return dedupe_by_url(images)
+
+    return dedupe_by_url(resolve_files(session, iter_category_members(session, title, 'file'), max_images, skip_url))
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Wikimedia Commons helpers shared by both collection backends
+
+The HTML backend (collect_art.py) scrapes thumbnail URLs and the API backend
+(commons_api.py) gets the original file URL, so the same painting arrives as
+
+    https://upload.wikimedia.org/wikipedia/commons/thumb/a/ab/Some_painting.jpg/120px-Some_painting.jpg
+    https://upload.wikimedia.org/wikipedia/commons/a/ab/Some_painting.jpg
+
+file_key() maps both to the uploaded file ('commons/a/ab/Some_painting.jpg'),
+so dedupe_by_url() and the key index (key_index.py) match a painting
+whichever backend found it. The stored URLs are left as they are.
+"""
+
+import re
+from urllib.parse import urlparse, unquote
+
+SKIP_SUBCATEGORIES = ['good pictures', 'featured pictures', 'quality images', 'valued images']
+# /wikipedia/<wiki>/[thumb/]<hash dirs>/<file name>[/<size>px-<file name>]
+UPLOAD_PATH = re.compile(r'^/wikipedia/([^/]+)/(?:thumb/)?([0-9a-f]/[0-9a-f]{2}/[^/]+)')
+
+def file_key(url):
+    """The uploaded file an upload.wikimedia.org URL shows (any thumbnail size), else the URL itself"""
+    if not url:
+        return url
+    parsed = urlparse(url)
+    if parsed.netloc == 'upload.wikimedia.org':
+        m = UPLOAD_PATH.match(parsed.path)
+        if m:
+            return unquote(f'{m.group(1)}/{m.group(2)}')
+    return url
+
+def dedupe_by_url(images):
+    """Remove images of a file seen before (see file_key), keeping the first occurrence"""
+    seen_files = set()
+    unique_images = []
+    for img in images:
+        key = file_key(img['url'])
+        if key not in seen_files:
+            seen_files.add(key)
+            unique_images.append(img)
+    return unique_images
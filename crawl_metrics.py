@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Crawl instrumentation for collect_art.py
+
+Every fetched page gets a record with the time spent fetching, parsing and
+extracting it, the bytes downloaded, whether it came from the HTTP cache and
+how many retries it needed. Pages belong to a category (the category or
+subcategory whose page chain they are part of) and to the seed URL being
+collected. Per seed, the number of images extracted from its pages is kept
+next to the number actually yielded; the difference is what deduplication
+and the --max/--total-max limits dropped.
+
+At the end of a run the metrics can be written as a JSON trace (--trace) or
+as a Prometheus text-format file (--metrics), and report() prints a summary
+with the slowest categories:
+
+    metrics = CrawlMetrics()
+    with metrics.timed(url, 'fetch'):
+        r = session.get(url)
+    metrics.response(url, r)
+    ...
+    metrics.report()
+"""
+
+import contextlib
+import contextvars
+import json
+import threading
+import time
+
+STAGES = ('fetch', 'parse', 'extract')
+
+# Seed URL the current fetches belong to (per thread / asyncio task)
+current_seed = contextvars.ContextVar('current_seed', default=None)
+
+class CrawlMetrics:
+    """Thread-safe per-page and per-seed crawl measurements"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.pages = {}
+        self.seeds = {}
+        self.lock = threading.Lock()
+
+    def page(self, url, category=None):
+        """Record for a page URL, created on first use"""
+        with self.lock:
+            record = self.pages.get(url)
+            if record is None:
+                record = self.pages[url] = {
+                    'url': url, 'category': category or url, 'seed': current_seed.get(),
+                    'requests': 0, 'fetch': 0.0, 'parse': 0.0, 'extract': 0.0,
+                    'bytes': 0, 'cache_hits': 0, 'retries': 0, 'images': 0,
+                }
+            return record
+
+    @contextlib.contextmanager
+    def timed(self, url, stage, category=None):
+        """Add the time spent in the with-block to a page's fetch/parse/extract total"""
+        record = self.page(url, category)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                record[stage] += elapsed
+
+    def response(self, url, response):
+        """Count a response: cache hit or downloaded bytes, and retries (set by PoliteSession)"""
+        record = self.page(url)
+        from_cache = getattr(response, 'from_cache', False)
+        with self.lock:
+            record['requests'] += 1
+            if from_cache:
+                record['cache_hits'] += 1
+            else:
+                record['bytes'] += len(response.content)
+            record['retries'] += getattr(response, 'retries', 0)
+
+    def extracted(self, url, count):
+        record = self.page(url)
+        with self.lock:
+            record['images'] += count
+
+    def seed_done(self, url, yielded):
+        """Images a seed URL finally yielded to the collector"""
+        with self.lock:
+            self.seeds[url] = self.seeds.get(url, 0) + yielded
+
+    def take_pages(self):
+        """Remove and return all page records (used to ship them out of worker processes)"""
+        with self.lock:
+            pages = list(self.pages.values())
+            self.pages = {}
+        return pages
+
+    def add_pages(self, pages):
+        """Merge page records from take_pages() of another process"""
+        with self.lock:
+            for page in pages:
+                record = self.pages.setdefault(page['url'], dict(page, requests=0, bytes=0, cache_hits=0,
+                                                                 retries=0, images=0, **{s: 0.0 for s in STAGES}))
+                for field in ('requests', 'bytes', 'cache_hits', 'retries', 'images') + STAGES:
+                    record[field] += page[field]
+
+    def _group(self, key):
+        groups = {}
+        with self.lock:
+            pages = list(self.pages.values())
+        for page in pages:
+            name = page[key]
+            if name is None:
+                continue
+            group = groups.setdefault(name, {key: name, 'pages': 0, 'requests': 0, 'bytes': 0, 'cache_hits': 0,
+                                             'retries': 0, 'images': 0, **{s: 0.0 for s in STAGES}})
+            group['pages'] += 1
+            for field in ('requests', 'bytes', 'cache_hits', 'retries', 'images') + STAGES:
+                group[field] += page[field]
+        for group in groups.values():
+            group['seconds'] = sum(group[s] for s in STAGES)
+        return groups
+
+    def categories(self):
+        """Per-category totals, slowest first"""
+        return sorted(self._group('category').values(), key=lambda c: c['seconds'], reverse=True)
+
+    def seed_summary(self):
+        """Per-seed totals with images extracted, yielded and dropped (duplicates and limits)"""
+        groups = self._group('seed')
+        summary = []
+        with self.lock:
+            seeds = dict(self.seeds)
+        for url, yielded in seeds.items():
+            group = groups.get(url, {'pages': 0, 'images': 0, 'seconds': 0.0})
+            summary.append({'url': url, 'pages': group['pages'], 'seconds': group['seconds'],
+                            'extracted': group['images'], 'yielded': yielded,
+                            'dropped': max(0, group['images'] - yielded)})
+        return summary
+
+    def totals(self):
+        with self.lock:
+            pages = list(self.pages.values())
+            yielded = sum(self.seeds.values())
+        totals = {'pages': len(pages), 'duration': time.time() - self.started, 'yielded': yielded}
+        for field in ('requests', 'bytes', 'cache_hits', 'retries', 'images') + STAGES:
+            totals[field] = sum(page[field] for page in pages)
+        totals['dropped'] = max(0, totals['images'] - yielded)
+        return totals
+
+    def write_trace(self, path):
+        """JSON trace with run totals, seeds, categories and every page"""
+        with self.lock:
+            # Copies: fetches still running keep updating their page entries
+            pages = [dict(page) for page in self.pages.values()]
+        trace = {
+            'started': self.started,
+            'totals': self.totals(),
+            'seeds': self.seed_summary(),
+            'categories': self.categories(),
+            'pages': sorted(pages, key=lambda p: (p['seed'] or '', p['category'], p['url'])),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, indent=2, ensure_ascii=False)
+
+    def write_prometheus(self, path):
+        """Prometheus text exposition format, e.g. for the node_exporter textfile collector"""
+        totals = self.totals()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                label_text = ','.join(f'{k}="{escape_label(v)}"' for k, v in labels.items())
+                lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+        metric('kunstquiz_crawl_duration_seconds', 'gauge', 'Wall time of the crawl', [({}, f'{totals["duration"]:.3f}')])
+        metric('kunstquiz_crawl_requests_total', 'counter', 'Page requests by HTTP cache result', [
+            ({'cache': 'hit'}, totals['cache_hits']),
+            ({'cache': 'miss'}, totals['requests'] - totals['cache_hits']),
+        ])
+        metric('kunstquiz_crawl_stage_seconds_total', 'counter', 'Time spent per crawl stage',
+               [({'stage': s}, f'{totals[s]:.6f}') for s in STAGES])
+        metric('kunstquiz_crawl_bytes_total', 'counter', 'Bytes downloaded (cache hits excluded)', [({}, totals['bytes'])])
+        metric('kunstquiz_crawl_retries_total', 'counter', 'Retried requests (429/5xx/connection errors)',
+               [({}, totals['retries'])])
+        metric('kunstquiz_crawl_images_total', 'counter', 'Images extracted from pages, yielded, and dropped by dedup/limits', [
+            ({'state': 'extracted'}, totals['images']),
+            ({'state': 'yielded'}, totals['yielded']),
+            ({'state': 'dropped'}, totals['dropped']),
+        ])
+        metric('kunstquiz_crawl_category_seconds', 'gauge', 'Time spent per category and stage',
+               [({'category': c['category'], 'stage': s}, f'{c[s]:.6f}') for c in self.categories() for s in STAGES])
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def report(self, top=10):
+        """Print run totals and the slowest categories"""
+        totals = self.totals()
+        if not totals['pages']:
+            return
+        print(f'\n⏱️  Crawl: {totals["pages"]} pages in {totals["duration"]:.1f}s '
+              f'(fetch {totals["fetch"]:.1f}s, parse {totals["parse"]:.1f}s, extract {totals["extract"]:.1f}s), '
+              f'{totals["bytes"] / 1024 / 1024:.1f} MB downloaded, {totals["cache_hits"]} from cache, '
+              f'{totals["retries"]} retries')
+        print(f'   Images: {totals["images"]} extracted, {totals["yielded"]} yielded, '
+              f'{totals["dropped"]} dropped (duplicates and limits)')
+        print('🐢 Slowest categories:')
+        for c in self.categories()[:top]:
+            name = c['category'].split('/')[-1].replace('_', ' ')
+            print(f'  {c["seconds"]:6.1f}s  fetch {c["fetch"]:5.1f}s  parse {c["parse"]:5.1f}s  '
+                  f'extract {c["extract"]:5.1f}s  {c["pages"]:3} pages  {c["cache_hits"]:3} cached  '
+                  f'{c["retries"]:2} retries  {name}')
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
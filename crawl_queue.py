@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Persistent crawl job queue for collect_art.py
+
+Every page fetch of a collection run is a job in a small SQLite database:
+seed URLs, the subcategories discovered under them and each "next page".
+Jobs carry a state (pending, running, done, failed, skipped), a retry count
+and a priority, and the paintings found by a job are stored in the same
+transaction that marks it done. If a run is interrupted, running it again
+with --resume picks up the remaining frontier instead of starting over.
+
+Used by: python collect_art.py --file urls.txt --queue
+         python collect_art.py --resume
+"""
+
+import json
+import os
+import sqlite3
+
+QUEUE_FILE = 'data/crawl_queue.sqlite'
+MAX_RETRIES = 3
+
+class CrawlQueue:
+    """SQLite-backed queue of page fetch jobs and their results"""
+
+    def __init__(self, path=QUEUE_FILE):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS seeds (
+                seed_idx INTEGER PRIMARY KEY,
+                url TEXT,
+                has_subcategories INTEGER DEFAULT 0,
+                subcategories TEXT,
+                state TEXT DEFAULT 'pending',
+                collected INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                seed_idx INTEGER,
+                sub_idx INTEGER,
+                page_idx INTEGER,
+                url TEXT,
+                kind TEXT,
+                cap INTEGER,
+                state TEXT DEFAULT 'pending',
+                retries INTEGER DEFAULT 0,
+                priority INTEGER DEFAULT 0,
+                error TEXT,
+                UNIQUE (seed_idx, sub_idx, page_idx)
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                job_id INTEGER,
+                position INTEGER,
+                painting TEXT,
+                PRIMARY KEY (job_id, position)
+            );
+        ''')
+        self.db.commit()
+
+    @classmethod
+    def create(cls, seeds, params, path=QUEUE_FILE):
+        """Start a fresh queue for seeds [(url, kind)], replacing any previous run"""
+        if os.path.exists(path):
+            os.remove(path)
+        queue = cls(path)
+        with queue.db:
+            queue.db.execute('INSERT INTO meta VALUES (?, ?)', ('params', json.dumps(params)))
+            for seed_idx, (url, kind) in enumerate(seeds):
+                queue.db.execute('INSERT INTO seeds (seed_idx, url) VALUES (?, ?)', (seed_idx, url))
+                queue.add_job(seed_idx, -1, 0, url, kind, priority=seed_idx)
+        return queue
+
+    @classmethod
+    def resume(cls, path=QUEUE_FILE):
+        """Reopen an interrupted queue; jobs that were running are retried"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'No crawl queue to resume at {path}')
+        queue = cls(path)
+        with queue.db:
+            queue.db.execute("UPDATE jobs SET state = 'pending' WHERE state = 'running'")
+        return queue
+
+    @property
+    def params(self):
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'params'").fetchone()
+        return json.loads(row['value']) if row else {}
+
+    def add_job(self, seed_idx, sub_idx, page_idx, url, kind, cap=None, priority=None):
+        self.db.execute(
+            'INSERT OR IGNORE INTO jobs (seed_idx, sub_idx, page_idx, url, kind, cap, priority) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (seed_idx, sub_idx, page_idx, url, kind, cap, seed_idx if priority is None else priority))
+
+    def next_job(self):
+        """Claim the next pending job in crawl order (priority, subcategory, page)"""
+        row = self.db.execute(
+            "SELECT * FROM jobs WHERE state = 'pending' ORDER BY priority, seed_idx, sub_idx, page_idx LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        with self.db:
+            self.db.execute("UPDATE jobs SET state = 'running' WHERE id = ?", (row['id'],))
+        return dict(row)
+
+    def complete(self, job, paintings, new_jobs=(), cap=None):
+        """Store a job's paintings, mark it done and enqueue follow-up jobs atomically"""
+        with self.db:
+            for position, painting in enumerate(paintings):
+                self.db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                                (job['id'], position, json.dumps(painting, ensure_ascii=False)))
+            self.db.execute("UPDATE jobs SET state = 'done', cap = COALESCE(?, cap), error = NULL WHERE id = ?",
+                            (cap, job['id']))
+            for new_job in new_jobs:
+                self.add_job(**new_job)
+
+    def fail(self, job, error, max_retries=MAX_RETRIES):
+        """Record a failed attempt; the job is retried until max_retries is reached"""
+        retries = job['retries'] + 1
+        state = 'pending' if retries < max_retries else 'failed'
+        with self.db:
+            self.db.execute('UPDATE jobs SET state = ?, retries = ?, error = ? WHERE id = ?',
+                            (state, retries, error, job['id']))
+        return state
+
+    def skip_seed(self, seed_idx):
+        """Drop the remaining frontier of a seed once its limits are reached"""
+        with self.db:
+            self.db.execute("UPDATE jobs SET state = 'skipped' WHERE seed_idx = ? AND state IN ('pending', 'running')",
+                            (seed_idx,))
+
+    def set_subcategories(self, seed_idx, subcategory_links):
+        self.db.execute('UPDATE seeds SET has_subcategories = 1, subcategories = ? WHERE seed_idx = ?',
+                        (json.dumps(subcategory_links, ensure_ascii=False), seed_idx))
+
+    def seed(self, seed_idx):
+        row = self.db.execute('SELECT * FROM seeds WHERE seed_idx = ?', (seed_idx,)).fetchone()
+        seed = dict(row)
+        seed['subcategories'] = json.loads(seed['subcategories']) if seed['subcategories'] else []
+        return seed
+
+    def seed_finished(self, seed_idx):
+        row = self.db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE seed_idx = ? AND state IN ('pending', 'running')", (seed_idx,)
+        ).fetchone()
+        return row[0] == 0
+
+    def finished_seeds(self):
+        """Seeds whose jobs are all finished but whose paintings are not yet appended"""
+        rows = self.db.execute("SELECT seed_idx FROM seeds WHERE state = 'pending' ORDER BY seed_idx").fetchall()
+        return [row['seed_idx'] for row in rows if self.seed_finished(row['seed_idx'])]
+
+    def mark_appended(self, seed_idx, collected):
+        with self.db:
+            self.db.execute("UPDATE seeds SET state = 'appended', collected = ? WHERE seed_idx = ?",
+                            (collected, seed_idx))
+
+    def collected_before(self, seed_idx):
+        """Number of paintings collected by the seeds before seed_idx"""
+        row = self.db.execute('SELECT COALESCE(SUM(collected), 0) FROM seeds WHERE seed_idx < ?', (seed_idx,)).fetchone()
+        return row[0]
+
+    def stream_results(self, seed_idx, sub_idx):
+        """Raw paintings of one category stream (a seed or one of its subcategories), in page order"""
+        rows = self.db.execute('''
+            SELECT results.painting FROM results JOIN jobs ON jobs.id = results.job_id
+            WHERE jobs.seed_idx = ? AND jobs.sub_idx = ?
+            ORDER BY jobs.page_idx, results.position
+        ''', (seed_idx, sub_idx)).fetchall()
+        return [json.loads(row['painting']) for row in rows]
+
+    def stream_cap(self, seed_idx, sub_idx):
+        row = self.db.execute('SELECT cap, state FROM jobs WHERE seed_idx = ? AND sub_idx = ? AND page_idx = 0',
+                              (seed_idx, sub_idx)).fetchone()
+        return dict(row) if row else None
+
+    def counts(self):
+        rows = self.db.execute('SELECT state, COUNT(*) AS n FROM jobs GROUP BY state').fetchall()
+        return {row['state']: row['n'] for row in rows}
+
+    def close(self):
+        self.db.close()
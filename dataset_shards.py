@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Sharded export of the merged paintings for lazy loading in the quiz
+
+Splits the merged paintings into size-bounded shards plus a small manifest,
+so the quiz can fetch the shards of the selected category first and the rest
+in the background instead of downloading the whole collection up front.
+
+Paintings are grouped by artist (most painted artists first, an artist is
+only split when it alone exceeds the size limit) and every shard is a
+normalized document (see artist_table.py) with the artists it needs and the
+global painting ids, i.e. the positions used by data/category_index.json:
+
+    data/paintings/manifest.json
+    {
+      "format": "kunstquiz-shards", "version": 1, "dataset": "<sha256, see artist_table.dataset_id()>",
+      "paintings": 3171, "artists": 81,
+      "shards": [{"file": "shard-000.json", "paintings": 412, "artists": 3, "bytes": 261120, "sha256": "..."}, ...],
+      "categories": {"landscape": {"label": "Landscape Painting", "paintings": 1701, "artists": 41, "shards": [0, 2, 3]}, ...}
+    }
+    data/paintings/shard-000.json
+    {"format": "kunstquiz-normalized", "version": 1, "ids": [...], "artists": {...}, "paintings": [...]}
+
+USAGE:
+    # Written by merge_artist_tags.py --shards, or from an existing merged file:
+    python dataset_shards.py
+    python dataset_shards.py --max-kb 128
+
+    # Check the shards against the manifest (hashes, counts)
+    python dataset_shards.py --verify
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+
+from artist_table import normalize_paintings, expand_paintings, load_paintings, FORMAT as NORMALIZED_FORMAT, VERSION as NORMALIZED_VERSION
+from category_index import bios_id, load_category_index, INDEX_PATH
+
+SHARD_DIR = 'data/paintings'
+MANIFEST_NAME = 'manifest.json'
+FORMAT = 'kunstquiz-shards'
+VERSION = 1
+DEFAULT_SHARD_KB = 256
+
+def compact(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+def plan_shards(normalized, max_bytes):
+    """Lists of painting ids, one per shard: whole artists packed until max_bytes"""
+    slim = normalized['paintings']
+    artists = normalized['artists']
+    groups = {}
+    for i, p in enumerate(slim):
+        groups.setdefault(p.get('artist_id'), []).append(i)
+    # Most painted artists first, so the first shard alone already makes a good quiz
+    order = sorted(groups, key=lambda aid: (aid is None, -len(groups[aid]), aid or ''))
+
+    def painting_bytes(i):
+        # The painting, its entry in "ids" and the two commas
+        return len(compact(slim[i]).encode('utf-8')) + len(str(i)) + 2
+
+    empty = len(compact(shard_document(normalized, [])).encode('utf-8'))
+    shards = []
+    ids, size, shard_artists = [], empty, set()
+    for aid in order:
+        artist_bytes = len(compact({aid: artists[aid]}).encode('utf-8')) if aid else 0
+        group_bytes = artist_bytes + sum(painting_bytes(i) for i in groups[aid])
+        if ids and size + group_bytes > max_bytes:
+            shards.append(ids)
+            ids, size, shard_artists = [], empty, set()
+        for i in groups[aid]:
+            extra = artist_bytes if aid and aid not in shard_artists else 0
+            # Only an artist larger than max_bytes gets split
+            if ids and size + painting_bytes(i) + extra > max_bytes:
+                shards.append(ids)
+                ids, size, shard_artists = [], empty, set()
+                extra = artist_bytes if aid else 0
+            ids.append(i)
+            size += painting_bytes(i) + extra
+            if aid:
+                shard_artists.add(aid)
+    if ids:
+        shards.append(ids)
+    return shards
+
+def shard_document(normalized, ids):
+    slim = [normalized['paintings'][i] for i in ids]
+    aids = sorted({p['artist_id'] for p in slim if 'artist_id' in p})
+    # Only the key orders this shard uses, renumbered so the shard stands alone
+    orders = {}
+    paintings = []
+    for p in slim:
+        if 'key_order' in p:
+            p = dict(p, key_order=orders.setdefault(p['key_order'], len(orders)))
+        paintings.append(p)
+    return {
+        'format': NORMALIZED_FORMAT, 'version': NORMALIZED_VERSION, 'ids': ids,
+        'artists': {aid: normalized['artists'][aid] for aid in aids},
+        'key_orders': [normalized['key_orders'][n] for n in orders],
+        'paintings': paintings,
+    }
+
+def write_shards(paintings, category_index, out_dir=SHARD_DIR, max_kb=DEFAULT_SHARD_KB):
+    """Write shards and manifest for flat paintings; returns the manifest"""
+    normalized = normalize_paintings(paintings)
+    os.makedirs(out_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(out_dir, 'shard-*.json')):
+        os.remove(stale)
+
+    shard_of = {}
+    entries = []
+    for n, ids in enumerate(plan_shards(normalized, max_kb * 1024)):
+        document = shard_document(normalized, ids)
+        data = compact(document).encode('utf-8')
+        name = f'shard-{n:03d}.json'
+        with open(os.path.join(out_dir, name), 'wb') as f:
+            f.write(data)
+        entries.append({'file': name, 'paintings': len(ids), 'artists': len(document['artists']),
+                        'bytes': len(data), 'sha256': hashlib.sha256(data).hexdigest()})
+        for i in ids:
+            shard_of[i] = n
+
+    categories = {}
+    for value, entry in category_index['categories'].items():
+        categories[value] = {
+            'label': entry['label'],
+            'paintings': len(entry['paintings']),
+            'artists': len(entry['artists']),
+            'shards': sorted({shard_of[i] for i in entry['paintings']}),
+        }
+    manifest = {
+        'format': FORMAT, 'version': VERSION, 'dataset': normalized['dataset'],
+        'paintings': len(paintings), 'artists': len(normalized['artists']),
+        'shards': entries, 'categories': categories,
+    }
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+def remove_shards(out_dir=SHARD_DIR):
+    """Delete the shards and manifest in out_dir; returns whether there were any"""
+    stale = glob.glob(os.path.join(out_dir, 'shard-*.json'))
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        stale.append(manifest_path)
+    for path in stale:
+        os.remove(path)
+    return bool(stale)
+
+def load_sharded(out_dir=SHARD_DIR, verify=True):
+    """Flat paintings in their original order from a sharded export; raises ValueError on a hash mismatch"""
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    paintings = [None] * manifest['paintings']
+    for entry in manifest['shards']:
+        with open(os.path.join(out_dir, entry['file']), 'rb') as f:
+            data = f.read()
+        if verify and hashlib.sha256(data).hexdigest() != entry['sha256']:
+            raise ValueError(f'{entry["file"]}: hash does not match the manifest')
+        document = json.loads(data)
+        for i, painting in zip(document['ids'], expand_paintings(document)):
+            paintings[i] = painting
+    if any(p is None for p in paintings):
+        raise ValueError(f'{out_dir}: shards do not cover all {manifest["paintings"]} paintings')
+    return paintings
+
+def print_manifest(manifest, out_dir=SHARD_DIR):
+    total = sum(s['bytes'] for s in manifest['shards'])
+    print(f'✅ Wrote {manifest["paintings"]} paintings in {len(manifest["shards"])} shards '
+          f'({total / 1024:.0f} KB, largest {max((s["bytes"] for s in manifest["shards"]), default=0) / 1024:.0f} KB) to {out_dir}')
+
+def main():
+    parser = argparse.ArgumentParser(description='Write the merged paintings as lazily loadable shards with a manifest')
+    parser.add_argument('--paintings', default='data/paintings_merged.json', help='Merged paintings (flat or normalized)')
+    parser.add_argument('--bios', default='data/artist_bios.json', help='Artist bios (for the category index)')
+    parser.add_argument('--out-dir', default=SHARD_DIR, help=f'Output directory (default: {SHARD_DIR})')
+    parser.add_argument('--max-kb', type=int, default=DEFAULT_SHARD_KB, help=f'Shard size limit in KB (default: {DEFAULT_SHARD_KB})')
+    parser.add_argument('--verify', action='store_true', help='Only check existing shards against the manifest')
+    args = parser.parse_args()
+
+    if args.verify:
+        paintings = load_sharded(args.out_dir)
+        print(f'✅ {len(paintings)} paintings, all shard hashes match {os.path.join(args.out_dir, MANIFEST_NAME)}')
+        return
+
+    paintings = load_paintings(args.paintings)
+    with open(args.bios, 'r', encoding='utf-8') as f:
+        bios_by_name = {b['name']: b for b in json.load(f)}
+    category_index = load_category_index(paintings, bios_by_name, bios_id(args.bios), INDEX_PATH)
+    manifest = write_shards(paintings, category_index, args.out_dir, args.max_kb)
+    print_manifest(manifest, args.out_dir)
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,17 @@
+import argparse
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import hashlib
 import json
 from collections import Counter, defaultdict
 import os
 import re
+import time
+import tracemalloc
+
+from category_index import CATEGORY_DEFS, CategoryIndexBuilder, read_category_index, VERSION as INDEX_VERSION
+from category_registry import rules_hash
+from file_stats import FileStatsCache
 
 PAINTINGS_FILE = 'data/paintings_appended.json'
 PAINTINGS_MERGED_FILE = 'data/paintings_merged.json'
@@ -9,19 +19,9 @@ BIOS_FILE = 'data/artist_bios.json'
 ARTIST_TAGS_FILE = 'data/artist_tags.json'
 ARTIST_TAGS_APPENDED_FILE = 'data/artist_tags_appended.json'
 REPORT_FILE = 'diagnostics.md'
-
-CATEGORY_DEFS = [
-    { 'value': 'all', 'label': 'Full Collection' },
-    { 'value': 'popular', 'label': 'Popular Painters' },
-    { 'value': 'landscape', 'label': 'Landscape Painting' },
-    { 'value': 'portraits', 'label': 'Portraits' },
-    { 'value': 'women_painters', 'label': 'Women Painters' },
-    { 'value': '19thcentury', 'label': '19th Century' },
-    { 'value': '20thcentury', 'label': '20th Century' },
-    { 'value': 'impressionism', 'label': 'Impressionism' },
-    { 'value': 'expressionism', 'label': 'Expressionism' },
-    { 'value': 'norwegian_romantic', 'label': 'Norwegian Romantic' }
-]
+SECTION_CACHE_PATH = '.cache/diagnostics_sections.json'
+SECTION_CACHE_VERSION = 2
+JSON_REPORT_FILE = 'diagnostics.json'
 
 def arr(val):
     if isinstance(val, list):
@@ -56,33 +56,23 @@ def update_readme_with_stats(stats_md):
     with open(readme_path, 'w', encoding='utf-8') as f:
         f.write(readme)
 
-def get_file_stats(filepath):
-    """Get detailed file statistics"""
-    if not os.path.exists(filepath):
-        return None
-    
-    stats = os.stat(filepath)
-    size_mb = stats.st_size / (1024 * 1024)
-    
-    # Count lines
-    with open(filepath, 'r', encoding='utf-8') as f:
-        line_count = sum(1 for _ in f)
-    
-    return {
-        'size_mb': round(size_mb, 2),
-        'size_bytes': stats.st_size,
-        'line_count': line_count,
-        'modified': stats.st_mtime
-    }
+HEALTH_LABELS = {'good': '🟢 Good', 'warning': '🟡 Warning', 'critical': '🔴 Critical'}
 
-def check_health_status(value, thresholds):
-    """Check if a value is within healthy ranges"""
+def health_level(value, thresholds):
+    """'good', 'warning' or 'critical' for a value against its thresholds"""
     if value < thresholds['warning']:
-        return '🟢 Good'
+        return 'good'
     elif value < thresholds['critical']:
-        return '🟡 Warning'
+        return 'warning'
     else:
-        return '🔴 Critical'
+        return 'critical'
+
+def check_health_status(value, thresholds):
+    """Check if a value is within healthy ranges"""
+    return HEALTH_LABELS[health_level(value, thresholds)]
+
+def health_metric(value, thresholds):
+    return {'value': value, 'status': health_level(value, thresholds), 'thresholds': thresholds}
 
 def extract_dimensions_from_url(url, title=None):
     """
@@ -136,129 +126,259 @@ def extract_dimensions_from_url(url, title=None):
     except Exception:
         return None, None
 
-def analyze_image_sizes(paintings):
+def get_painting_dimensions(painting):
     """
-    Analyze image sizes in the collection.
-    Returns size distribution and statistics.
+    Return (width, height) for a painting, preferring the real dimensions
+    stored by the API backend over guessing from the URL or title.
     """
-    size_categories = {
-        'tiny': 0,      # < 100px
-        'small': 0,     # 100-200px
-        'medium': 0,    # 200-500px
-        'large': 0,     # 500-1000px
-        'huge': 0,      # > 1000px
-        'unknown': 0    # can't determine
-    }
-    
-    width_stats = []
-    height_stats = []
-    dimension_pairs = []
-    
-    for painting in paintings:
+    width, height = painting.get('width'), painting.get('height')
+    if width and height:
+        return width, height
+    return extract_dimensions_from_url(painting.get('url', ''), painting.get('title', ''))
+
+class PainterCollector:
+    """Paintings per artist (first appearance order for ties, like Counter)"""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def add(self, painting):
+        artist = painting.get('artist')
+        if artist:
+            self.counts[artist] += 1
+
+class FieldTypeCollector:
+    def __init__(self):
+        self.bad_movement = 0
+        self.bad_genre = 0
+
+    def add(self, painting):
+        if not isinstance(painting.get('movement', []), list):
+            self.bad_movement += 1
+        if not isinstance(painting.get('genre', []), list):
+            self.bad_genre += 1
+
+class DuplicateCollector:
+    """Exact (artist, title, url) duplicates, and URLs / titles seen more than once"""
+
+    def __init__(self):
+        self.seen = set()
+        self.exact_dups = []
+        self.url_counts = {}
+        self.title_counts = {}
+
+    def add(self, painting):
+        key = (painting.get('artist'), painting.get('title'), painting.get('url'))
+        if key in self.seen:
+            self.exact_dups.append(key)
+        else:
+            self.seen.add(key)
         url = painting.get('url', '')
+        if url:
+            self.url_counts[url] = self.url_counts.get(url, 0) + 1
         title = painting.get('title', '')
-        width, height = extract_dimensions_from_url(url, title)
-        
+        if title:
+            self.title_counts[title] = self.title_counts.get(title, 0) + 1
+
+class ImageSizeCollector:
+    """Size distribution by smallest dimension, and width/height min/max/avg"""
+
+    def __init__(self):
+        self.size_categories = {
+            'tiny': 0,      # < 100px
+            'small': 0,     # 100-200px
+            'medium': 0,    # 200-500px
+            'large': 0,     # 500-1000px
+            'huge': 0,      # > 1000px
+            'unknown': 0    # can't determine
+        }
+        self.analyzed = 0
+        self.width = {'min': None, 'max': None, 'sum': 0}
+        self.height = {'min': None, 'max': None, 'sum': 0}
+
+    def add(self, painting):
+        width, height = get_painting_dimensions(painting)
         if width is None or height is None:
-            size_categories['unknown'] += 1
-            continue
-        
-        # Store stats
-        width_stats.append(width)
-        height_stats.append(height)
-        dimension_pairs.append((width, height))
-        
+            self.size_categories['unknown'] += 1
+            return
+        self.analyzed += 1
+        for stats, value in ((self.width, width), (self.height, height)):
+            stats['min'] = value if stats['min'] is None else min(stats['min'], value)
+            stats['max'] = value if stats['max'] is None else max(stats['max'], value)
+            stats['sum'] += value
+
         # Categorize by smallest dimension
         min_dim = min(width, height)
         if min_dim < 100:
-            size_categories['tiny'] += 1
+            self.size_categories['tiny'] += 1
         elif min_dim < 200:
-            size_categories['small'] += 1
+            self.size_categories['small'] += 1
         elif min_dim < 500:
-            size_categories['medium'] += 1
+            self.size_categories['medium'] += 1
         elif min_dim < 1000:
-            size_categories['large'] += 1
+            self.size_categories['large'] += 1
         else:
-            size_categories['huge'] += 1
-    
-    # Calculate statistics
-    stats = {
-        'categories': size_categories,
-        'total_analyzed': len(width_stats),
-        'total_unknown': size_categories['unknown'],
-        'width_stats': {
-            'min': min(width_stats) if width_stats else 0,
-            'max': max(width_stats) if width_stats else 0,
-            'avg': sum(width_stats) // len(width_stats) if width_stats else 0
-        },
-        'height_stats': {
-            'min': min(height_stats) if height_stats else 0,
-            'max': max(height_stats) if height_stats else 0,
-            'avg': sum(height_stats) // len(height_stats) if height_stats else 0
+            self.size_categories['huge'] += 1
+
+    def result(self):
+        def summary(stats):
+            return {
+                'min': stats['min'] if self.analyzed else 0,
+                'max': stats['max'] if self.analyzed else 0,
+                'avg': stats['sum'] // self.analyzed if self.analyzed else 0
+            }
+        return {
+            'categories': self.size_categories,
+            'total_analyzed': self.analyzed,
+            'total_unknown': self.size_categories['unknown'],
+            'width_stats': summary(self.width),
+            'height_stats': summary(self.height)
         }
-    }
-    
-    return stats
 
-def main():
-    # Check for required files
-    required_files = [PAINTINGS_FILE, BIOS_FILE]
-    missing_files = [f for f in required_files if not os.path.exists(f)]
-    if missing_files:
-        print(f'ERROR: Missing required files: {missing_files}')
-        return
-    
-    # Load data
-    paintings = load_json(PAINTINGS_FILE)
-    bios = load_json(BIOS_FILE)
-    bios_by_name = {b['name']: b for b in bios}
-    
-    # Use merged data for analysis if available (has cleaned artist names)
-    paintings_merged = None
-    if os.path.exists(PAINTINGS_MERGED_FILE):
-        paintings_merged = load_json(PAINTINGS_MERGED_FILE)
-        # Use merged data for analysis since it has cleaned artist names
-        paintings = paintings_merged
-    
-    # Try to load optional files
-    paintings_merged = None
-    artist_tags = None
-    artist_tags_appended = None
-    
-    if os.path.exists(PAINTINGS_MERGED_FILE):
-        paintings_merged = load_json(PAINTINGS_MERGED_FILE)
-    if os.path.exists(ARTIST_TAGS_FILE):
-        artist_tags = load_json(ARTIST_TAGS_FILE)
-    if os.path.exists(ARTIST_TAGS_APPENDED_FILE):
-        artist_tags_appended = load_json(ARTIST_TAGS_APPENDED_FILE)
-
-    # Get file statistics for all JSON files
-    all_files = {
-        'Paintings (Appended)': PAINTINGS_FILE,
-        'Paintings (Merged)': PAINTINGS_MERGED_FILE,
-        'Artist Bios': BIOS_FILE,
-        'Artist Tags': ARTIST_TAGS_FILE,
-        'Artist Tags (Appended)': ARTIST_TAGS_APPENDED_FILE
-    }
-    
-    file_stats = {}
-    for name, filepath in all_files.items():
-        if os.path.exists(filepath):
-            file_stats[name] = get_file_stats(filepath)
-    
-    # Health thresholds
-    painting_thresholds = {
-        'count': {'warning': 8000, 'critical': 15000},
-        'size_mb': {'warning': 25, 'critical': 50},
-        'line_count': {'warning': 100000, 'critical': 200000}
-    }
-    
-    artist_thresholds = {
-        'count': {'warning': 500, 'critical': 1000},
-        'size_mb': {'warning': 1, 'critical': 5},
-        'line_count': {'warning': 5000, 'critical': 10000}
-    }
+class GenreCollector:
+    """Paintings per genre (artist_genre and genre)"""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def add(self, painting):
+        for g in arr(painting.get('artist_genre')) + arr(painting.get('genre')):
+            self.counts[g] += 1
+
+def collect(paintings, collectors):
+    """
+    Walk the paintings once, feeding every collector: anything with an
+    add(painting) method, called for each painting in order
+    """
+    adds = [c.add for c in collectors]
+    for painting in paintings:
+        for add in adds:
+            add(painting)
+    return collectors
+
+def analyze_image_sizes(paintings):
+    """
+    Analyze image sizes in the collection.
+    Returns size distribution and statistics.
+    """
+    sizes, = collect(paintings, [ImageSizeCollector()])
+    return sizes.result()
+
+class Profiler:
+    """
+    Wall time and, while tracemalloc is tracing, peak memory of named steps.
+    Steps may nest (a section triggering a load): the outer step's time and
+    peak include the inner one's.
+    """
+
+    def __init__(self):
+        self.steps = {}
+        self.peaks = []
 
+    @contextmanager
+    def measure(self, name):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.peaks:
+                self.peaks[-1] = max(self.peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self.peaks.append(current)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            step = {'wall_ms': round((time.perf_counter() - start) * 1000, 2)}
+            if tracing:
+                peak = max(self.peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self.peaks:
+                    self.peaks[-1] = max(self.peaks[-1], peak)
+                # Above what was already allocated when the step started
+                step['peak_mb'] = round((peak - current) / (1024 * 1024), 3)
+            self.steps[name] = step
+
+class DiagnosticsInputs:
+    """
+    The data files, loaded on first use: sections served from the cache
+    never read them. scan() is the single pass over the paintings shared by
+    all painting sections.
+    """
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.loaded = {}
+        self.has_merged = os.path.exists(PAINTINGS_MERGED_FILE)
+        # Use merged data for analysis if available (has cleaned artist names)
+        self.paintings_file = PAINTINGS_MERGED_FILE if self.has_merged else PAINTINGS_FILE
+        # sha256 of the merged file, i.e. its dataset id (see artist_table.dataset_id)
+        self.merged_sha256 = None
+        # sha256 of the bios file, which the category index is checked against too
+        self.bios_sha256 = None
+        self._scan = None
+
+    def load(self, path):
+        if path not in self.loaded:
+            with self.profiler.measure(f'load {path}'):
+                self.loaded[path] = load_json(path)
+        return self.loaded[path]
+
+    @property
+    def bios(self):
+        return self.load(BIOS_FILE)
+
+    @property
+    def bios_by_name(self):
+        return {b['name']: b for b in self.bios}
+
+    @property
+    def paintings(self):
+        return self.load(self.paintings_file)
+
+    @property
+    def paintings_merged(self):
+        return self.load(PAINTINGS_MERGED_FILE) if self.has_merged else None
+
+    def scan(self):
+        if self._scan is None:
+            paintings = self.paintings
+            # The category index is precomputed by merge_artist_tags.py for the
+            # merged file and only collected here if it is missing, stale or
+            # for the appended file.
+            category_index = None
+            if self.has_merged:
+                category_index = read_category_index(self.merged_sha256, self.bios_sha256)
+            scan = {
+                'painters': PainterCollector(),
+                'field_types': FieldTypeCollector(),
+                'duplicates': DuplicateCollector(),
+                'sizes': ImageSizeCollector(),
+                'genres': GenreCollector(),
+            }
+            collectors = list(scan.values())
+            if category_index is None:
+                category_builder = CategoryIndexBuilder(self.bios_by_name)
+                collectors.append(category_builder)
+            with self.profiler.measure('scan paintings'):
+                collect(paintings, collectors)
+                scan['category_index'] = category_index or category_builder.result()
+            self._scan = scan
+        return self._scan
+
+# Health thresholds
+PAINTING_THRESHOLDS = {
+    'count': {'warning': 8000, 'critical': 15000},
+    'size_mb': {'warning': 25, 'critical': 50},
+    'line_count': {'warning': 100000, 'critical': 200000}
+}
+
+ARTIST_THRESHOLDS = {
+    'count': {'warning': 500, 'critical': 1000},
+    'size_mb': {'warning': 1, 'critical': 5},
+    'line_count': {'warning': 5000, 'critical': 10000}
+}
+
+def section_file_health(data, file_stats):
+    metrics = {}
     lines = []
     lines.append(f'# Art Data Diagnostics\n')
     
@@ -269,47 +389,65 @@ def main():
     lines.append('### 📁 All JSON Files Status')
     for name, stats in file_stats.items():
         if stats:
-            lines.append(f'- **{name}:** {stats["size_mb"]} MB ({stats["line_count"]:,} lines)')
+            records = f', {stats["records"]:,} records' if stats['records'] is not None else ''
+            lines.append(f'- **{name}:** {stats["size_mb"]} MB ({stats["line_count"]:,} lines{records})')
     
     # Paintings collection health
     paintings_stats = file_stats.get('Paintings (Appended)')
     if paintings_stats:
         lines.append(f'\n### 🎨 Paintings Collection Health')
         lines.append(f'- **File size:** {paintings_stats["size_mb"]} MB ({paintings_stats["line_count"]:,} lines)')
-        lines.append(f'- **File size status:** {check_health_status(paintings_stats["size_mb"], painting_thresholds["size_mb"])}')
-        lines.append(f'- **Line count status:** {check_health_status(paintings_stats["line_count"], painting_thresholds["line_count"])}')
-        lines.append(f'- **Total paintings:** {len(paintings):,}')
-        lines.append(f'- **Collection size status:** {check_health_status(len(paintings), painting_thresholds["count"])}')
+        lines.append(f'- **File size status:** {check_health_status(paintings_stats["size_mb"], PAINTING_THRESHOLDS["size_mb"])}')
+        lines.append(f'- **Line count status:** {check_health_status(paintings_stats["line_count"], PAINTING_THRESHOLDS["line_count"])}')
+        lines.append(f'- **Total paintings:** {len(data.paintings):,}')
+        lines.append(f'- **Collection size status:** {check_health_status(len(data.paintings), PAINTING_THRESHOLDS["count"])}')
+        metrics['paintings'] = {
+            'total': len(data.paintings),
+            'file_size_mb': health_metric(paintings_stats['size_mb'], PAINTING_THRESHOLDS['size_mb']),
+            'line_count': health_metric(paintings_stats['line_count'], PAINTING_THRESHOLDS['line_count']),
+            'collection_size': health_metric(len(data.paintings), PAINTING_THRESHOLDS['count']),
+        }
     
     # Artist data health
     bios_stats = file_stats.get('Artist Bios')
     if bios_stats:
         lines.append(f'\n### 👨‍🎨 Artist Data Health')
         lines.append(f'- **Bios file:** {bios_stats["size_mb"]} MB ({bios_stats["line_count"]:,} lines)')
-        lines.append(f'- **Total artists in bios:** {len(bios_by_name)}')
-        lines.append(f'- **Bios file status:** {check_health_status(bios_stats["size_mb"], artist_thresholds["size_mb"])}')
+        lines.append(f'- **Total artists in bios:** {len(data.bios_by_name)}')
+        lines.append(f'- **Bios file status:** {check_health_status(bios_stats["size_mb"], ARTIST_THRESHOLDS["size_mb"])}')
+        metrics['bios'] = {'artists': len(data.bios_by_name),
+                           'file_size_mb': health_metric(bios_stats['size_mb'], ARTIST_THRESHOLDS['size_mb'])}
     
     # Artist tags health
     tags_stats = file_stats.get('Artist Tags')
     if tags_stats:
         lines.append(f'- **Tags file:** {tags_stats["size_mb"]} MB ({tags_stats["line_count"]:,} lines)')
-        lines.append(f'- **Tags file status:** {check_health_status(tags_stats["size_mb"], artist_thresholds["size_mb"])}')
+        lines.append(f'- **Tags file status:** {check_health_status(tags_stats["size_mb"], ARTIST_THRESHOLDS["size_mb"])}')
+        metrics['tags'] = {'file_size_mb': health_metric(tags_stats['size_mb'], ARTIST_THRESHOLDS['size_mb'])}
     
     tags_appended_stats = file_stats.get('Artist Tags (Appended)')
     if tags_appended_stats:
         lines.append(f'- **Tags (Appended) file:** {tags_appended_stats["size_mb"]} MB ({tags_appended_stats["line_count"]:,} lines)')
-        lines.append(f'- **Tags (Appended) status:** {check_health_status(tags_appended_stats["size_mb"], artist_thresholds["size_mb"])}')
+        lines.append(f'- **Tags (Appended) status:** {check_health_status(tags_appended_stats["size_mb"], ARTIST_THRESHOLDS["size_mb"])}')
+        metrics['tags_appended'] = {'file_size_mb': health_metric(tags_appended_stats['size_mb'], ARTIST_THRESHOLDS['size_mb'])}
     
     # Merged paintings health
-    if paintings_merged:
+    if data.has_merged:
         merged_stats = file_stats.get('Paintings (Merged)')
         if merged_stats:
             lines.append(f'\n### 🔗 Merged Data Health')
-            lines.append(f'- **Merged paintings:** {len(paintings_merged):,}')
+            lines.append(f'- **Merged paintings:** {len(data.paintings_merged):,}')
             lines.append(f'- **Merged file size:** {merged_stats["size_mb"]} MB ({merged_stats["line_count"]:,} lines)')
-            lines.append(f'- **Merged file status:** {check_health_status(merged_stats["size_mb"], painting_thresholds["size_mb"])}')
-    
-    all_artists = set(p['artist'] for p in paintings if p.get('artist'))
+            lines.append(f'- **Merged file status:** {check_health_status(merged_stats["size_mb"], PAINTING_THRESHOLDS["size_mb"])}')
+            metrics['merged'] = {'paintings': len(data.paintings_merged),
+                                 'file_size_mb': health_metric(merged_stats['size_mb'], PAINTING_THRESHOLDS['size_mb'])}
+    return lines, metrics
+
+def section_consistency(data, file_stats):
+    lines = []
+    paintings = data.paintings
+    bios_by_name = data.bios_by_name
+    all_artists = set(data.scan()['painters'].counts)
     lines.append(f'- **Total unique artists in paintings:** {len(all_artists)}')
     
     # Data consistency checks
@@ -336,8 +474,8 @@ def main():
         lines.append(f'- **Orphaned bios status:** 🟢 Good - All bios have paintings')
     
     # Check merged vs appended paintings
-    if paintings_merged:
-        merged_count = len(paintings_merged)
+    if data.has_merged:
+        merged_count = len(data.paintings_merged)
         appended_count = len(paintings)
         lines.append(f'- **Merged vs Appended:** {merged_count:,} merged / {appended_count:,} appended')
         if merged_count != appended_count:
@@ -346,11 +484,12 @@ def main():
             lines.append(f'- **Merge consistency:** 🟢 Good - Counts match')
     
     # Performance recommendations
+    paintings_stats = file_stats.get('Paintings (Appended)')
     lines.append('\n### 💡 Performance Recommendations')
     if paintings_stats and paintings_stats["size_mb"] > 25:
         lines.append('- ⚠️ **Large file detected:** Consider splitting data or optimizing storage')
     if len(paintings) > 8000:
-        lines.append('- ⚠️ **Large collection:** Monitor quiz loading performance')
+        lines.append('- ⚠️ **Large collection:** Monitor quiz loading performance (`merge_artist_tags.py --shards` lets the quiz load lazily)')
     if len(paintings) > 15000:
         lines.append('- 🔴 **Very large collection:** Consider data optimization or pagination')
     
@@ -360,42 +499,38 @@ def main():
         lines.append('- 💡 **Good collection size:** Continue collecting for variety')
     else:
         lines.append('- 💡 **Large collection:** Focus on quality over quantity')
+    metrics = {
+        'unique_artists': len(all_artists),
+        'artists_without_bios': sorted(artists_without_bios),
+        'bios_without_paintings': sorted(bios_without_paintings),
+        'recommendations': {
+            'large_file': bool(paintings_stats and paintings_stats['size_mb'] > 25),
+            'large_collection': len(paintings) > 8000,
+            'very_large_collection': len(paintings) > 15000,
+        },
+    }
+    if data.has_merged:
+        metrics['merge'] = {'merged': merged_count, 'appended': appended_count, 'consistent': merged_count == appended_count}
+    return lines, metrics
 
+def section_categories(data, file_stats):
     # 1. Category counts (quiz categories)
-    lines.append('\n## Quiz Categories')
+    category_index = data.scan()['category_index']
+    lines = ['\n## Quiz Categories']
+    metrics = {}
     for cat in CATEGORY_DEFS:
-        if cat['value'] == 'all':
-            filtered = [p for p in paintings if p.get('artist') and p.get('url')]
-        elif cat['value'] == 'popular':
-            artist_counts = Counter(p['artist'] for p in paintings if p.get('artist'))
-            top_artists = set(a for a, _ in artist_counts.most_common(10))
-            filtered = [p for p in paintings if p.get('artist') in top_artists]
-        elif cat['value'] == 'landscape':
-            filtered = [p for p in paintings if any('landscape' in (g or '').lower() for g in arr(p.get('artist_genre')) + arr(p.get('genre')))]
-        elif cat['value'] == 'portraits':
-            filtered = [p for p in paintings if any('portrait' in (g or '').lower() for g in arr(p.get('artist_genre')) + arr(p.get('genre')))]
-        elif cat['value'] == 'women_painters':
-            filtered = [p for p in paintings if p.get('artist_gender') == 'female']
-        elif cat['value'] == '19thcentury':
-            filtered = [p for p in paintings if bios_by_name.get(p.get('artist')) and bios_by_name[p['artist']].get('birth_year') and 1800 <= int(bios_by_name[p['artist']]['birth_year']) < 1900]
-        elif cat['value'] == '20thcentury':
-            filtered = [p for p in paintings if bios_by_name.get(p.get('artist')) and bios_by_name[p['artist']].get('birth_year') and 1900 <= int(bios_by_name[p['artist']]['birth_year']) < 2000]
-        elif cat['value'] == 'impressionism':
-            filtered = [p for p in paintings if any('impressionism' in (m or '').lower() for m in arr(p.get('artist_movement')) + arr(p.get('movement')))]
-        elif cat['value'] == 'expressionism':
-            filtered = [p for p in paintings if any('expressionism' in (m or '').lower() for m in arr(p.get('artist_movement')) + arr(p.get('movement')))]
-        elif cat['value'] == 'norwegian_romantic':
-            filtered = [p for p in paintings if any(any(x in (m or '').lower() for x in ['nasjonalromantikk','norwegian romantic nationalism','romantic nationalism']) for m in arr(p.get('artist_movement')) + arr(p.get('movement')))]
-        else:
-            filtered = []
-        unique_painters = set(p['artist'] for p in filtered if p.get('artist'))
-        lines.append(f'- **{cat["label"]}:** {len(filtered)} paintings, {len(unique_painters)} painters')
+        entry = category_index['categories'][cat['value']]
+        lines.append(f'- **{cat["label"]}:** {len(entry["paintings"])} paintings, {len(entry["artists"])} painters')
+        metrics[cat['value']] = {'label': cat['label'], 'paintings': len(entry['paintings']), 'painters': len(entry['artists'])}
+    return lines, metrics
 
+def section_bio_terms(data, file_stats):
     # 2. All unique genres, movements, awards
+    lines = []
     genre_counter = Counter()
     movement_counter = Counter()
     award_counter = Counter()
-    for b in bios:
+    for b in data.bios:
         for g in arr(b.get('genre')):
             genre_counter[g] += 1
         for m in arr(b.get('movement')):
@@ -411,32 +546,39 @@ def main():
     lines.append('\n## All Awards (from bios)')
     for a, c in award_counter.most_common():
         lines.append(f'- {a}: {c}')
+    metrics = {
+        'genres': dict(genre_counter.most_common()),
+        'movements': dict(movement_counter.most_common()),
+        'awards': dict(award_counter.most_common()),
+    }
+    return lines, metrics
 
+def section_painters_without_paintings(data, file_stats):
     # 3. Painters with 0 paintings
-    painters_with_0 = [b['name'] for b in bios if b['name'] not in all_artists]
-    lines.append(f'\n## Painters in bios with 0 paintings: {len(painters_with_0)}')
+    all_artists = data.scan()['painters'].counts
+    painters_with_0 = [b['name'] for b in data.bios if b['name'] not in all_artists]
+    lines = [f'\n## Painters in bios with 0 paintings: {len(painters_with_0)}']
     if painters_with_0:
         lines.append(', '.join(painters_with_0))
+    return lines, {'count': len(painters_with_0), 'painters': painters_with_0}
 
+def section_field_types(data, file_stats):
     # 4. Field type checks
-    lines.append('\n## Field Type Checks')
-    bad_movement = [p for p in paintings if not isinstance(p.get('movement', []), list)]
-    bad_genre = [p for p in paintings if not isinstance(p.get('genre', []), list)]
-    lines.append(f'- Movement is array for all paintings: {len(bad_movement) == 0}')
-    lines.append(f'- Genre is array for all paintings: {len(bad_genre) == 0}')
+    field_types = data.scan()['field_types']
+    lines = [
+        '\n## Field Type Checks',
+        f'- Movement is array for all paintings: {field_types.bad_movement == 0}',
+        f'- Genre is array for all paintings: {field_types.bad_genre == 0}',
+    ]
+    return lines, {'movement_not_array': field_types.bad_movement, 'genre_not_array': field_types.bad_genre}
 
+def section_duplicates(data, file_stats):
     # 5. Duplicate Analysis
-    lines.append('\n## 🔍 Duplicate Analysis')
+    duplicates = data.scan()['duplicates']
+    lines = ['\n## 🔍 Duplicate Analysis']
     
     # Check exact duplicates (artist, title, url)
-    seen = set()
-    exact_dups = []
-    for p in paintings:
-        key = (p.get('artist'), p.get('title'), p.get('url'))
-        if key in seen:
-            exact_dups.append(key)
-        else:
-            seen.add(key)
+    exact_dups = duplicates.exact_dups
     
     lines.append(f'- **Exact duplicates:** {len(exact_dups)}')
     if exact_dups:
@@ -448,13 +590,7 @@ def main():
         lines.append(f'- **Duplicate status:** 🟢 Good - No exact duplicates')
     
     # Check URL duplicates (same image, different contexts)
-    url_counts = {}
-    for p in paintings:
-        url = p.get('url', '')
-        if url:
-            url_counts[url] = url_counts.get(url, 0) + 1
-    
-    url_duplicates = {url: count for url, count in url_counts.items() if count > 1}
+    url_duplicates = {url: count for url, count in duplicates.url_counts.items() if count > 1}
     lines.append(f'- **URL duplicates:** {len(url_duplicates)} (same image in multiple categories)')
     
     if url_duplicates:
@@ -466,13 +602,7 @@ def main():
         lines.append(f'- **URL duplicate status:** 🟢 Good - No URL duplicates')
     
     # Check title duplicates (same painting, different URLs)
-    title_counts = {}
-    for p in paintings:
-        title = p.get('title', '')
-        if title:
-            title_counts[title] = title_counts.get(title, 0) + 1
-    
-    title_duplicates = {title: count for title, count in title_counts.items() if count > 1}
+    title_duplicates = {title: count for title, count in duplicates.title_counts.items() if count > 1}
     lines.append(f'- **Title duplicates:** {len(title_duplicates)} (same painting, different sources)')
     
     if title_duplicates:
@@ -482,10 +612,19 @@ def main():
             lines.append(f'  - "{title}": {count} times')
     else:
         lines.append(f'- **Title duplicate status:** 🟢 Good - No title duplicates')
+    metrics = {
+        'exact': len(exact_dups),
+        'urls': len(url_duplicates),
+        'titles': len(title_duplicates),
+        'sample_exact': [list(dup) for dup in exact_dups[:3]],
+    }
+    return lines, metrics
 
+def section_image_sizes(data, file_stats):
     # 6. Image Size Analysis
-    lines.append('\n## 📏 Image Size Analysis')
-    image_stats = analyze_image_sizes(paintings)
+    paintings = data.paintings
+    lines = ['\n## 📏 Image Size Analysis']
+    image_stats = data.scan()['sizes'].result()
     
     lines.append(f'- **Total analyzed:** {image_stats["total_analyzed"]} paintings')
     lines.append(f'- **Unknown dimensions:** {image_stats["total_unknown"]} paintings')
@@ -508,16 +647,22 @@ def main():
     tiny_small_medium = tiny_and_small + categories["medium"]
     
     lines.append('\n### Filter Impact Analysis:')
-    lines.append(f'- **Remove < 100px:** Would remove {categories["tiny"]} paintings ({categories["tiny"]/len(paintings)*100:.1f}%)')
-    lines.append(f'- **Remove < 200px:** Would remove {tiny_and_small} paintings ({tiny_and_small/len(paintings)*100:.1f}%)')
-    lines.append(f'- **Remove < 500px:** Would remove {tiny_small_medium} paintings ({tiny_small_medium/len(paintings)*100:.1f}%)')
+    total = len(paintings) or 1
+    lines.append(f'- **Remove < 100px:** Would remove {categories["tiny"]} paintings ({categories["tiny"]/total*100:.1f}%)')
+    lines.append(f'- **Remove < 200px:** Would remove {tiny_and_small} paintings ({tiny_and_small/total*100:.1f}%)')
+    lines.append(f'- **Remove < 500px:** Would remove {tiny_small_medium} paintings ({tiny_small_medium/total*100:.1f}%)')
+    metrics = dict(image_stats)
+    metrics['filter_impact'] = {
+        'below_100px': categories['tiny'],
+        'below_200px': tiny_and_small,
+        'below_500px': tiny_small_medium,
+    }
+    return lines, metrics
 
+def section_genres(data, file_stats):
     # 7. Largest/smallest categories
-    lines.append('\n## Largest/Smallest Categories (by genre)')
-    genre_painting_counts = Counter()
-    for p in paintings:
-        for g in arr(p.get('artist_genre')) + arr(p.get('genre')):
-            genre_painting_counts[g] += 1
+    lines = ['\n## Largest/Smallest Categories (by genre)']
+    genre_painting_counts = data.scan()['genres'].counts
     if genre_painting_counts:
         lines.append('Largest genres:')
         for g, c in genre_painting_counts.most_common(5):
@@ -525,13 +670,209 @@ def main():
         lines.append('Smallest genres:')
         for g, c in genre_painting_counts.most_common()[-5:]:
             lines.append(f'- {g}: {c}')
+    return lines, {'paintings_per_genre': dict(genre_painting_counts.most_common())}
 
+def section_painters(data, file_stats):
     # 8. List all painters and their number of paintings
-    lines.append('\n## All Painters and Number of Paintings')
-    painter_counts = Counter(p['artist'] for p in paintings if p.get('artist'))
-    for artist, count in painter_counts.most_common():
+    lines = ['\n## All Painters and Number of Paintings']
+    counts = data.scan()['painters'].counts.most_common()
+    for artist, count in counts:
         lines.append(f'- {artist}: {count}')
+    return lines, {'paintings_per_painter': dict(counts)}
+
+def section_readme_summary(data, file_stats):
+    category_index = data.scan()['category_index']
+    summary_lines = []
+    summary_lines.append('**Latest Art Quiz Stats**')
+    summary_lines.append(f'- Total paintings: {len(data.paintings)}')
+    summary_lines.append(f'- Total unique artists in paintings: {len(data.scan()["painters"].counts)}')
+    summary_lines.append(f'- Total artists in bios: {len(data.bios_by_name)}')
+    summary_lines.append('- Categories:')
+    for cat in CATEGORY_DEFS:
+        entry = category_index['categories'][cat['value']]
+        summary_lines.append(f'  - {cat["label"]}: {len(entry["paintings"])} paintings, {len(entry["artists"])} painters')
+    metrics = {
+        'paintings': len(data.paintings),
+        'unique_artists': len(data.scan()['painters'].counts),
+        'bios': len(data.bios_by_name),
+    }
+    return summary_lines, metrics
+
+# Input files by role; 'paintings' is the merged file if it exists, else the appended one
+ALL_FILES = {
+    'Paintings (Appended)': PAINTINGS_FILE,
+    'Paintings (Merged)': PAINTINGS_MERGED_FILE,
+    'Artist Bios': BIOS_FILE,
+    'Artist Tags': ARTIST_TAGS_FILE,
+    'Artist Tags (Appended)': ARTIST_TAGS_APPENDED_FILE
+}
+
+# Report sections in order with the inputs each one depends on
+REPORT_SECTIONS = [
+    ('file_health', ['appended', 'merged', 'bios', 'tags', 'tags_appended'], section_file_health),
+    ('consistency', ['appended', 'merged', 'bios'], section_consistency),
+    ('categories', ['paintings', 'bios'], section_categories),
+    ('bio_terms', ['bios'], section_bio_terms),
+    ('painters_without_paintings', ['paintings', 'bios'], section_painters_without_paintings),
+    ('field_types', ['paintings'], section_field_types),
+    ('duplicates', ['paintings'], section_duplicates),
+    ('image_sizes', ['paintings'], section_image_sizes),
+    ('genres', ['paintings'], section_genres),
+    ('painters', ['paintings'], section_painters),
+]
+README_SECTION = ('readme_summary', ['paintings', 'bios'], section_readme_summary)
+
+# Changes to these invalidate every cached section
+CODE_FILES = [os.path.abspath(__file__)] + [os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+                                            for name in ('category_index.py', 'category_registry.py',
+                                                         'artist_table.py', 'file_stats.py')]
 
+def code_version(stats_cache):
+    """
+    Everything besides the input files that cached sections depend on: the
+    cache format, the category index version, the category rules themselves
+    and the source of the code computing the sections
+    """
+    return {
+        'cache': SECTION_CACHE_VERSION,
+        'index': INDEX_VERSION,
+        'registry': rules_hash(),
+        'sources': {os.path.basename(path): stats_cache.get(path)['sha256'] for path in CODE_FILES if os.path.exists(path)},
+    }
+
+class SectionCache:
+    """
+    Section results (report lines and metrics) keyed by a fingerprint of the
+    inputs they depend on, persisted in a sidecar JSON file
+    """
+
+    def __init__(self, path=SECTION_CACHE_PATH):
+        self.path = path
+        self.sections = {}
+        self.stats = {'reused': 0, 'computed': 0}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == SECTION_CACHE_VERSION:
+                    self.sections = data.get('sections', {})
+            except ValueError:
+                pass
+
+    def get(self, name, fingerprint):
+        entry = self.sections.get(name)
+        if entry and entry['fingerprint'] == fingerprint:
+            self.stats['reused'] += 1
+            return entry['lines'], entry['metrics']
+        return None
+
+    def put(self, name, fingerprint, lines, metrics):
+        self.stats['computed'] += 1
+        self.sections[name] = {'fingerprint': fingerprint, 'lines': lines, 'metrics': metrics}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': SECTION_CACHE_VERSION, 'sections': self.sections}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+def fingerprint(inputs, hashes, code):
+    """sha256 over the content hashes of a section's inputs (None for missing files) and code_version()"""
+    key = json.dumps([code] + [[name, hashes[name]] for name in inputs], sort_keys=True)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def run_section(section, data, file_stats, hashes, code, cache, incremental, results):
+    """Lines of a section, computed or from the cache; its metrics and timing go into results"""
+    name, inputs, compute = section
+    key = fingerprint(inputs, hashes, code)
+    with data.profiler.measure(f'section {name}'):
+        cached = cache.get(name, key) if incremental else None
+        if cached is None:
+            lines, metrics = compute(data, file_stats)
+            cache.put(name, key, lines, metrics)
+        else:
+            lines, metrics = cached
+    results[name] = {'metrics': metrics, 'cached': cached is not None,
+                     **data.profiler.steps[f'section {name}']}
+    return lines
+
+def write_json_report(path, sections, file_stats, profiler, total_ms):
+    report = {
+        'generated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'thresholds': {'paintings': PAINTING_THRESHOLDS, 'artists': ARTIST_THRESHOLDS},
+        'files': {name: {'path': ALL_FILES[name], **stats} for name, stats in file_stats.items() if stats},
+        'sections': sections,
+        'performance': {
+            'total_wall_ms': round(total_ms, 2),
+            'traced_peak_mb': round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 3),
+            # Loads and the paintings scan happen inside the first section that needs them
+            'steps': profiler.steps,
+        },
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f'JSON report written to {path}')
+
+def main():
+    parser = argparse.ArgumentParser(description='Data health report (diagnostics.md) and README stats')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Reuse cached sections whose input files did not change')
+    parser.add_argument('--cache-file', default=SECTION_CACHE_PATH, help=f'Section cache (default: {SECTION_CACHE_PATH})')
+    parser.add_argument('--json', nargs='?', const=JSON_REPORT_FILE, metavar='PATH',
+                        help=f'Also write every metric, with wall time and peak memory per section, as JSON (default: {JSON_REPORT_FILE})')
+    args = parser.parse_args()
+
+    # Check for required files
+    required_files = [PAINTINGS_FILE, BIOS_FILE]
+    missing_files = [f for f in required_files if not os.path.exists(f)]
+    if missing_files:
+        print(f'ERROR: Missing required files: {missing_files}')
+        return
+
+    # Memory tracing slows allocation-heavy code down, so only for the JSON report
+    if args.json:
+        tracemalloc.start()
+    start = time.perf_counter()
+    profiler = Profiler()
+    data = DiagnosticsInputs(profiler)
+
+    # Cached by (path, mtime, size): unchanged files are not read again. A
+    # changed bios or paintings file is parsed once, for its record count and
+    # the sections (which are stale then anyway). The other files (tags, the
+    # paintings file not analysed) are never loaded here, only counted by
+    # file_stats on a cache miss.
+    section_files = {BIOS_FILE, data.paintings_file}
+    with profiler.measure('file stats'):
+        stats_cache = FileStatsCache()
+        file_stats = {}
+        for name, filepath in ALL_FILES.items():
+            if os.path.exists(filepath):
+                loader = (lambda path=filepath: data.load(path)) if filepath in section_files else None
+                file_stats[name] = stats_cache.get(filepath, loader)
+        code = code_version(stats_cache)
+        stats_cache.save()
+
+    def content_hash(path):
+        stats = stats_cache.get(path) if os.path.exists(path) else None
+        return stats['sha256'] if stats else None
+
+    data.merged_sha256 = content_hash(PAINTINGS_MERGED_FILE)
+    data.bios_sha256 = content_hash(BIOS_FILE)
+    hashes = {
+        'appended': content_hash(PAINTINGS_FILE),
+        'merged': content_hash(PAINTINGS_MERGED_FILE),
+        'paintings': [data.paintings_file, content_hash(data.paintings_file)],
+        'bios': content_hash(BIOS_FILE),
+        'tags': content_hash(ARTIST_TAGS_FILE),
+        'tags_appended': content_hash(ARTIST_TAGS_APPENDED_FILE),
+    }
+
+    cache = SectionCache(args.cache_file)
+    results = {}
+    lines = []
+    for section in REPORT_SECTIONS:
+        lines.extend(run_section(section, data, file_stats, hashes, code, cache, args.incremental, results))
     lines.append('\nDiagnostics complete.')
 
     # Write diagnostics report
@@ -540,46 +881,17 @@ def main():
     write_report(lines)
 
     # Prepare and update README.md with summary stats
-    summary_lines = []
-    summary_lines.append('**Latest Art Quiz Stats**')
-    summary_lines.append(f'- Total paintings: {len(paintings)}')
-    summary_lines.append(f'- Total unique artists in paintings: {len(all_artists)}')
-    summary_lines.append(f'- Total artists in bios: {len(bios_by_name)}')
-    summary_lines.append('- Categories:')
-    for cat in CATEGORY_DEFS:
-        if cat['value'] == 'all':
-            filtered = [p for p in paintings if p.get('artist') and p.get('url')]
-        elif cat['value'] == 'popular':
-            artist_counts = Counter(p['artist'] for p in paintings if p.get('artist'))
-            top_artists = set(a for a, _ in artist_counts.most_common(10))
-            filtered = [p for p in paintings if p.get('artist') in top_artists]
-        elif cat['value'] == 'landscape':
-            filtered = [p for p in paintings if any('landscape' in (g or '').lower() for g in arr(p.get('artist_genre')) + arr(p.get('genre')))]
-        elif cat['value'] == 'portraits':
-            filtered = [p for p in paintings if any('portrait' in (g or '').lower() for g in arr(p.get('artist_genre')) + arr(p.get('genre')))]
-        elif cat['value'] == 'romanticism':
-            filtered = [p for p in paintings if any('romanticism' in (m or '').lower() for m in arr(p.get('artist_movement')) + arr(p.get('movement')))]
-        elif cat['value'] == 'expressionism':
-            filtered = [p for p in paintings if any('expressionism' in (m or '').lower() for m in arr(p.get('artist_movement')) + arr(p.get('movement')))]
-        elif cat['value'] == 'impressionism':
-            filtered = [p for p in paintings if any('impressionism' in (m or '').lower() for m in arr(p.get('artist_movement')) + arr(p.get('movement')))]
-        elif cat['value'] == 'historical_nationalism':
-            filtered = [p for p in paintings if any(any(x in (g or '').lower() for x in ['historical','nationalism','mythology']) for g in arr(p.get('artist_genre')) + arr(p.get('genre')) + arr(p.get('artist_movement')) + arr(p.get('movement')))]
-        elif cat['value'] == '1800s':
-            filtered = [p for p in paintings if bios_by_name.get(p.get('artist')) and bios_by_name[p['artist']].get('birth_year') and 1800 <= int(bios_by_name[p['artist']]['birth_year']) < 1900]
-        elif cat['value'] == 'national_museum':
-            filtered = [p for p in paintings if p.get('location') and 'national museum of norway' in p['location'].lower()]
-        elif cat['value'] == 'women_painters':
-            # Assuming 'womenPainters' is defined elsewhere or needs to be added.
-            # For now, commenting out as it's not defined in the original file.
-            # filtered = [p for p in paintings if p.get('artist') in womenPainters]
-            pass # Placeholder for women_painters category
-        else:
-            filtered = []
-        unique_painters = set(p['artist'] for p in filtered if p.get('artist'))
-        summary_lines.append(f'  - {cat["label"]}: {len(filtered)} paintings, {len(unique_painters)} painters')
+    summary_lines = run_section(README_SECTION, data, file_stats, hashes, code, cache, args.incremental, results)
     stats_md = '\n'.join(summary_lines)
     update_readme_with_stats(stats_md)
+    # Only incremental runs use the cache, so only they write it
+    if args.incremental:
+        cache.save()
+    if args.json:
+        write_json_report(args.json, results, file_stats, profiler, (time.perf_counter() - start) * 1000)
+        tracemalloc.stop()
+    if args.incremental:
+        print(f'♻️ Sections: {cache.stats["reused"]} reused, {cache.stats["computed"]} recomputed')
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Cached file statistics for the data files
+
+Size, line count, record count (top-level entries of a JSON list or object)
+and SHA-256 of a file, cached in a sidecar JSON file keyed by
+(path, mtime, size). An unchanged file costs one os.stat(); a changed one is
+mapped into memory and scanned once in large chunks, counting newlines with
+bytes.count() and hashing the same chunks, instead of iterating it line by
+line in text mode.
+
+Used by diagnostics.py:
+
+    cache = FileStatsCache()
+    stats = cache.get('data/artist_bios.json')
+    ...
+    cache.save()
+
+USAGE:
+    python file_stats.py data/*.json
+    python file_stats.py --clear
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+
+CACHE_PATH = '.cache/file_stats.json'
+VERSION = 1
+CHUNK_BYTES = 1 << 20
+
+def scan_file(filepath):
+    """(line count, sha256) in one pass; the last line counts even without a trailing newline"""
+    digest = hashlib.sha256()
+    lines = 0
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0, digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, len(mm), CHUNK_BYTES):
+                chunk = mm[start:start + CHUNK_BYTES]
+                lines += chunk.count(b'\n')
+                digest.update(chunk)
+            if mm[-1:] != b'\n':
+                lines += 1
+    return lines, digest.hexdigest()
+
+def count_records(filepath):
+    """Top-level entries of a JSON list or object, None for anything else"""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return len(data) if isinstance(data, (list, dict)) else None
+
+class FileStatsCache:
+    """File statistics keyed by (path, mtime, size), persisted in a sidecar JSON file"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        self.stats = {'hits': 0, 'misses': 0}
+        self.dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == VERSION:
+                    self.entries = data.get('files', {})
+            except ValueError:
+                pass
+
+    def get(self, filepath, data=None):
+        """
+        Stats dict for filepath, None if it does not exist. data is the
+        already parsed file (or a function returning it), if the caller has
+        it, so a miss does not parse it again
+        """
+        try:
+            st = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+        key = os.path.abspath(filepath)
+        entry = self.entries.get(key)
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size_bytes'] == st.st_size:
+            self.stats['hits'] += 1
+        else:
+            self.stats['misses'] += 1
+            line_count, sha256 = scan_file(filepath)
+            if callable(data):
+                data = data()
+            if isinstance(data, (list, dict)):
+                records = len(data)
+            else:
+                records = count_records(filepath)
+            entry = {'mtime_ns': st.st_mtime_ns, 'size_bytes': st.st_size, 'line_count': line_count,
+                     'records': records, 'sha256': sha256}
+            self.entries[key] = entry
+            self.dirty = True
+        return {
+            'size_mb': round(entry['size_bytes'] / (1024 * 1024), 2),
+            'size_bytes': entry['size_bytes'],
+            'line_count': entry['line_count'],
+            'records': entry['records'],
+            'sha256': entry['sha256'],
+            'modified': st.st_mtime,
+        }
+
+    def save(self):
+        if not self.dirty:
+            return
+        # Drop entries of files that no longer exist
+        self.entries = {key: entry for key, entry in self.entries.items() if os.path.exists(key)}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': VERSION, 'files': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+def main():
+    parser = argparse.ArgumentParser(description='Show (cached) statistics of data files')
+    parser.add_argument('files', nargs='*', help='Files to inspect')
+    parser.add_argument('--cache-file', default=CACHE_PATH, help=f'Sidecar cache (default: {CACHE_PATH})')
+    parser.add_argument('--clear', action='store_true', help='Delete the cache first')
+    args = parser.parse_args()
+
+    if args.clear and os.path.exists(args.cache_file):
+        os.remove(args.cache_file)
+        print(f'🗑️ Removed {args.cache_file}')
+    cache = FileStatsCache(args.cache_file)
+    for filepath in args.files:
+        stats = cache.get(filepath)
+        if stats is None:
+            print(f'❌ {filepath}: not found')
+            continue
+        records = f', {stats["records"]:,} records' if stats['records'] is not None else ''
+        print(f'📁 {filepath}: {stats["size_mb"]} MB, {stats["line_count"]:,} lines{records}, sha256 {stats["sha256"][:12]}')
+    cache.save()
+    if args.files:
+        print(f'📊 Cache: {cache.stats["hits"]} hits, {cache.stats["misses"]} misses')
+
+if __name__ == '__main__':
+    main()
@@ -7,10 +7,9 @@ This script fixes truncated URLs and other URL issues in the paintings JSON file
 
 import json
 import re
-import requests
 from urllib.parse import urlparse, unquote
 from bs4 import BeautifulSoup
-import time
+from http_cache import CachedSession
 
 def load_json(filepath):
     """Load JSON file with error handling"""
@@ -82,10 +81,20 @@ def extract_filename_from_url(url):
     
     return None
 
-def find_complete_url_from_filename(filename):
+_session = None
+
+def get_session():
+    """Shared cached HTTP session for lookups made without one, created on first use"""
+    global _session
+    if _session is None:
+        _session = CachedSession()
+    return _session
+
+def find_complete_url_from_filename(filename, session=None):
     """Try to find the complete URL by searching Wikimedia Commons"""
     if not filename:
         return None
+    session = session or get_session()
     
     try:
         # Search for the file on Wikimedia Commons
@@ -98,7 +107,7 @@ def find_complete_url_from_filename(filename):
             'iiprop': 'url|size|mime'
         }
         
-        response = requests.get(search_url, params=params, timeout=10)
+        response = session.get(search_url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -137,7 +146,7 @@ def fix_thumbnail_url(url):
     
     return url
 
-def fix_painting_urls(paintings, verbose=False):
+def fix_painting_urls(paintings, verbose=False, session=None):
     """Fix URLs in paintings data"""
     fixed_count = 0
     cleaned_count = 0
@@ -160,14 +169,12 @@ def fix_painting_urls(paintings, verbose=False):
             # Try to extract filename and find complete URL
             filename = extract_filename_from_url(original_url)
             if filename:
-                complete_url = find_complete_url_from_filename(filename)
+                complete_url = find_complete_url_from_filename(filename, session)
                 if complete_url:
                     painting['url'] = complete_url
                     fixed_count += 1
                     if verbose:
                         print(f"      ✅ Fixed: {complete_url[:80]}...")
-                    # Add delay to be respectful to Wikimedia servers
-                    time.sleep(0.1)
                 else:
                     if verbose:
                         print(f"      ❌ Could not find complete URL for: {filename}")
@@ -191,6 +198,7 @@ def main():
         'data/paintings_merged.json',
         'data/paintings_appended.json'
     ]
+    session = get_session()
     
     for filepath in files_to_fix:
         print(f"\n🔧 Fixing: {filepath}")
@@ -216,7 +224,7 @@ def main():
         
         # Fix the issues
         print(f"\n🔧 Fixing issues...")
-        fixed_urls, cleaned_titles = fix_painting_urls(paintings, verbose=True)
+        fixed_urls, cleaned_titles = fix_painting_urls(paintings, verbose=True, session=session)
         
         print(f"\n📈 Results:")
         print(f"   Fixed URLs: {fixed_urls}")
@@ -232,5 +240,7 @@ def main():
         print(f"   Remaining truncated URLs: {truncated_after}")
         print(f"   Remaining HTML in titles: {html_after}")
 
+    session.report()
+
 if __name__ == '__main__':
     main() 
\ No newline at end of file
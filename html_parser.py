@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+HTML parser backends for the collection scripts
+
+Building a full BeautifulSoup tree with the pure-Python 'html.parser' is the
+most expensive step when scraping large Commons categories. parse_page picks
+the fastest installed backend (lxml if available) and, by default, only builds
+the parts of the page the collector's selectors look at: the page content
+(.mw-parser-output, where galleries live) and the generated category listing
+(.mw-category-generated, with subcategories, files and "next page" links).
+Skins, navigation and footers are skipped during parsing.
+
+If a page has neither container, it is parsed in full so that unusual layouts
+extract exactly what they did before. benchmark_parsers.py compares backends
+on saved pages and checks that extraction results are identical.
+"""
+
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+
+# MediaWiki containers that hold everything the collector's selectors need
+CONTENT_CLASSES = ['mw-parser-output', 'mw-category-generated']
+CONTENT_STRAINER = SoupStrainer(class_=re.compile(r'(^|\s)(' + '|'.join(CONTENT_CLASSES) + r')(\s|$)'))
+
+def available_backends():
+    """Installed tree builders, fastest first"""
+    backends = []
+    try:
+        import lxml  # noqa: F401
+        backends.append('lxml')
+    except ImportError:
+        pass
+    backends.append('html.parser')
+    return backends
+
+_default_backend = available_backends()[0]
+_use_strainer = True
+
+def configure_parser(backend='auto', strainer=True):
+    """Set the backend ('auto', 'lxml' or 'html.parser') and content-only parsing for parse_page"""
+    global _default_backend, _use_strainer
+    if backend == 'auto':
+        backend = available_backends()[0]
+    elif backend not in available_backends():
+        raise ValueError(f'Parser backend not available: {backend} (installed: {", ".join(available_backends())})')
+    _default_backend = backend
+    _use_strainer = strainer
+    return backend
+
+def parse_page(html, backend=None, strainer=None):
+    """Parse a Commons/Wikipedia page, limited to the content containers when possible"""
+    backend = backend or _default_backend
+    strainer = _use_strainer if strainer is None else strainer
+    if strainer:
+        soup = BeautifulSoup(html, backend, parse_only=CONTENT_STRAINER)
+        if soup.find() is not None:
+            return soup
+    return BeautifulSoup(html, backend)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP response cache for the collection scripts
+
+Responses to GET requests are stored on disk together with their ETag and
+Last-Modified headers. Within the TTL a cached response is returned without
+touching the network; after that the cache revalidates with a conditional GET
+(If-None-Match / If-Modified-Since) and only downloads the body again if the
+server says it changed. The cache is bounded in size and evicts the least
+recently used entries first.
+
+Network requests go through the wrapped session, a rate-limited PoliteSession
+(http_client.py) unless another one is passed in.
+
+Used by collect_art.py, commons_api.py, fix_urls.py and collect_artist_tags.py:
+
+    session = CachedSession()
+    r = session.get(url, params=params, timeout=10)
+    ...
+    session.report()
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from http_client import PoliteSession
+
+CACHE_DIR = '.cache/http'
+DEFAULT_TTL = 24 * 60 * 60  # seconds
+DEFAULT_MAX_MB = 500
+
+class CachedSession:
+    """Wraps a requests-style session with an on-disk, revalidating LRU cache"""
+
+    def __init__(self, session=None, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL, max_mb=DEFAULT_MAX_MB, enabled=True):
+        self.session = session or PoliteSession()
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0, 'evicted': 0, 'uncached': 0}
+        self.lock = threading.Lock()
+        self.db = None
+        if enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.db = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite'), check_same_thread=False)
+            self.db.execute('''CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                encoding TEXT,
+                size INTEGER,
+                fetched_at REAL,
+                last_access REAL
+            )''')
+            self.db.commit()
+
+    def __getattr__(self, name):
+        # Anything not cache-related (mount, headers, close, ...) goes to the wrapped session
+        return getattr(self.session, name)
+
+    def _body_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.body')
+
+    def _lookup(self, key):
+        with self.lock:
+            row = self.db.execute(
+                'SELECT etag, last_modified, content_type, encoding, fetched_at FROM entries WHERE key = ?',
+                (key,)).fetchone()
+        if not row or not os.path.exists(self._body_path(key)):
+            return None
+        return dict(zip(['etag', 'last_modified', 'content_type', 'encoding', 'fetched_at'], row))
+
+    def _forget(self, key):
+        with self.lock:
+            self.db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            self.db.commit()
+
+    def _cached_response(self, key, url, entry):
+        """Response from the stored body, None (and the entry dropped) if it was deleted meanwhile"""
+        try:
+            with open(self._body_path(key), 'rb') as f:
+                body = f.read()
+        except OSError:
+            # Evicted by another thread or process since _lookup()
+            self._forget(key)
+            return None
+        with self.lock:
+            self.db.execute('UPDATE entries SET last_access = ? WHERE key = ?', (time.time(), key))
+            self.db.commit()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.url = url
+        response.encoding = entry['encoding']
+        response.headers = CaseInsensitiveDict({'Content-Type': entry['content_type'] or ''})
+        if entry['etag']:
+            response.headers['ETag'] = entry['etag']
+        if entry['last_modified']:
+            response.headers['Last-Modified'] = entry['last_modified']
+        response.from_cache = True
+        return response
+
+    def _store(self, key, url, response):
+        path = self._body_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(response.content)
+        os.replace(tmp_path, path)
+        now = time.time()
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+                key, url,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                response.headers.get('Content-Type'),
+                response.encoding,
+                len(response.content),
+                now, now))
+            self.db.commit()
+            self.stats['stored'] += 1
+        self._evict()
+
+    def _touch(self, key):
+        now = time.time()
+        with self.lock:
+            self.db.execute('UPDATE entries SET fetched_at = ?, last_access = ? WHERE key = ?', (now, now, key))
+            self.db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        with self.lock:
+            total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for key, size in self.db.execute('SELECT key, size FROM entries ORDER BY last_access').fetchall():
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(self._body_path(key))
+                except FileNotFoundError:
+                    pass
+                self.db.execute('DELETE FROM entries WHERE key = ?', (key,))
+                total -= size
+                self.stats['evicted'] += 1
+            self.db.commit()
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        if not self.enabled:
+            self.stats['uncached'] += 1
+            response = self.session.get(url, params=params, headers=headers, **kwargs)
+            response.from_cache = False
+            return response
+
+        full_url = requests.Request('GET', url, params=params).prepare().url
+        key = hashlib.sha256(full_url.encode('utf-8')).hexdigest()
+        entry = self._lookup(key)
+
+        if entry and time.time() - entry['fetched_at'] < self.ttl:
+            response = self._cached_response(key, full_url, entry)
+            if response is not None:
+                with self.lock:
+                    self.stats['hits'] += 1
+                return response
+            entry = None
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry['etag']:
+                request_headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.session.get(full_url, headers=request_headers, **kwargs)
+        response.from_cache = False
+        if entry and response.status_code == 304:
+            self._touch(key)
+            cached = self._cached_response(key, full_url, entry)
+            if cached is not None:
+                with self.lock:
+                    self.stats['revalidated'] += 1
+                return cached
+            # Not modified, but the body is gone: fetch it again unconditionally
+            response = self.session.get(full_url, headers=headers, **kwargs)
+            response.from_cache = False
+
+        with self.lock:
+            self.stats['misses'] += 1
+        if response.status_code == 200:
+            self._store(key, full_url, response)
+        return response
+
+    def report(self):
+        """Print hit/miss counters for this run, and those of the wrapped session"""
+        print()
+        if self.enabled:
+            s = self.stats
+            lookups = s['hits'] + s['revalidated'] + s['misses']
+            hit_rate = (s['hits'] + s['revalidated']) / lookups * 100 if lookups else 0
+            print(f'🗄️  HTTP cache: {s["hits"]} hits, {s["revalidated"]} revalidated (304), '
+                  f'{s["misses"]} misses, {s["stored"]} stored, {s["evicted"]} evicted ({hit_rate:.1f}% served from cache)')
+        if hasattr(self.session, 'report'):
+            self.session.report()
+
+    def close(self):
+        if self.db:
+            self.db.close()
+            self.db = None
+        self.session.close()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the collection scripts
+
+PoliteSession is a requests.Session with:
+
+- keep-alive connection pooling (one pool per host, reused across requests)
+- gzip/deflate responses and a default timeout on every request
+- a token bucket per host, so each Wikimedia host gets a steady request rate
+  (with a small burst) instead of fixed sleeps between requests
+- exponential backoff on 429/5xx responses and connection errors, honoring
+  the server's Retry-After header; a backoff holds back the whole host
+
+CachedSession wraps a PoliteSession by default, so cache hits never wait for
+a token and only real network requests are rate limited:
+
+    session = CachedSession()            # CachedSession(PoliteSession())
+    r = session.get(url, params=params)
+    ...
+    session.report()                     # cache and client statistics
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+HEADERS = {
+    "User-Agent": "kunstquiz/1.0 (your_email@example.com) Python requests",
+    "Accept-Encoding": "gzip, deflate",
+}
+DEFAULT_TIMEOUT = 30  # seconds
+DEFAULT_RATE = 5.0    # requests per second per host
+DEFAULT_BURST = 10
+DEFAULT_POOL_SIZE = 10  # pooled connections per host
+# Hosts with stricter limits than DEFAULT_RATE: (requests per second, burst)
+HOST_RATES = {
+    'query.wikidata.org': (1.0, 2),
+}
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0    # seconds, doubled on every retry
+BACKOFF_MAX = 60.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a request may be sent"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Take a token, sleeping until it is available. Returns the time waited"""
+        with self.lock:
+            self._refill()
+            # Reserve the token now so concurrent callers queue up behind each other
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """Hold back all requests to this host for at least the given time"""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+def retry_after_seconds(response):
+    """Parse a Retry-After header (delta seconds or HTTP date), None if missing or invalid"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class PoliteSession(requests.Session):
+    """requests.Session with pooling, timeouts, per-host rate limiting and backoff"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, host_rates=None, timeout=DEFAULT_TIMEOUT,
+                 max_retries=MAX_RETRIES, pool_size=DEFAULT_POOL_SIZE):
+        super().__init__()
+        self.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.rate = rate
+        self.burst = burst
+        self.host_rates = dict(HOST_RATES, **(host_rates or {}))
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.buckets = {}
+        self.stats = {'requests': 0, 'retries': 0, 'failed': 0, 'waited': 0.0}
+        self.lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.buckets:
+                rate, burst = self.host_rates.get(host, (self.rate, self.burst))
+                self.buckets[host] = TokenBucket(rate, burst)
+            return self.buckets[host]
+
+    def backoff(self, attempt, response=None):
+        """Delay before retry number attempt: Retry-After if given, else exponential with jitter"""
+        delay = retry_after_seconds(response) if response is not None else None
+        if delay is None:
+            delay = BACKOFF_BASE * 2 ** attempt * random.uniform(0.5, 1.0)
+        return min(delay, BACKOFF_MAX)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        bucket = self.bucket(url)
+        attempt = 0
+        while True:
+            waited = bucket.acquire()
+            with self.lock:
+                self.stats['requests'] += 1
+                self.stats['waited'] += waited
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    with self.lock:
+                        self.stats['failed'] += 1
+                    raise
+                delay = self.backoff(attempt)
+            else:
+                # Retries needed for this response, for crawl instrumentation
+                response.retries = attempt
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                if attempt >= self.max_retries:
+                    with self.lock:
+                        self.stats['failed'] += 1
+                    return response
+                delay = self.backoff(attempt, response)
+                response.close()
+            # Hold back every request to this host, the retry then waits in acquire()
+            bucket.pause(delay)
+            attempt += 1
+            with self.lock:
+                self.stats['retries'] += 1
+
+    def report(self):
+        """Print request/retry counters for this run"""
+        s = self.stats
+        print(f'🌐 HTTP client: {s["requests"]} requests, {s["retries"]} retries, {s["failed"]} failed, '
+              f'{s["waited"]:.1f}s waiting for rate limits and backoff')
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Persistent dedup key index for painting datasets
+
+Maps hashed painting keys to record offsets for a dataset file, stored next
+to it as <file>.idx (SQLite):
+
+- keys:       hash of (artist, title, url) -> first/last offset and count
+- urls:       hash of url                  -> url, first offset and count
+- titles:     hash of title                -> title and count
+- files:      hash of the image file       -> count (one file under any URL
+              form, see commons_files.py)
+- duplicates: offset of every record whose key or url appeared before
+
+Offsets are byte offsets for a JSONL log and array positions for a JSON
+array file. The index remembers the size and mtime of the dataset it last
+saw; if another script rewrote the file it is rebuilt once on next use.
+Updates are written in a single transaction together with that bookmark, so
+an interrupted append leaves a stale (rebuilt later) rather than wrong index.
+
+Used by collect_art.py (append_paintings, --skip-known), painting_store.py,
+check_duplicates.py and remove_small_images.py.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+
+from commons_files import file_key
+
+# Part of the stored signature: indexes built with other keys are rebuilt
+KEY_VERSION = 3
+
+def painting_key(painting):
+    """Canonical painting identity (missing fields count as '', as in check_duplicates.py)"""
+    return (painting.get('artist', ''), painting.get('title', ''), painting.get('url', ''))
+
+def hash_value(value):
+    raw = json.dumps(value, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+def iter_jsonl_offsets(path):
+    """Yield (byte offset, painting) for every readable line of a JSONL file"""
+    with open(path, 'rb') as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                try:
+                    yield offset, json.loads(line)
+                except json.JSONDecodeError:
+                    pass
+            offset += len(line)
+
+class KeyIndex:
+    """On-disk key -> offset index for one dataset file"""
+
+    def __init__(self, source, path=None):
+        self.source = source
+        self.kind = 'jsonl' if source.endswith('.jsonl') else 'json'
+        self.path = path or source + '.idx'
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS keys (
+                hash TEXT PRIMARY KEY, key TEXT, first_offset INTEGER, last_offset INTEGER, count INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS urls (
+                hash TEXT PRIMARY KEY, url TEXT, first_offset INTEGER, count INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS titles (
+                hash TEXT PRIMARY KEY, title TEXT, count INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                hash TEXT PRIMARY KEY, count INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS duplicates (
+                kind TEXT, offset INTEGER, hash TEXT, PRIMARY KEY (kind, offset)
+            );
+        ''')
+        self.db.commit()
+
+    def _source_signature(self):
+        if not os.path.exists(self.source):
+            return None
+        stat = os.stat(self.source)
+        return f'{KEY_VERSION}:{stat.st_size}:{stat.st_mtime_ns}'
+
+    def is_stale(self):
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        return (row[0] if row else None) != self._source_signature()
+
+    def ensure_synced(self):
+        """Rebuild the index if the dataset changed since it was last indexed"""
+        if self.is_stale():
+            self.rebuild()
+        return self
+
+    def rebuild(self, paintings=None):
+        """Reindex the dataset; a JSON array that is already loaded can be passed in"""
+        with self.transaction():
+            for table in ('keys', 'urls', 'titles', 'files', 'duplicates'):
+                self.db.execute(f'DELETE FROM {table}')
+            if paintings is not None:
+                self.add(enumerate(paintings))
+            elif os.path.exists(self.source):
+                if self.kind == 'jsonl':
+                    records = iter_jsonl_offsets(self.source)
+                else:
+                    with open(self.source, 'r', encoding='utf-8') as f:
+                        records = enumerate(json.load(f))
+                self.add(records)
+        return self
+
+    @contextmanager
+    def transaction(self):
+        """Commit index changes together with the current dataset signature"""
+        with self.db:
+            yield self
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('signature', ?)", (self._source_signature(),))
+
+    def add(self, records):
+        """Index (offset, painting) pairs; call inside transaction()"""
+        for offset, p in records:
+            key = painting_key(p)
+            key_hash = hash_value(key)
+            self._note_repeat('key', 'keys', key_hash, offset)
+            self.db.execute('''
+                INSERT INTO keys VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT(hash) DO UPDATE SET last_offset = excluded.last_offset, count = count + 1
+            ''', (key_hash, json.dumps(key, ensure_ascii=False), offset, offset))
+            # Empty URLs are indexed too (a repeated one is a duplicate for
+            # remove_small_images.py) but never reported as URL duplicates
+            url = p.get('url', '')
+            url_hash = hash_value(url)
+            self._note_repeat('url', 'urls', url_hash, offset)
+            self.db.execute('''
+                INSERT INTO urls VALUES (?, ?, ?, 1)
+                ON CONFLICT(hash) DO UPDATE SET count = count + 1
+            ''', (url_hash, url, offset))
+            if url:
+                self.db.execute('''
+                    INSERT INTO files VALUES (?, 1)
+                    ON CONFLICT(hash) DO UPDATE SET count = count + 1
+                ''', (hash_value(file_key(url)),))
+            title = p.get('title', '')
+            if title:
+                self.db.execute('''
+                    INSERT INTO titles VALUES (?, ?, 1)
+                    ON CONFLICT(hash) DO UPDATE SET count = count + 1
+                ''', (hash_value(title), title))
+
+    def _note_repeat(self, kind, table, hashed, offset):
+        if self.db.execute(f'SELECT 1 FROM {table} WHERE hash = ?', (hashed,)).fetchone():
+            self.db.execute('INSERT OR REPLACE INTO duplicates VALUES (?, ?, ?)', (kind, offset, hashed))
+
+    def has_key(self, painting):
+        return self.db.execute('SELECT 1 FROM keys WHERE hash = ?',
+                               (hash_value(painting_key(painting)),)).fetchone() is not None
+
+    def has_url(self, url):
+        if not url:
+            return False
+        return self.db.execute('SELECT 1 FROM urls WHERE hash = ?', (hash_value(url),)).fetchone() is not None
+
+    def has_file(self, url):
+        """Whether the image file url shows is stored, under this or another URL form"""
+        if not url:
+            return False
+        return self.db.execute('SELECT 1 FROM files WHERE hash = ?',
+                               (hash_value(file_key(url)),)).fetchone() is not None
+
+    def key_offset(self, painting):
+        row = self.db.execute('SELECT first_offset FROM keys WHERE hash = ?',
+                              (hash_value(painting_key(painting)),)).fetchone()
+        return row[0] if row else None
+
+    def count(self):
+        """Number of records indexed (including duplicates)"""
+        return self.db.execute('SELECT COALESCE(SUM(count), 0) FROM keys').fetchone()[0]
+
+    def unique_count(self):
+        return self.db.execute('SELECT COUNT(*) FROM keys').fetchone()[0]
+
+    def exact_duplicates(self):
+        """[(artist, title, url, offset)] for every record whose key appeared before, in dataset order"""
+        rows = self.db.execute('''
+            SELECT keys.key, duplicates.offset FROM duplicates JOIN keys ON keys.hash = duplicates.hash
+            WHERE duplicates.kind = 'key' ORDER BY duplicates.offset
+        ''')
+        return [(*json.loads(key), offset) for key, offset in rows]
+
+    def repeated_url_offsets(self):
+        """Offsets of records whose url (empty or missing included) appeared before, in dataset order"""
+        rows = self.db.execute("SELECT offset FROM duplicates WHERE kind = 'url' ORDER BY offset")
+        return [offset for offset, in rows]
+
+    def url_duplicates(self):
+        """{url: count} for (non-empty) URLs stored more than once, in dataset order"""
+        rows = self.db.execute("""
+            SELECT url, count FROM urls WHERE count > 1 AND url IS NOT NULL AND url != '' ORDER BY first_offset
+        """)
+        return dict(rows.fetchall())
+
+    def title_duplicates(self):
+        rows = self.db.execute('SELECT title, count FROM titles WHERE count > 1 ORDER BY rowid')
+        return dict(rows.fetchall())
+
+    def close(self):
+        self.db.close()
@@ -1,150 +1,196 @@
+#!/usr/bin/env python3
+"""
+Merge artist tags and bios into the collected paintings
+
+Reads data/paintings_appended.json, data/artist_tags.json and
+data/artist_bios.json, fixes artist names, copies the artist metadata into
+the paintings (bios > tags > painting) and expands their categories.
+
+Output formats:
+- flat (always): data/paintings_merged.json, every painting carries its
+  artist's bio, dates, movement, genre, notable works, ... Diagnostics,
+  the category index, the columnar export and the shards read this file.
+- normalized (--format normalized or both): additionally
+  data/paintings_normalized.json, artist metadata stored once in an artists
+  table that paintings reference by id (see artist_table.py, which expands
+  it back to exactly the flat paintings). A flat-only run removes an earlier
+  normalized file, which the quiz would otherwise load instead
+
+Every run also writes data/category_index.json, the quiz categories
+precomputed as painting ids (see category_index.py), and
+data/category_defs.json, the category rules the quiz compiles (see
+category_registry.py). With --shards the
+paintings are also written as shards plus a manifest to data/paintings/ so the
+quiz can load them lazily (see dataset_shards.py); without --shards, shards
+from an earlier run are removed.
+
+USAGE:
+    python merge_artist_tags.py
+    python merge_artist_tags.py --format normalized
+    python merge_artist_tags.py --format normalized --shards
+"""
+
+import argparse
 import json
 import os
 
-# Load paintings (now from paintings_appended.json)
-with open('data/paintings_appended.json', 'r', encoding='utf-8') as f:
-    paintings = json.load(f)
-
-# Load artist tags
-try:
-    with open('data/artist_tags.json', 'r', encoding='utf-8') as f:
-        artist_tags = json.load(f)
-except FileNotFoundError:
-    print('ERROR: data/artist_tags.json not found. Please run collect_artist_tags.py first.')
-    exit(1)
-
-# Load artist bios
-try:
-    with open('data/artist_bios.json', 'r', encoding='utf-8') as f:
-        artist_bios_list = json.load(f)
-        artist_bios = {b['name']: b for b in artist_bios_list}
-except FileNotFoundError:
-    print('ERROR: data/artist_bios.json not found. Please provide artist bios.')
-    artist_bios = {}
-
-# Helper: add tags and bios from artist to painting if missing or to enrich
-for painting in paintings:
-    artist = painting.get('artist')
+from artist_resolver import normalize_artist_name
+from artist_table import normalize_paintings, NORMALIZED_PATH
+from category_index import bios_id, build_category_index, write_category_index, INDEX_PATH
+from category_registry import export_definitions, DEFS_PATH
+from dataset_shards import write_shards, remove_shards, print_manifest, SHARD_DIR, DEFAULT_SHARD_KB
+
+PAINTINGS_PATH = 'data/paintings_appended.json'
+TAGS_PATH = 'data/artist_tags.json'
+BIOS_PATH = 'data/artist_bios.json'
+MERGED_PATH = 'data/paintings_merged.json'
+
+def load_inputs():
+    # Load paintings (now from paintings_appended.json)
+    with open(PAINTINGS_PATH, 'r', encoding='utf-8') as f:
+        paintings = json.load(f)
+
+    # Load artist tags
+    try:
+        with open(TAGS_PATH, 'r', encoding='utf-8') as f:
+            artist_tags = json.load(f)
+    except FileNotFoundError:
+        print('ERROR: data/artist_tags.json not found. Please run collect_artist_tags.py first.')
+        exit(1)
+
+    # Load artist bios
+    try:
+        with open(BIOS_PATH, 'r', encoding='utf-8') as f:
+            artist_bios_list = json.load(f)
+            artist_bios = {b['name']: b for b in artist_bios_list}
+    except FileNotFoundError:
+        print('ERROR: data/artist_bios.json not found. Please provide artist bios.')
+        artist_bios = {}
+    return paintings, artist_tags, artist_bios
+
+def merge_paintings(paintings, artist_tags, artist_bios):
+    """Add tags and bios from artist to painting if missing or to enrich (in place)"""
+    for painting in paintings:
+        artist = painting.get('artist')
     
-    # Fix various artist name variations
-    if artist:
-        original_artist = artist
-        
-        # Fix museum-specific artist names (e.g., "Nikolai Astrup in Sogn og Fjordane Kunstmuseum" -> "Nikolai Astrup")
-        if ' in ' in artist:
-            artist = artist.split(' in ')[0]
-        
-        # Fix category prefixes (e.g., "Category:Drawings by Hans Gude" -> "Hans Gude")
-        elif artist.startswith('Category:'):
-            artist = artist.replace('Category:', '').strip()
-            # Extract artist name after "by" or "from"
-            if ' by ' in artist:
-                artist = artist.split(' by ')[-1]
-            elif ' from ' in artist:
-                artist = artist.split(' from ')[0]
-        
-        # Fix "Artworks by" prefixes (e.g., "Artworks by Edvard Munch" -> "Edvard Munch")
-        elif artist.startswith('Artworks by '):
-            artist = artist.replace('Artworks by ', '')
-        
-        # Fix life and works suffixes (e.g., "Johan Christian Dahl, 1788-1857: life and works" -> "Johan Christian Dahl")
-        elif ', ' in artist and ': life and works' in artist:
-            artist = artist.split(', ')[0]
-        
-        # Fix "Dahl and Friedrich" type names (e.g., "Dahl and Friedrich. Romantic Landscapes" -> "Johan Christian Dahl")
-        elif 'Dahl and Friedrich' in artist:
-            artist = 'Johan Christian Dahl'
-        
-        # Fix "Christian Krohg. Pictures that captivate" -> "Christian Krohg"
-        elif 'Christian Krohg. Pictures that captivate' in artist:
-            artist = 'Christian Krohg'
-        
-        # Fix URL-encoded characters in artist names first
-        elif '%' in artist:
-            import urllib.parse
-            artist = urllib.parse.unquote(artist)
-        
-        # Fix "Hans Gude from Af Hans Gudes liv og værker" -> "Hans Gude" (after URL decoding)
-        if 'Hans Gude from Af Hans Gudes liv og værker' in artist or 'Hans Gude from Af Hans Gudes liv og v%C3%A6rker' in artist:
-            artist = 'Hans Gude'
-        
-        # Update the painting if the artist name changed
-        if artist != original_artist:
-            painting['artist'] = artist
-            print(f"Fixed artist name: '{original_artist}' -> '{artist}'")
+        if artist:
+            original_artist = artist
+            # Fix various artist name variations (rule table in artist_resolver.py)
+            artist = normalize_artist_name(artist)
+
+            # Update the painting if the artist name changed
+            if artist != original_artist:
+                painting['artist'] = artist
+                print(f"Fixed artist name: '{original_artist}' -> '{artist}'")
     
-    tags = artist_tags.get(artist, {})
-    bio = artist_bios.get(artist, {})
-    # Merge metadata fields, prefer bios > tags > painting
-    for field, bio_field in [
-        ('artist_bio', 'bio'),
-        ('artist_birth', 'birth_year'),
-        ('artist_death', 'death_year'),
-        ('artist_birthplace', 'birthplace'),
-        ('artist_deathplace', 'deathplace'),
-        ('artist_movement', 'movement'),
-        ('artist_genre', 'genre'),
-        ('artist_awards', 'awards'),
-        ('artist_self_portrait_url', 'self_portrait_url'),
-        ('artist_aliases', 'aliases')
-    ]:
-        val = bio.get(bio_field)
-        if val is not None:
-            # Ensure movement/genre/awards/aliases are always arrays
-            if field in ['artist_movement', 'artist_genre', 'artist_awards', 'artist_aliases']:
-                if isinstance(val, str):
-                    painting[field] = [val]
-                elif isinstance(val, list):
-                    painting[field] = val
+        tags = artist_tags.get(artist, {})
+        bio = artist_bios.get(artist, {})
+        # Merge metadata fields, prefer bios > tags > painting
+        for field, bio_field in [
+            ('artist_bio', 'bio'),
+            ('artist_birth', 'birth_year'),
+            ('artist_death', 'death_year'),
+            ('artist_birthplace', 'birthplace'),
+            ('artist_deathplace', 'deathplace'),
+            ('artist_movement', 'movement'),
+            ('artist_genre', 'genre'),
+            ('artist_awards', 'awards'),
+            ('artist_self_portrait_url', 'self_portrait_url'),
+            ('artist_aliases', 'aliases')
+        ]:
+            val = bio.get(bio_field)
+            if val is not None:
+                # Ensure movement/genre/awards/aliases are always arrays
+                if field in ['artist_movement', 'artist_genre', 'artist_awards', 'artist_aliases']:
+                    if isinstance(val, str):
+                        painting[field] = [val]
+                    elif isinstance(val, list):
+                        painting[field] = val
+                    else:
+                        painting[field] = []
                 else:
-                    painting[field] = []
-            else:
-                painting[field] = val
-        elif tags.get(bio_field):
-            painting[field] = tags[bio_field]
-    # Merge tags fields if not present
-    for field in ['movement', 'genre', 'country_of_origin', 'artist_gender', 'artist_summary', 'birthplace']:
-        if not painting.get(field) and tags.get(field):
-            val = tags[field]
-            # Ensure movement/genre are always arrays
-            if field in ['movement', 'genre']:
-                if isinstance(val, str):
-                    painting[field] = [val]
-                elif isinstance(val, list):
                     painting[field] = val
+            elif tags.get(bio_field):
+                painting[field] = tags[bio_field]
+        # Merge tags fields if not present
+        for field in ['movement', 'genre', 'country_of_origin', 'artist_gender', 'artist_summary', 'birthplace']:
+            if not painting.get(field) and tags.get(field):
+                val = tags[field]
+                # Ensure movement/genre are always arrays
+                if field in ['movement', 'genre']:
+                    if isinstance(val, str):
+                        painting[field] = [val]
+                    elif isinstance(val, list):
+                        painting[field] = val
+                    else:
+                        painting[field] = []
                 else:
-                    painting[field] = []
-            else:
-                painting[field] = val
-    # Add notable works if not present
-    if 'notable_works' not in painting and 'notable_works' in tags:
-        painting['notable_works'] = tags['notable_works']
-    # Expand categories using artist tags
-    categories = set(painting.get('categories', []))
-    for key in ['movement', 'genre', 'country_of_origin', 'artist_gender', 'birthplace']:
-        val = painting.get(key) or tags.get(key)
-        if val and isinstance(val, str):
-            categories.add(val)
-    if 'notable_works' in tags:
-        for work in tags['notable_works']:
-            if work.get('title'):
-                categories.add(work['title'])
-    categories = {c for c in categories if c and c != 'Unknown'}
-    gender_val = (painting.get('artist_gender') or painting.get('gender') or tags.get('artist_gender') or tags.get('gender'))
-    if gender_val and str(gender_val).lower() == 'female':
-        categories.add('Women painters')
-    for key in ['genre', 'movement']:
-        val = (painting.get(key) or tags.get(key) or '')
-        if isinstance(val, str) and 'portrait' in val.lower():
-            categories.add('Portraits')
-    for key in ['genre', 'movement']:
-        val = (painting.get(key) or tags.get(key) or '')
-        if isinstance(val, str) and 'landscape' in val.lower():
-            categories.add('Landscapes')
-    painting['categories'] = sorted(categories)
-
-# Output merged file
-with open('data/paintings_merged.json', 'w', encoding='utf-8') as f:
-    json.dump(paintings, f, indent=2, ensure_ascii=False)
-
-print('✅ Merged artist tags and bios into data/paintings_merged.json') 
\ No newline at end of file
+                    painting[field] = val
+        # Add notable works if not present
+        if 'notable_works' not in painting and 'notable_works' in tags:
+            painting['notable_works'] = tags['notable_works']
+        # Expand categories using artist tags
+        categories = set(painting.get('categories', []))
+        for key in ['movement', 'genre', 'country_of_origin', 'artist_gender', 'birthplace']:
+            val = painting.get(key) or tags.get(key)
+            if val and isinstance(val, str):
+                categories.add(val)
+        if 'notable_works' in tags:
+            for work in tags['notable_works']:
+                if work.get('title'):
+                    categories.add(work['title'])
+        categories = {c for c in categories if c and c != 'Unknown'}
+        gender_val = (painting.get('artist_gender') or painting.get('gender') or tags.get('artist_gender') or tags.get('gender'))
+        if gender_val and str(gender_val).lower() == 'female':
+            categories.add('Women painters')
+        for key in ['genre', 'movement']:
+            val = (painting.get(key) or tags.get(key) or '')
+            if isinstance(val, str) and 'portrait' in val.lower():
+                categories.add('Portraits')
+        for key in ['genre', 'movement']:
+            val = (painting.get(key) or tags.get(key) or '')
+            if isinstance(val, str) and 'landscape' in val.lower():
+                categories.add('Landscapes')
+        painting['categories'] = sorted(categories)
+    return paintings
+
+def write_json(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge artist tags and bios into the paintings')
+    parser.add_argument('--format', choices=['flat', 'normalized', 'both'], default='flat',
+                        help=f'flat: only {MERGED_PATH} (default); normalized or both: also {NORMALIZED_PATH} with an artists table')
+    parser.add_argument('--shards', action='store_true', help=f'Also write size-bounded shards and a manifest to {SHARD_DIR} for lazy loading')
+    parser.add_argument('--shard-kb', type=int, default=DEFAULT_SHARD_KB, help=f'Shard size limit in KB (default: {DEFAULT_SHARD_KB})')
+    args = parser.parse_args()
+
+    paintings, artist_tags, artist_bios = load_inputs()
+    paintings = merge_paintings(paintings, artist_tags, artist_bios)
+
+    # Always written: the other scripts read the flat file, an old one would be stale
+    write_json(paintings, MERGED_PATH)
+    print(f'✅ Merged artist tags and bios into {MERGED_PATH}')
+    if args.format in ('normalized', 'both'):
+        normalized = normalize_paintings(paintings)
+        write_json(normalized, NORMALIZED_PATH)
+        print(f'✅ Wrote {len(normalized["paintings"])} paintings and {len(normalized["artists"])} artists to {NORMALIZED_PATH}')
+    elif os.path.exists(NORMALIZED_PATH):
+        # The quiz prefers the normalized file, an old one would hide this merge
+        os.remove(NORMALIZED_PATH)
+        print(f'🗑️ Removed stale {NORMALIZED_PATH} (not written by this run)')
+    # Painting ids in the index are positions, the same in both formats
+    category_index = build_category_index(paintings, artist_bios, bios_id(BIOS_PATH))
+    write_category_index(category_index)
+    print(f'✅ Wrote quiz category index to {INDEX_PATH}')
+    export_definitions()
+    print(f'✅ Wrote quiz category definitions to {DEFS_PATH}')
+    if args.shards:
+        print_manifest(write_shards(paintings, category_index, SHARD_DIR, args.shard_kb))
+    elif remove_shards(SHARD_DIR):
+        # The quiz loads the shards first, old ones would hide this merge
+        print(f'🗑️ Removed stale shards from {SHARD_DIR} (not written by this run)')
+
+if __name__ == '__main__':
+    main()
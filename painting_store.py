@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Append-only JSONL storage for collected paintings
+
+data/paintings_appended.json is a single pretty-printed array, so adding a
+few paintings means loading, rebuilding the (artist, title, url) key set and
+rewriting every record. This store keeps one painting per line in
+data/paintings_appended.jsonl plus a persistent key index (key_index.py), so
+adding N paintings costs N index lookups and N appended lines.
+
+The frontend and merge_artist_tags.py still read the JSON array; the compact
+command rebuilds it from the JSONL log. An empty log is first seeded from the
+JSON array, and compact refuses to overwrite a JSON array holding paintings
+the log does not have.
+
+USAGE:
+    python painting_store.py import     # seed the JSONL log from paintings_appended.json
+    python painting_store.py compact    # write paintings_appended.json from the JSONL log
+    python painting_store.py stats
+
+    python collect_art.py --file urls.txt --store jsonl --merge
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from commons_files import file_key
+from key_index import KeyIndex, painting_key, iter_jsonl_offsets
+
+JSONL_FILE = 'data/paintings_appended.jsonl'
+APPENDED_FILE = 'data/paintings_appended.json'
+
+class PaintingStore:
+    """JSONL log of paintings with a persistent key -> offset index"""
+
+    def __init__(self, path=JSONL_FILE, index=None, json_file=APPENDED_FILE):
+        self.path = path
+        self.index = index or KeyIndex(path)
+        self.json_file = json_file
+
+    def __iter__(self):
+        for _, painting in iter_jsonl_offsets(self.path) if os.path.exists(self.path) else ():
+            yield painting
+
+    def read_at(self, offset):
+        """Read the painting stored at a byte offset (as recorded in the index)"""
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def is_empty(self):
+        return not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+
+    def seed(self):
+        """
+        Start an empty log from the JSON array, so the first compact() keeps
+        the existing collection. Returns the number of paintings imported.
+        """
+        if not self.is_empty() or not os.path.exists(self.json_file):
+            return 0
+        return self.import_json(self.json_file)
+
+    def append(self, paintings):
+        """
+        Append paintings whose key and image file (see commons_files.py) are
+        not yet stored. Returns the number added.
+        """
+        self.seed()
+        return self._append(paintings, by_file=True)
+
+    def _append(self, paintings, by_file):
+        self.index.ensure_synced()
+        batch_keys = set()
+        batch_files = set()
+        new_paintings = []
+        for p in paintings:
+            key = painting_key(p)
+            image = file_key(p.get('url')) if by_file else None
+            if key in batch_keys or self.index.has_key(p) \
+                    or (image and (image in batch_files or self.index.has_file(p['url']))):
+                continue
+            batch_keys.add(key)
+            if image:
+                batch_files.add(image)
+            new_paintings.append(p)
+        if not new_paintings:
+            return 0
+        records = []
+        with open(self.path, 'ab') as f:
+            offset = f.tell()
+            for p in new_paintings:
+                line = (json.dumps(p, ensure_ascii=False) + '\n').encode('utf-8')
+                f.write(line)
+                records.append((offset, p))
+                offset += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+        # Log first, index second: a crash in between leaves the index stale, and it is rebuilt
+        with self.index.transaction():
+            self.index.add(records)
+        return len(new_paintings)
+
+    def import_json(self, json_file=APPENDED_FILE):
+        """Add all paintings from an existing JSON array file (deduplicated by key only)"""
+        with open(json_file, 'r', encoding='utf-8') as f:
+            return self._append(json.load(f), by_file=False)
+
+    def missing_from_log(self, json_file):
+        """Number of paintings in json_file whose key is not in the log"""
+        if not os.path.exists(json_file):
+            return 0
+        with open(json_file, 'r', encoding='utf-8') as f:
+            paintings = json.load(f)
+        self.index.ensure_synced()
+        return sum(1 for p in paintings if not self.index.has_key(p))
+
+    def compact(self, output_file=APPENDED_FILE):
+        """
+        Write the deduplicated log as the JSON array the rest of the project
+        reads. Refuses (ValueError) to overwrite a file holding paintings the
+        log does not have, e.g. ones added with --store json since the import.
+        """
+        self.seed()
+        missing = self.missing_from_log(output_file)
+        if missing:
+            raise ValueError(f'{output_file} has {missing} paintings that are not in {self.path}; '
+                             f'run "python painting_store.py import" first')
+        seen = set()
+        paintings = []
+        for p in self:
+            key = painting_key(p)
+            if key not in seen:
+                seen.add(key)
+                paintings.append(p)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(paintings, f, indent=2, ensure_ascii=False)
+        return len(paintings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Append-only JSONL painting store')
+    parser.add_argument('command', choices=['import', 'compact', 'stats', 'reindex'])
+    parser.add_argument('--store', default=JSONL_FILE, help=f'JSONL log (default: {JSONL_FILE})')
+    parser.add_argument('--json', default=APPENDED_FILE, help=f'JSON array file (default: {APPENDED_FILE})')
+    args = parser.parse_args()
+
+    store = PaintingStore(args.store, json_file=args.json)
+    if args.command == 'import':
+        added = store.import_json(args.json)
+        print(f'✅ Imported {added} new paintings from {args.json} into {args.store}')
+    elif args.command == 'compact':
+        try:
+            count = store.compact(args.json)
+        except ValueError as e:
+            print(f'❌ {e}')
+            sys.exit(1)
+        print(f'✅ Compacted {args.store} into {args.json} ({count} paintings)')
+    elif args.command == 'reindex':
+        store.index.rebuild()
+        print(f'✅ Rebuilt {store.index.path} ({store.index.unique_count()} keys)')
+    else:
+        store.index.ensure_synced()
+        print(f'📊 {args.store}: {store.index.count()} paintings, {store.index.unique_count()} unique keys')
+
+if __name__ == '__main__':
+    main()
@@ -20,6 +20,8 @@ import re
 from urllib.parse import urlparse
 from collections import defaultdict
 
+from key_index import KeyIndex
+
 def load_json(filepath):
     """Load JSON file with error handling"""
     try:
@@ -89,6 +91,13 @@ def extract_dimensions_from_url(url, title=None):
     except Exception:
         return None, None
 
+def get_painting_dimensions(painting):
+    """Get (width, height) for a painting, using stored API dimensions when available"""
+    width, height = painting.get('width'), painting.get('height')
+    if width and height:
+        return width, height
+    return extract_dimensions_from_url(painting.get('url', ''), painting.get('title', ''))
+
 def check_thumbnail_lowres(url):
     """Check if URL is a thumbnail or low-res preview"""
     if '/thumb/' in url:
@@ -172,18 +181,17 @@ def check_small_dimensions(width, height, min_width=200, min_height=200):
     
     return False, None
 
-def check_duplicates(paintings):
-    """Check for duplicate URLs"""
-    seen_urls = set()
-    duplicates = []
-    
-    for i, painting in enumerate(paintings):
-        url = painting.get('url', '')
-        if url in seen_urls:
-            duplicates.append(i)
-        else:
-            seen_urls.add(url)
-    
+def check_duplicates(paintings, source):
+    """
+    Check for duplicate URLs: indices of paintings whose URL appeared before.
+    Read from the persistent key index of source (the file paintings was
+    loaded from), which is only rebuilt if the file changed since it was indexed.
+    """
+    index = KeyIndex(source)
+    if index.is_stale():
+        index.rebuild(paintings)
+    duplicates = index.repeated_url_offsets()
+    index.close()
     return duplicates
 
 def analyze_painting(painting, min_width=200, min_height=200):
@@ -201,7 +209,7 @@ def analyze_painting(painting, min_width=200, min_height=200):
         check_modern_photograph(url, title),
         check_illustration_sketch(url, title),
         check_museum_catalog_codes(url, title),
-        check_small_dimensions(*extract_dimensions_from_url(url, title), min_width, min_height)
+        check_small_dimensions(*get_painting_dimensions(painting), min_width, min_height)
     ]
     
     for should_remove, reason in checks:
@@ -210,9 +218,9 @@ def analyze_painting(painting, min_width=200, min_height=200):
     
     return len(reasons) > 0, reasons
 
-def filter_paintings(paintings, min_width=200, min_height=200, dry_run=False):
+def filter_paintings(paintings, source, min_width=200, min_height=200, dry_run=False):
     """
-    Filter paintings based on quality criteria.
+    Filter paintings (loaded from the file source) based on quality criteria.
     Returns (filtered_paintings, removed_count, removal_stats, removed_details)
     """
     filtered_paintings = []
@@ -221,14 +229,13 @@ def filter_paintings(paintings, min_width=200, min_height=200, dry_run=False):
     removed_details = []
     
     # Check for duplicates first
-    duplicate_indices = check_duplicates(paintings)
-    seen_urls = set()
+    duplicate_indices = set(check_duplicates(paintings, source))
     
     for i, painting in enumerate(paintings):
         url = painting.get('url', '')
         
         # Check for duplicates
-        if url in seen_urls:
+        if i in duplicate_indices:
             removed_count += 1
             removal_stats['duplicates'] += 1
             removed_details.append({
@@ -239,8 +246,6 @@ def filter_paintings(paintings, min_width=200, min_height=200, dry_run=False):
             })
             if not dry_run:
                 continue
-        else:
-            seen_urls.add(url)
         
         # Check other quality criteria
         should_remove, reasons = analyze_painting(painting, min_width, min_height)
@@ -291,7 +296,7 @@ def main():
     
     # Filter paintings
     filtered_paintings, removed_count, removal_stats, removed_details = filter_paintings(
-        paintings, args.min_width, args.min_height, args.dry_run
+        paintings, args.input, args.min_width, args.min_height, args.dry_run
     )
     
     # Show results
@@ -329,7 +334,7 @@ def main():
                 appended_paintings = load_json(appended_file)
                 if appended_paintings:
                     filtered_appended, removed_appended, _, _ = filter_paintings(
-                        appended_paintings, args.min_width, args.min_height, False
+                        appended_paintings, appended_file, args.min_width, args.min_height, False
                     )
                     if save_json(filtered_appended, appended_file):
                         print(f"✅ Also cleaned {appended_file}: {len(appended_paintings)} → {len(filtered_appended)} paintings")
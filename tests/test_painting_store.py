@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from painting_store import PaintingStore
+
+CURATED = [
+    {'artist': 'Hans Gude', 'title': 'Fjordlandskap', 'url': 'https://x/gude.jpg'},
+    {'artist': 'Harriet Backer', 'title': 'Blått interiør', 'url': 'https://x/backer.jpg'},
+    # Same file under another title: kept by the import, which only dedups by key
+    {'artist': 'Harriet Backer', 'title': 'Blue Interior', 'url': 'https://x/backer.jpg'},
+]
+
+def write_json(path, paintings):
+    path.write_text(json.dumps(paintings, indent=2, ensure_ascii=False), encoding='utf-8')
+
+def read_json(path):
+    return json.loads(path.read_text(encoding='utf-8'))
+
+def test_first_jsonl_run_keeps_the_existing_collection(tmp_path):
+    json_file = tmp_path / 'paintings_appended.json'
+    write_json(json_file, CURATED)
+    store = PaintingStore(str(tmp_path / 'paintings_appended.jsonl'), json_file=str(json_file))
+
+    new = {'artist': 'Christian Krohg', 'title': 'Albertine', 'url': 'https://x/krohg.jpg'}
+    assert store.append([new]) == 1
+    assert store.compact(str(json_file)) == 4
+    assert read_json(json_file) == CURATED + [new]
+
+def test_compact_of_an_empty_log_keeps_the_existing_collection(tmp_path):
+    json_file = tmp_path / 'paintings_appended.json'
+    write_json(json_file, CURATED)
+    store = PaintingStore(str(tmp_path / 'paintings_appended.jsonl'), json_file=str(json_file))
+
+    assert store.compact(str(json_file)) == 3
+    assert read_json(json_file) == CURATED
+
+def test_compact_refuses_to_drop_paintings_the_log_does_not_have(tmp_path):
+    json_file = tmp_path / 'paintings_appended.json'
+    write_json(json_file, CURATED)
+    store = PaintingStore(str(tmp_path / 'paintings_appended.jsonl'), json_file=str(json_file))
+    store.compact(str(json_file))
+
+    # Added with --store json after the log was seeded
+    added = CURATED + [{'artist': 'Edvard Munch', 'title': 'Skrik', 'url': 'https://x/munch.jpg'}]
+    write_json(json_file, added)
+    with pytest.raises(ValueError):
+        store.compact(str(json_file))
+    assert read_json(json_file) == added
@@ -0,0 +1,48 @@
+import importlib
+import os
+import socket
+
+import pytest
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'wikidata_dump.json.gz')
+
+@pytest.fixture
+def offline(monkeypatch, tmp_path):
+    """No network and an empty working directory, so any cache or socket use shows"""
+    def refuse(*args, **kwargs):
+        raise AssertionError('tags_from_dump tried to use the network')
+    monkeypatch.setattr(socket.socket, 'connect', refuse)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def test_import_creates_no_cache(offline):
+    import collect_artist_tags
+    import wikidata_dump
+    importlib.reload(collect_artist_tags)
+    importlib.reload(wikidata_dump)
+    assert not (offline / '.cache').exists()
+
+def test_tags_from_dump(offline):
+    from wikidata_dump import tags_from_dump
+
+    tags = tags_from_dump(FIXTURE, ['Harriet Backer', 'Frits Thaulow', 'Edvard Munch'], workers=1)
+
+    # A painter wins over a namesake; labels come in English
+    assert tags['Harriet Backer'] == {
+        'gender': 'female',
+        'birth': '1845-01-21T00:00:00Z',
+        'birthplace': 'Holmestrand',
+        'genre': 'portrait',
+        'country': 'Norway',
+        'death': '1932-03-25T00:00:00Z',
+        'summary': 'Norwegian painter',
+        'is_female': True,
+        'notable_works': [{'title': 'Blue Interior', 'year': '1883-01-01T00:00:00Z'}],
+        'movement': 'Impressionism',
+    }
+    # Matched through an alias
+    assert tags['Frits Thaulow']['gender'] == 'male'
+    assert tags['Frits Thaulow']['notable_works'] == [{'title': 'Winter in Norway', 'year': None}]
+    # Only entity with that label is not a human
+    assert tags['Edvard Munch'] == {'not_found': True}
+    assert not (offline / '.cache').exists()
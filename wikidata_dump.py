@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Build artist tags from a local Wikidata JSON dump instead of the live APIs
+
+Streams a Wikidata entity dump (latest-all.json.bz2/.gz or an uncompressed
+file, one entity per line) in constant memory and produces the same tag
+structure as collect_artist_tags.py: birth, death, movement, genre, country,
+birthplace, gender, is_female, summary and notable_works, for 'en' and 'no'
+labels merged the same way.
+
+The dump is read twice. The first pass finds the artists, by QID or by label
+(humans only), the second one fetches labels and inception dates of the
+entities they refer to (movements, places, genders, notable works). Chunks
+of lines are parsed in a process pool; lines that cannot match are skipped
+before JSON parsing.
+
+Differences to the API path: the dump has no Wikipedia intro, so 'summary'
+is the entity description, and several humans sharing a label are resolved
+by preferring painters, then the lowest QID.
+
+USAGE:
+    # Tags for the artists in collect_artist_tags.py, paintings and bios
+    python wikidata_dump.py latest-all.json.bz2 --workers 8
+
+    # Also match by QIDs already resolved in the incremental entity cache
+    python wikidata_dump.py latest-all.json.bz2 --qids-from-cache
+
+    # Write only the dump results to a separate file (e.g. for a fixture dump)
+    python wikidata_dump.py tests/fixtures/wikidata_dump.json.gz --output /tmp/artist_tags.json
+"""
+
+import argparse
+import bz2
+import gzip
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from collect_artist_tags import (known_artist_names, translate, merge_language_tags, save_tags, load_json_file,
+                                 CACHE_PATH, OUTPUT_PATH)
+
+CHUNK_LINES = 2000
+HUMAN = 'Q5'
+PAINTER = 'Q1028181'
+# Wikidata properties behind each tag (same as the SPARQL queries)
+ARTIST_PROPERTIES = ['P569', 'P570', 'P135', 'P136', 'P27', 'P19', 'P21', 'P800', 'P31', 'P106']
+ITEM_PROPERTIES = ['P135', 'P136', 'P27', 'P19', 'P21', 'P800']
+# Languages whose labels are kept: 'no' labels are mostly stored as 'nb'
+LABEL_LANGUAGES = {'en': ['en'], 'no': ['no', 'nb', 'nn']}
+ENTITY_ID = re.compile(r'"id":\s*"(Q\d+)"')
+
+def open_dump(path):
+    """Open a .bz2, .gz or plain dump as text"""
+    if path.endswith('.bz2'):
+        return bz2.open(path, 'rt', encoding='utf-8')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+def iter_chunks(path, size=CHUNK_LINES):
+    """Lists of entity lines; the '[' / ']' wrapper and trailing commas of full dumps are dropped"""
+    chunk = []
+    with open_dump(path) as f:
+        for line in f:
+            line = line.strip().rstrip(',')
+            if not line or line in ('[', ']'):
+                continue
+            chunk.append(line)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def bounded_map(pool, fn, chunks, extra, window):
+    """pool.map over chunks with at most `window` chunks in flight, so memory stays constant"""
+    pending = []
+    for chunk in chunks:
+        pending.append(pool.submit(fn, chunk, *extra))
+        if len(pending) >= window:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+def map_chunks(path, fn, extra, workers):
+    if workers <= 1:
+        for chunk in iter_chunks(path):
+            yield fn(chunk, *extra)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        yield from bounded_map(pool, fn, iter_chunks(path), extra, workers * 2)
+
+def claim_values(entity, prop):
+    """Values of the best-ranked statements of a property, like wdt: in SPARQL"""
+    claims = [c for c in entity.get('claims', {}).get(prop, []) if c.get('rank') != 'deprecated']
+    preferred = [c for c in claims if c.get('rank') == 'preferred']
+    values = []
+    for claim in preferred or claims:
+        snak = claim.get('mainsnak', {})
+        if snak.get('snaktype') != 'value':
+            continue
+        value = snak['datavalue']['value']
+        if isinstance(value, dict) and 'id' in value:
+            values.append(value['id'])
+        elif isinstance(value, dict) and 'time' in value:
+            values.append(sparql_time(value['time']))
+        else:
+            values.append(value)
+    return values
+
+def sparql_time(value):
+    """'+1863-12-12T00:00:00Z' / '+1899-00-00T00:00:00Z' -> '1863-12-12T00:00:00Z' / '1899-01-01T00:00:00Z'"""
+    value = value.lstrip('+')
+    date, _, rest = value.partition('T')
+    parts = date.split('-')
+    if len(parts) == 3:
+        parts = [parts[0]] + [p if p != '00' else '01' for p in parts[1:]]
+    return '-'.join(parts) + 'T' + rest
+
+def slim_texts(texts, languages):
+    return {lang: texts[lang]['value'] for lang in languages if lang in texts}
+
+def all_label_languages():
+    return [lang for langs in LABEL_LANGUAGES.values() for lang in langs]
+
+def scan_artists(lines, qids, labels):
+    """
+    Worker for pass 1: entities whose QID is wanted, or humans with a wanted
+    en/no label or alias. Returns slim entities with only the tag properties.
+    """
+    needles = [(label, json.dumps(label), json.dumps(label, ensure_ascii=False)) for label in labels]
+    found = []
+    for line in lines:
+        m = ENTITY_ID.search(line, 0, 200)
+        qid = m.group(1) if m else None
+        by_qid = qid in qids
+        if not by_qid and not any(escaped in line or raw in line for _, escaped, raw in needles):
+            continue
+        entity = json.loads(line)
+        names = set()
+        for lang in all_label_languages():
+            if lang in entity.get('labels', {}):
+                names.add(entity['labels'][lang]['value'])
+            names.update(alias['value'] for alias in entity.get('aliases', {}).get(lang, []))
+        matched = sorted(names & labels)
+        if not by_qid and not (matched and HUMAN in claim_values(entity, 'P31')):
+            continue
+        found.append({
+            'id': entity['id'],
+            'matched_labels': matched,
+            'labels': slim_texts(entity.get('labels', {}), all_label_languages()),
+            'descriptions': slim_texts(entity.get('descriptions', {}), all_label_languages()),
+            'claims': {prop: claim_values(entity, prop) for prop in ARTIST_PROPERTIES},
+        })
+    return found
+
+def scan_referenced(lines, qids):
+    """Worker for pass 2: labels (and inception, for notable works) of referenced entities"""
+    found = {}
+    for line in lines:
+        m = ENTITY_ID.search(line, 0, 200)
+        if not m or m.group(1) not in qids:
+            continue
+        entity = json.loads(line)
+        found[entity['id']] = {
+            'labels': slim_texts(entity.get('labels', {}), all_label_languages()),
+            'inception': (claim_values(entity, 'P571') or [None])[0],
+        }
+    return found
+
+def label_for(entity, lang):
+    """Label in lang, falling back to English and then the QID, like wikibase:label with '{lang},en'"""
+    for code in LABEL_LANGUAGES[lang] + LABEL_LANGUAGES['en']:
+        if code in entity.get('labels', {}):
+            return entity['labels'][code]
+    return entity.get('id')
+
+def description_for(entity, lang):
+    for code in LABEL_LANGUAGES[lang]:
+        if code in entity.get('descriptions', {}):
+            return entity['descriptions'][code]
+    return ''
+
+def tags_from_entity(artist, referenced, lang):
+    """Tags for one language, in the shape of collect_artist_tags.fetch_tags_from_wikipedia"""
+    claims = artist['claims']
+
+    def first_label(prop):
+        values = claims.get(prop, [])
+        if not values:
+            return None
+        return label_for(dict(referenced.get(values[0], {}), id=values[0]), lang)
+
+    gender = first_label('P21')
+    tags = {
+        'birth': (claims.get('P569') or [None])[0],
+        'death': (claims.get('P570') or [None])[0],
+        'movement': translate(first_label('P135')),
+        'genre': translate(first_label('P136')),
+        'country': translate(first_label('P27')),
+        'birthplace': first_label('P19'),
+        'gender': translate(gender),
+        'is_female': (gender and gender.lower() in ['female', 'kvinne']),
+        'summary': description_for(artist, lang),
+    }
+    works = []
+    for qid in claims.get('P800', []):
+        work = dict(referenced.get(qid, {}), id=qid)
+        works.append({'title': label_for(work, lang), 'year': work.get('inception')})
+    if works:
+        tags['notable_works'] = works
+    return tags
+
+def pick_entity(candidates):
+    """Best match among entities sharing a label: painters first, then the lowest QID"""
+    return min(candidates, key=lambda e: (PAINTER not in e['claims'].get('P106', []), int(e['id'][1:])))
+
+def tags_from_dump(path, artist_names, artist_qids=None, workers=1):
+    """
+    Tags for artist_names from a dump. artist_qids maps names to already known
+    QIDs; the others are matched by label. Returns {artist: tags}.
+    """
+    artist_qids = {name: qid for name, qid in (artist_qids or {}).items() if qid and name in artist_names}
+    wanted_qids = set(artist_qids.values())
+    wanted_labels = set(artist_names) - set(artist_qids)
+    print(f'🔎 Pass 1: looking for {len(wanted_qids)} artists by QID and {len(wanted_labels)} by label in {path}')
+    by_qid, by_label = {}, {}
+    for found in map_chunks(path, scan_artists, (wanted_qids, wanted_labels), workers):
+        for entity in found:
+            if entity['id'] in wanted_qids:
+                by_qid[entity['id']] = entity
+            for label in entity['matched_labels']:
+                by_label.setdefault(label, []).append(entity)
+
+    matches = {}
+    for artist in artist_names:
+        if artist in artist_qids and artist_qids[artist] in by_qid:
+            matches[artist] = by_qid[artist_qids[artist]]
+        elif by_label.get(artist):
+            matches[artist] = pick_entity(by_label[artist])
+    print(f'   Found {len(matches)} of {len(artist_names)} artists')
+
+    referenced = {qid for entity in matches.values() for prop in ITEM_PROPERTIES
+                  for qid in entity['claims'].get(prop, [])}
+    print(f'🔎 Pass 2: labels for {len(referenced)} movements, places, works, ...')
+    labels = {}
+    for found in map_chunks(path, scan_referenced, (referenced,), workers):
+        labels.update(found)
+
+    results = {}
+    for artist in artist_names:
+        entity = matches.get(artist)
+        if not entity:
+            results[artist] = {'not_found': True}
+            continue
+        results[artist] = merge_language_tags(tags_from_entity(entity, labels, 'en'),
+                                              tags_from_entity(entity, labels, 'no'))
+    return results
+
+def qids_from_cache(cache_path=CACHE_PATH):
+    """Artist name -> QID from the English title lookups in the incremental entity cache"""
+    cache = load_json_file(cache_path, {})
+    titles = cache.get('titles', {}).get('en', {})
+    return {name: entry['page']['qid'] for name, entry in titles.items() if entry.get('page')}
+
+def main():
+    parser = argparse.ArgumentParser(description='Build artist tags from a local Wikidata JSON dump')
+    parser.add_argument('dump', help='Wikidata JSON dump (.json, .json.gz or .json.bz2, one entity per line)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Processes parsing dump chunks (default: all cores)')
+    parser.add_argument('--qids-from-cache', action='store_true', help=f'Match artists by the QIDs in {CACHE_PATH} where known')
+    parser.add_argument('--output', help=f'Write only the results to this file instead of merging them into the appended tags (from {OUTPUT_PATH})')
+    args = parser.parse_args()
+
+    artist_names = known_artist_names()
+    artist_qids = qids_from_cache() if args.qids_from_cache else None
+    artist_tags = tags_from_dump(args.dump, artist_names, artist_qids, args.workers)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(artist_tags, f, indent=2, ensure_ascii=False)
+        print(f'✅ Saved artist tags to {args.output}')
+    else:
+        save_tags({artist: tags for artist, tags in artist_tags.items() if not tags.get('not_found')})
+    women_count = sum(1 for tags in artist_tags.values() if tags.get('is_female'))
+    print(f'\nTotal women painters found: {women_count}')
+
+if __name__ == '__main__':
+    main()